@@ -0,0 +1,2 @@
+from .workloads import Workload, workloads
+from .suite import Result, Comparison, measure, run_suite, compare, format_results
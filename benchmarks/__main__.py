@@ -0,0 +1,57 @@
+import argparse
+import json
+import sys
+
+from benchmarks.suite import DEFAULT_REPEAT, DEFAULT_THRESHOLD, compare, format_results, run_suite
+from benchmarks.workloads import workloads
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measure the lexers, parsers and engines on generated workloads",
+    )
+    parser.add_argument("-o", "--output", help="write the results as JSON (default: stdout)")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown or memory growth counted as a regression (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per workload")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the input sizes")
+    parser.add_argument(
+        "-k", "--filter", action="append", help="only workloads whose name contains this"
+    )
+    args = parser.parse_args(argv)
+
+    selected = [
+        workload
+        for workload in workloads(args.scale)
+        if not args.filter or any(part in workload.name for part in args.filter)
+    ]
+    document = run_suite(selected, args.repeat, args.scale)
+
+    comparisons = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            comparisons = compare(document, json.load(f), args.threshold)
+
+    print(format_results(document, comparisons), file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    regressions = [c.name for c in comparisons or [] if c.regression]
+    if regressions:
+        print("{} regression(s): {}".format(len(regressions), ", ".join(regressions)), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
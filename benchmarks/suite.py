@@ -0,0 +1,145 @@
+import gc
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional
+from benchmarks.workloads import Workload
+
+# Bump when the workloads change, so old baselines are not compared against
+FORMAT_VERSION = 1
+
+DEFAULT_REPEAT = 5
+# Fast workloads are run several times per sample, to get samples this long
+MIN_SAMPLE_SECONDS = 0.1
+# A rate this much below the baseline's, or a peak this much above, is a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+@dataclass
+class Result:
+    phase: str
+    unit: str
+    # Units processed by one run
+    units: int
+    # Runs per sample
+    loops: int
+    # Seconds per run, of the fastest and the median sample
+    best: float
+    median: float
+    # Units per second in the fastest sample
+    rate: float
+    # Most memory allocated at once during a run, in bytes
+    peak_bytes: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    # Current rate over the baseline's, and the same for peak memory
+    speed: float
+    memory: float
+    regression: bool
+
+
+def measure(workload: Workload, repeat: int = DEFAULT_REPEAT) -> Result:
+    """Take `repeat` samples of `workload`, then run it once more to trace its memory"""
+    state = workload.setup()
+    times = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        # The warm-up run tells how many runs make a long enough sample
+        start = time.perf_counter()
+        units = workload.run(state)
+        elapsed = time.perf_counter() - start
+        loops = max(1, math.ceil(MIN_SAMPLE_SECONDS / elapsed)) if elapsed > 0 else 1
+
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            for _ in range(loops):
+                workload.run(state)
+            times.append((time.perf_counter() - start) / loops)
+
+        # Tracing slows everything down, so it gets a run of its own
+        gc.collect()
+        tracemalloc.start()
+        try:
+            workload.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = min(times)
+    return Result(
+        workload.phase,
+        workload.unit,
+        units,
+        loops,
+        best,
+        statistics.median(times),
+        units / best if best > 0 else 0.0,
+        peak,
+    )
+
+
+def run_suite(workloads: Iterable[Workload], repeat: int = DEFAULT_REPEAT, scale: float = 1.0) -> dict:
+    """Measure `workloads` into a JSON-serializable document"""
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": {workload.name: asdict(measure(workload, repeat)) for workload in workloads},
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """Compare the workloads measured in both documents
+
+    Rates only compare between runs on the same machine, at the same scale.
+    """
+    if current.get("format") != baseline.get("format"):
+        raise ValueError("The baseline was made by another version of the suite")
+    if current.get("scale") != baseline.get("scale"):
+        raise ValueError("The baseline was measured at another scale")
+
+    comparisons = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        speed = result["rate"] / old["rate"] if old["rate"] else 1.0
+        memory = result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        regression = speed < 1 - threshold or memory > 1 + threshold
+        comparisons.append(Comparison(name, speed, memory, regression))
+    return comparisons
+
+
+def format_results(document: dict, comparisons: Optional[List[Comparison]] = None) -> str:
+    by_name: Dict[str, Comparison] = {c.name: c for c in comparisons or []}
+    header = "{:<28} {:>26} {:>10} {:>10}".format("workload", "rate", "best ms", "peak KiB")
+    if comparisons is not None:
+        header += " {:>8} {:>8}".format("speed", "memory")
+    lines = [header]
+
+    for name, result in document["results"].items():
+        line = "{:<28} {:>12.0f} {:<13} {:>10.2f} {:>10.0f}".format(
+            name,
+            result["rate"],
+            result["unit"] + "/s",
+            1000 * result["best"],
+            result["peak_bytes"] / 1024,
+        )
+        comparison = by_name.get(name)
+        if comparison is not None:
+            line += " {:>8.1%} {:>8.1%}".format(comparison.speed, comparison.memory)
+            if comparison.regression:
+                line += "  REGRESSION"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,221 @@
+import random
+from dataclasses import dataclass
+from typing import Callable, List
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter import Intepreter
+from pylox.intepreter.budget import EXPR_CHILDREN, statement_cost
+from pylox.intepreter.engine import ENGINES
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.expression import ExprEvaluator
+from pylox.lexer import SCANNERS
+from pylox.parser.parser import Parser, EXPRESSION_PARSERS
+from pylox.resolver import Resolver
+
+# Every source is generated from this seed, so runs measure the same input
+SEED = 20240601
+
+# Sizes at scale 1, chosen so each workload runs for a few tenths of a second
+LEX_STATEMENTS = 4000
+PARSE_STATEMENTS = 2000
+NESTED_STATEMENTS = 150
+# Within the reach of the recursive parser at the default recursion limit
+NESTED_DEPTH = 40
+DEEP_DEPTH = 20000
+RUN_STATEMENTS = 5000
+EVALUATE_EXPRESSIONS = 500
+
+OPERATORS = ["+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!="]
+
+
+@dataclass
+class Workload:
+    name: str
+    # "lex", "parse", "evaluate" or "run"
+    phase: str
+    # What `run` counts: "tokens", "nodes" or "statements"
+    unit: str
+    # Builds the input of `run`, outside of the measurement
+    setup: Callable[[], object]
+    # Does the measured work and returns how many units it processed
+    run: Callable[[object], int]
+
+
+def _scaled(size: int, scale: float) -> int:
+    return max(1, int(size * scale))
+
+
+def identifier_source(statements: int) -> str:
+    rng = random.Random(SEED)
+    names = [
+        "identifier_{}_{}".format("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=12)), i)
+        for i in range(64)
+    ]
+    return "\n".join(
+        "var {} = {} + {};".format(rng.choice(names), rng.choice(names), rng.choice(names))
+        for _ in range(statements)
+    )
+
+
+def number_source(statements: int) -> str:
+    rng = random.Random(SEED)
+    return "\n".join(
+        "print {} {} {}.{} * {};".format(
+            rng.randrange(10**9),
+            rng.choice(OPERATORS),
+            rng.randrange(10**6),
+            rng.randrange(10**6),
+            rng.randrange(1000),
+        )
+        for _ in range(statements)
+    )
+
+
+def string_source(statements: int) -> str:
+    rng = random.Random(SEED)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing"]
+    return "\n".join(
+        'print "{}" + "{}";'.format(" ".join(rng.choices(words, k=8)), " ".join(rng.choices(words, k=8)))
+        for _ in range(statements)
+    )
+
+
+def nested_expression(
+    rng: random.Random, depth: int, variable: str = None, operators: str = "+-*/"
+) -> str:
+    """`depth` levels of groupings, unary and binary operators
+
+    Negated operands are numbers, or `variable` if given.
+    """
+    expression = str(rng.randrange(100))
+    for _ in range(depth):
+        operator = rng.choice(operators)
+        if rng.random() < 0.5:
+            negated = variable or rng.randrange(1, 100)
+            expression = "({} {} -{})".format(expression, operator, negated)
+        else:
+            expression = "({} {} {})".format(rng.randrange(1, 100), operator, expression)
+    return expression
+
+
+def nested_source(statements: int, depth: int) -> str:
+    rng = random.Random(SEED)
+    return "\n".join("print {};".format(nested_expression(rng, depth)) for _ in range(statements))
+
+
+def program_source(statements: int) -> str:
+    """Declarations, assignments and prints over a few dozen variables"""
+    rng = random.Random(SEED)
+    names = ["v{}".format(i) for i in range(32)]
+    lines = ["var {} = {};".format(name, rng.randrange(1, 100)) for name in names]
+    while len(lines) < statements:
+        a, b, c = rng.choices(names, k=3)
+        choice = rng.random()
+        if choice < 0.4:
+            lines.append("{} = {} * 0.5 + {} - 1;".format(a, b, c))
+        elif choice < 0.7:
+            lines.append("var {} = ({} + {}) / 2;".format(a, b, c))
+        else:
+            lines.append("print {} >= {};".format(a, b))
+    return "\n".join(lines)
+
+
+def count_nodes(statements: list) -> int:
+    return sum(statement_cost(stmt) for stmt in statements)
+
+
+def count_expr_nodes(expr) -> int:
+    count = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(getattr(node, name) for name in EXPR_CHILDREN[node.kind])
+    return count
+
+
+def _lex(name: str, scanner: str, source: str) -> Workload:
+    def run(source: str) -> int:
+        return len(SCANNERS[scanner](source, ErrorReporter()).scan_tokens())
+
+    return Workload(name, "lex", "tokens", lambda: source, run)
+
+
+def _parse(name: str, expression_parser: str, source: str) -> Workload:
+    # Nodes are counted once, outside of the measurement
+    def setup():
+        tokens = Intepreter().lex(source)[0]
+        return tokens, count_nodes(Parser(tokens, ErrorReporter(), expression_parser).parse())
+
+    def run(state) -> int:
+        tokens, nodes = state
+        Parser(tokens, ErrorReporter(), expression_parser).parse()
+        return nodes
+
+    return Workload(name, "parse", "nodes", setup, run)
+
+
+def _evaluate(name: str, expressions: int) -> Workload:
+    def setup():
+        rng = random.Random(SEED)
+        intepreter = Intepreter()
+        asts = []
+        for _ in range(expressions):
+            # No division, which could hit zero
+            source = nested_expression(rng, NESTED_DEPTH, "x", "+-*")
+            ast, _ = intepreter._parse_expr(intepreter.lex(source)[0])  # pylint: disable=W0212
+            asts.append(ast)
+
+        env = Environment()
+        env.values[env.slot("x")] = 3.0
+        resolver = Resolver(env, ErrorReporter())
+        for ast in asts:
+            resolver.resolve_expr(ast)
+        return ExprEvaluator(env), asts, sum(map(count_expr_nodes, asts))
+
+    def run(state) -> int:
+        evaluator, asts, nodes = state
+        for ast in asts:
+            evaluator.evaluate(ast)
+        return nodes
+
+    return Workload(name, "evaluate", "nodes", setup, run)
+
+
+def _run(name: str, engine: str, source: str) -> Workload:
+    def setup():
+        intepreter = Intepreter(engine)
+        return intepreter, intepreter.compile(source), source.count(";")
+
+    def run(state) -> int:
+        intepreter, program, statements = state
+        intepreter.run(program)
+        return statements
+
+    return Workload(name, "run", "statements", setup, run)
+
+
+def workloads(scale: float = 1.0) -> List[Workload]:
+    """Every workload, with its input sizes multiplied by `scale`"""
+    sources = {
+        "identifiers": identifier_source(_scaled(LEX_STATEMENTS, scale)),
+        "numbers": number_source(_scaled(LEX_STATEMENTS, scale)),
+        "strings": string_source(_scaled(LEX_STATEMENTS, scale)),
+    }
+    program = program_source(_scaled(PARSE_STATEMENTS, scale))
+    nested = nested_source(_scaled(NESTED_STATEMENTS, scale), NESTED_DEPTH)
+    deep = nested_source(1, _scaled(DEEP_DEPTH, scale))
+    run_program = program_source(_scaled(RUN_STATEMENTS, scale))
+
+    result = []
+    for source_name, source in sources.items():
+        for scanner in SCANNERS:
+            result.append(_lex("lex/{}/{}".format(source_name, scanner), scanner, source))
+    for parser in EXPRESSION_PARSERS:
+        result.append(_parse("parse/program/" + parser, parser, program))
+        result.append(_parse("parse/nested/" + parser, parser, nested))
+    # Too deep for the recursive parser
+    result.append(_parse("parse/deep/pratt", "pratt", deep))
+    result.append(_evaluate("evaluate/expressions", _scaled(EVALUATE_EXPRESSIONS, scale)))
+    for engine in ENGINES:
+        result.append(_run("run/program/" + engine, engine, run_program))
+    return result
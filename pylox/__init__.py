@@ -1,7 +1,49 @@
-from .token import Token, TokenType
-from .ast.expr import Expr
-from .ast.stmt import Stmt
-from .error_reporter import ErrorReporter
-from .intepreter import Intepreter
-from .lexer import Scanner
-from .parser import Parser
\ No newline at end of file
+"""A Lox intepreter
+
+Names exported here are imported on first use, so that importing a
+submodule only loads what that submodule needs: lexing or parsing never
+loads the intepreter and its engines, and `python -m pylox --version`
+loads next to nothing.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # What `__getattr__` resolves, spelled out for static tools
+    from pylox.token import Token, TokenType
+    from pylox.ast.expr import Expr
+    from pylox.ast.stmt import Stmt
+    from pylox.error_reporter import ErrorReporter
+    from pylox.intepreter import Intepreter
+    from pylox.lexer import Scanner
+    from pylox.parser import Parser
+
+__version__ = "0.1.0"
+
+# Name -> module it is imported from when first looked up
+_LAZY = {
+    "Token": "pylox.token",
+    "TokenType": "pylox.token",
+    "Expr": "pylox.ast.expr",
+    "Stmt": "pylox.ast.stmt",
+    "ErrorReporter": "pylox.error_reporter",
+    "Intepreter": "pylox.intepreter",
+    "Scanner": "pylox.lexer",
+    "Parser": "pylox.parser",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module 'pylox' has no attribute '{}'".format(name))
+    value = getattr(import_module(module), name)
+    # Looked up once; later accesses find it like any other global
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
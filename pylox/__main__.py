@@ -0,0 +1,385 @@
+"""`python -m pylox`: run a script, start a REPL, or run one of the commands
+
+Only the standard library is imported up front. Each path imports what it
+needs once it is taken, so `--version` and the token and AST dumps never
+load the intepreter, and a command only loads its own subsystem.
+"""
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, TextIO
+
+from pylox import __version__
+from pylox.sysexits import EX_DATAERR, EX_NOINPUT, EX_OK, EX_SOFTWARE, EX_USAGE
+
+COMMANDS = ("compile", "batch", "serve", "client")
+
+# The keys of `pylox.intepreter.engine.ENGINES`, which importing would load
+# every engine
+ENGINE_NAMES = ("closure", "python", "quick", "tree", "vm")
+
+
+class UsageError(Exception):
+    pass
+
+
+class PhaseTimer:
+    """Wall-clock time spent in each phase of a run, reported with `--time`"""
+
+    def __init__(self, enabled: bool, stream: Optional[TextIO] = None):
+        self.enabled = enabled
+        self.stream = stream
+        # Phase name -> seconds, in the order the phases first ran
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self):
+        """Print the phases timed since the last report, if enabled"""
+        if self.enabled and self.phases:
+            stream = self.stream if self.stream is not None else sys.stderr
+            total = sum(self.phases.values())
+            for name, seconds in [*self.phases.items(), ("total", total)]:
+                print("{:<9} {:10.3f} ms".format(name, 1000 * seconds), file=stream)
+        self.phases = {}
+
+
+def read_script(path: Optional[str]) -> Optional[str]:
+    """The source of `path`, or of stdin for None or -; None if unreadable"""
+    if path is None or path == "-":
+        return sys.stdin.read()
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print("pylox: cannot read {}: {}".format(path, e), file=sys.stderr)
+        return None
+
+
+def lex(source: str, scanner: str, timer: PhaseTimer):
+    """Tokens of `source` and the reporter of their errors, without the intepreter"""
+    with timer.phase("import"):
+        # pylint: disable=C0415
+        from pylox.error_reporter import ErrorReporter
+        from pylox.lexer import SCANNERS
+    if scanner not in SCANNERS:
+        raise UsageError("Unknown scanner: {}".format(scanner))
+
+    error_reporter = ErrorReporter()
+    with timer.phase("lex"):
+        tokens = SCANNERS[scanner](source, error_reporter).scan_tokens()
+    return tokens, error_reporter
+
+
+def dump_tokens(source: str, scanner: str, timer: PhaseTimer) -> int:
+    tokens, e = lex(source, scanner, timer)
+    if e.had_error:
+        return EX_DATAERR
+
+    for index in range(len(tokens)):
+        token = tokens[index]
+        line = "{:>4} {:<10} {}".format(token.line, token.token_type.name, token.lexeme)
+        print(line.rstrip())
+    return EX_OK
+
+
+def dump_ast(source: str, scanner: str, timer: PhaseTimer) -> int:
+    tokens, e = lex(source, scanner, timer)
+    if e.had_error:
+        return EX_DATAERR
+
+    with timer.phase("import"):
+        # pylint: disable=C0415
+        from pylox.ast.ast_printer import AstPrinter
+        from pylox.parser import Parser
+    with timer.phase("parse"):
+        statements = Parser(tokens, e).parse()
+    if e.had_error:
+        return EX_DATAERR
+
+    if statements:
+        print(AstPrinter().print_program(statements))
+    return EX_OK
+
+
+def make_intepreter(args: argparse.Namespace, timer: PhaseTimer):
+    with timer.phase("import"):
+        # pylint: disable=C0415
+        from pylox.cache import ProgramCache
+        from pylox.intepreter.interpreter import Intepreter
+        from pylox.optimizer import OptimizerOptions
+    try:
+        return Intepreter(
+            args.engine,
+            optimizer=OptimizerOptions() if args.optimize else None,
+            scanner=args.scanner,
+            cache=ProgramCache(args.cache) if args.cache else None,
+            phases=timer.phase,
+        )
+    except ValueError as e:
+        raise UsageError(str(e)) from e
+
+
+def run_source(intepreter, source: str) -> int:
+    """Compile and run `source`; returns the exit status"""
+    program = intepreter.compile(source)
+    if program is None:
+        return EX_DATAERR
+    intepreter.run(program)
+    return EX_SOFTWARE if intepreter.error_reporter.had_error else EX_OK
+
+
+def repl(args: argparse.Namespace, timer: PhaseTimer) -> int:
+    """Run each line read from stdin, in one environment, until end of input"""
+    intepreter = make_intepreter(args, timer)
+    timer.report()
+    interactive = sys.stdin.isatty()
+    if interactive:
+        try:
+            # Line editing and history for `input`, where available
+            import readline  # pylint: disable=C0415,W0611
+        except ImportError:
+            pass
+        print("pylox {}, {} engine. Ctrl-D to exit.".format(__version__, args.engine))
+
+    while True:
+        try:
+            line = input("> " if interactive else "")
+        except EOFError:
+            if interactive:
+                print()
+            return EX_OK
+        except KeyboardInterrupt:
+            print()
+            continue
+
+        if not line.strip():
+            continue
+        try:
+            run_source(intepreter, line)
+        except KeyboardInterrupt:
+            print("Interrupted")
+        # An error only ends the line it was on
+        intepreter.error_reporter.had_error = False
+        timer.report()
+
+
+def run_command(args: argparse.Namespace) -> int:
+    timer = PhaseTimer(args.time)
+    try:
+        if args.script is None and not (args.tokens or args.ast):
+            return repl(args, timer)
+
+        source = read_script(args.script)
+        if source is None:
+            return EX_NOINPUT
+        if args.tokens:
+            return dump_tokens(source, args.scanner, timer)
+        if args.ast:
+            return dump_ast(source, args.scanner, timer)
+        return run_source(make_intepreter(args, timer), source)
+    except UsageError as e:
+        print("pylox: {}".format(e), file=sys.stderr)
+        return EX_USAGE
+    finally:
+        timer.report()
+
+
+def run_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pylox",
+        description="Run a Lox script, or start a REPL without one.",
+        epilog="Commands: {}; see `pylox COMMAND --help`.".format(", ".join(COMMANDS)),
+    )
+    parser.add_argument("script", nargs="?", help="the Lox script to run, or - for stdin")
+    parser.add_argument("--version", action="version", version="pylox " + __version__)
+    parser.add_argument("--engine", choices=ENGINE_NAMES, default="tree")
+    parser.add_argument("--scanner", default="char", help="char (default), regex or buffer")
+    parser.add_argument("--optimize", action="store_true", help="run the optimizer")
+    parser.add_argument("--cache", help="directory of a program cache")
+    parser.add_argument(
+        "--time", action="store_true", help="print the time spent in each phase to stderr"
+    )
+    dump = parser.add_mutually_exclusive_group()
+    dump.add_argument("--tokens", action="store_true", help="print the tokens instead of running")
+    dump.add_argument("--ast", action="store_true", help="print the AST instead of running")
+    parser.set_defaults(handler=run_command)
+    return parser
+
+
+def compile_command(args: argparse.Namespace) -> int:
+    # pylint: disable=C0415
+    from pathlib import Path
+    from pylox.intepreter import Intepreter
+    from pylox.transpiler import Transpiler
+
+    script = Path(args.script)
+    output = Path(args.output) if args.output else script.with_suffix(".py")
+
+    source = read_script(args.script)
+    if source is None:
+        return EX_NOINPUT
+
+    intepreter = Intepreter()
+    tokens, e = intepreter.lex(source)
+    if e.had_error:
+        return EX_DATAERR
+
+    statements, e = intepreter.parse(tokens)
+    if e.had_error:
+        return EX_DATAERR
+
+    # The module runs against a fresh environment, like this intepreter's
+    if intepreter.resolve(statements).had_error:
+        return EX_DATAERR
+
+    output.write_text(Transpiler().transpile(statements), encoding="utf-8")
+    return EX_OK
+
+
+def worker_options(args: argparse.Namespace):
+    # pylint: disable=C0415
+    from pylox.intepreter import Budget
+    from pylox.optimizer import OptimizerOptions
+    from pylox.runner import WorkerOptions
+
+    budget = None
+    if args.fuel is not None or args.timeout is not None:
+        budget = Budget(args.fuel, args.timeout)
+    return WorkerOptions(
+        engine=args.engine,
+        optimizer=OptimizerOptions() if args.optimize else None,
+        cache_directory=args.cache,
+        budget=budget,
+    )
+
+
+def add_worker_arguments(parser: argparse.ArgumentParser, per: str):
+    from pylox.intepreter.engine import ENGINES  # pylint: disable=C0415
+
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="tree")
+    parser.add_argument("--optimize", action="store_true", help="run the optimizer")
+    parser.add_argument("--cache", help="directory of a program cache")
+    parser.add_argument("--fuel", type=int, help="steps each {} may take".format(per))
+    parser.add_argument("--timeout", type=float, help="seconds each {} may run".format(per))
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    from pylox.runner import BatchRunner  # pylint: disable=C0415
+
+    runner = BatchRunner(args.workers, worker_options(args), args.chunk_size, args.max_in_flight)
+
+    jobs = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+    results = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        report = runner.run_file(jobs, results)
+    finally:
+        if jobs is not sys.stdin:
+            jobs.close()
+        if results is not sys.stdout:
+            results.close()
+
+    print(report.format(), file=sys.stderr)
+    return EX_OK
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    # pylint: disable=C0415
+    import signal
+    from pylox.server.server import LoxServer
+
+    prelude = None
+    if args.prelude:
+        with open(args.prelude, encoding="utf-8") as f:
+            prelude = f.read()
+    # Exit cleanly on SIGTERM too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with LoxServer(args.socket, worker_options(args), prelude) as server:
+        print("pylox: listening on {}".format(server.socket_path), file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return EX_OK
+
+
+def client_command(args: argparse.Namespace) -> int:
+    from pylox.server import run_remote_file  # pylint: disable=C0415
+
+    return run_remote_file(args.script, args.socket)
+
+
+def command_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pylox")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser(
+        "compile", help="transpile a Lox script into a Python module"
+    )
+    compile_parser.add_argument("script", help="the Lox script to compile")
+    compile_parser.add_argument(
+        "-o", "--output", help="where to write the module (default: SCRIPT.py)"
+    )
+    compile_parser.set_defaults(handler=compile_command)
+
+    batch_parser = commands.add_parser(
+        "batch", help="run a JSON lines stream of jobs on a pool of worker processes"
+    )
+    batch_parser.add_argument(
+        "jobs", help='JSON lines of {"source", "variables", "id"} objects, or - for stdin'
+    )
+    batch_parser.add_argument(
+        "-o", "--output", help="where to write the JSON lines results (default: stdout)"
+    )
+    batch_parser.add_argument(
+        "-j", "--workers", type=int, help="number of worker processes (default: CPU count)"
+    )
+    add_worker_arguments(batch_parser, "job")
+    batch_parser.add_argument(
+        "--chunk-size", type=int, default=16, help="jobs sent to a worker at a time"
+    )
+    batch_parser.add_argument(
+        "--max-in-flight", type=int, help="chunks pending at once (default: 2 per worker)"
+    )
+    batch_parser.set_defaults(handler=batch_command)
+
+    serve_parser = commands.add_parser(
+        "serve", help="keep an intepreter warm and run scripts sent to a Unix socket"
+    )
+    serve_parser.add_argument(
+        "--socket", help="path of the socket (default: one per user, in the temp directory)"
+    )
+    serve_parser.add_argument(
+        "--prelude", help="a Lox script whose variables every script starts with"
+    )
+    add_worker_arguments(serve_parser, "script")
+    serve_parser.set_defaults(handler=serve_command)
+
+    client_parser = commands.add_parser(
+        "client", help="run a Lox script on a `pylox serve` server, as if it ran here"
+    )
+    client_parser.add_argument("script", help="the Lox script to run, - for stdin")
+    client_parser.add_argument("--socket", help="path of the server's socket")
+    client_parser.set_defaults(handler=client_command)
+    return parser
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # A command comes first; anything else is a script and run options
+    if argv and argv[0] in COMMANDS:
+        args = command_parser().parse_args(argv)
+    else:
+        args = run_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
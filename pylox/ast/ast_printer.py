@@ -1,9 +1,26 @@
+from typing import List
 import pylox.ast.expr as Expr
+import pylox.ast.stmt as st
 from pylox.ast.expr import AssignmentExpr, Visitor, BinaryExpr, GroupingExpr, LiteralExpr, VariableExpr, UnaryExpr
 
-class AstPrinter(Visitor):
+class AstPrinter(Visitor, st.Visitor):
     def print(self, expr: Expr):
         return expr.accept(self)
+
+    def print_program(self, statements: List[st.Stmt]) -> str:
+        """One line per statement"""
+        return "\n".join(stmt.accept(self) for stmt in statements)
+
+    def visit_print_stmt(self, stmt: st.PrintStmt) -> str:
+        return self.parenthesize("print", stmt.expr)
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt) -> str:
+        return self.parenthesize("expr", stmt.expr)
+
+    def visit_var_stmt(self, stmt: st.VarStmt) -> str:
+        if stmt.initializer is None:
+            return self.parenthesize("var " + stmt.name.lexeme)
+        return self.parenthesize("var " + stmt.name.lexeme, stmt.initializer)
     
     def visit_binary_expr(self, expr: BinaryExpr) -> str:
         return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
@@ -20,10 +37,10 @@ class AstPrinter(Visitor):
         return self.parenthesize(expr.operator.lexeme, expr.right)
     
     def visit_variable_expr(self, expr: VariableExpr):
-        return self.parenthesize("var_ref", expr.name)
+        return self.parenthesize("var_ref " + expr.name.lexeme)
 
     def visit_assignment_expr(self, expr: AssignmentExpr):
-        return self.parenthesize("var_asgn", expr.name, self.parenthesize(expr.value))
+        return self.parenthesize("var_asgn " + expr.name.lexeme, expr.value)
 
     def parenthesize(self, name: str, *args: Expr) -> str:
         s = "(" + name 
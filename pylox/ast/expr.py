@@ -1,16 +1,24 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 from pylox.token import Token
 
 
 class Expr(ABC):
+    __slots__ = ()
+
+    # Index of the node class in `KINDS`, for table dispatch
+    kind: ClassVar[int]
+
     @abstractmethod
     def accept(self, visitor: Visitor):
         pass
 
-@dataclass
+@dataclass(slots=True)
 class BinaryExpr(Expr):
+    kind: ClassVar[int] = 0
+
     left: Expr
     operator: Token
     right: Expr
@@ -18,39 +26,51 @@ class BinaryExpr(Expr):
     def accept(self, visitor: Visitor):
         return visitor.visit_binary_expr(self)
 
-@dataclass
+@dataclass(slots=True)
 class GroupingExpr(Expr):
+    kind: ClassVar[int] = 1
+
     expr: Expr
 
     def accept(self, visitor: Visitor):
         return visitor.visit_grouping_expr(self)
 
-@dataclass
+@dataclass(slots=True)
 class LiteralExpr(Expr):
+    kind: ClassVar[int] = 2
+
     value: object
 
     def accept(self, visitor: Visitor):
         return visitor.visit_literal_expr(self)
 
-@dataclass
+@dataclass(slots=True)
 class UnaryExpr(Expr):
+    kind: ClassVar[int] = 3
+
     operator: Token
     right: Expr
 
     def accept(self, visitor: Visitor):
         return visitor.visit_unary_expr(self)
 
-@dataclass
+@dataclass(slots=True)
 class VariableExpr(Expr):
+    kind: ClassVar[int] = 4
+
     name: Token
+    slot: int = field(default=-1, compare=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_variable_expr(self)
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentExpr(Expr):
+    kind: ClassVar[int] = 5
+
     name: Token
     value: Expr
+    slot: int = field(default=-1, compare=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_assignment_expr(self)
@@ -76,4 +96,22 @@ class Visitor(ABC):
     @abstractmethod
     def visit_assignment_expr(self, expr: AssignmentExpr): ...
 
-
+    def dispatch_table(self) -> list:
+        return [
+            self.visit_binary_expr,
+            self.visit_grouping_expr,
+            self.visit_literal_expr,
+            self.visit_unary_expr,
+            self.visit_variable_expr,
+            self.visit_assignment_expr,
+        ]
+
+
+KINDS = (
+    BinaryExpr,
+    GroupingExpr,
+    LiteralExpr,
+    UnaryExpr,
+    VariableExpr,
+    AssignmentExpr,
+)
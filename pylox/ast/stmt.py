@@ -1,33 +1,49 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 from pylox.token import Token
 from pylox.ast.expr import Expr
 
 
 class Stmt(ABC):
+    __slots__ = ()
+
+    # Index of the node class in `KINDS`, for table dispatch
+    kind: ClassVar[int]
+
     @abstractmethod
     def accept(self, visitor: Visitor):
         pass
 
-@dataclass
+@dataclass(slots=True)
 class PrintStmt(Stmt):
+    kind: ClassVar[int] = 0
+
     expr: Expr
+    line: int = field(default=0, compare=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_print_stmt(self)
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionStmt(Stmt):
+    kind: ClassVar[int] = 1
+
     expr: Expr
+    line: int = field(default=0, compare=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_expression_stmt(self)
 
-@dataclass
+@dataclass(slots=True)
 class VarStmt(Stmt):
+    kind: ClassVar[int] = 2
+
     name: Token
     initializer: Expr
+    line: int = field(default=0, compare=False)
+    slot: int = field(default=-1, compare=False)
 
     def accept(self, visitor: Visitor):
         return visitor.visit_var_stmt(self)
@@ -44,4 +60,16 @@ class Visitor(ABC):
     @abstractmethod
     def visit_var_stmt(self, stmt: VarStmt): ...
 
+    def dispatch_table(self) -> list:
+        return [
+            self.visit_print_stmt,
+            self.visit_expression_stmt,
+            self.visit_var_stmt,
+        ]
+
 
+KINDS = (
+    PrintStmt,
+    ExpressionStmt,
+    VarStmt,
+)
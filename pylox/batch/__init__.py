@@ -0,0 +1 @@
+from .evaluator import BatchEvaluator, BatchResult, RowError, evaluate_batch
@@ -0,0 +1,400 @@
+from dataclasses import dataclass
+from functools import partial
+from itertools import repeat
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
+from pylox.token import Token, TokenType
+from pylox.ast import expr as ex
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.expression import ExprEvaluator
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("pylox.batch requires NumPy (pip install numpy)") from e
+
+# Column kinds. Every row of a FLOAT, BOOL, STR or NIL column holds a value
+# of that Lox type; OBJECT columns mix them and go through the per-row path.
+FLOAT = "float"
+BOOL = "bool"
+STR = "str"
+NIL = "nil"
+OBJECT = "object"
+
+KIND_OF_TYPE = {float: FLOAT, bool: BOOL, str: STR, type(None): NIL}
+LOX_TYPES = set(KIND_OF_TYPE)
+# Stands in for the value of failed rows in typed arrays
+FILLER = {FLOAT: 0.0, BOOL: False, STR: "", NIL: None}
+NUMBERS = {FLOAT, BOOL}
+KINDS = (FLOAT, BOOL, STR, NIL, OBJECT)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+TYPE_CODES = {python_type: KIND_CODES[kind] for python_type, kind in KIND_OF_TYPE.items()}
+
+NUMERIC_UFUNCS = {
+    TokenType.MINUS: np.subtract,
+    TokenType.STAR: np.multiply,
+    TokenType.SLASH: np.divide,
+    TokenType.GREATER: np.greater,
+    TokenType.GREATER_EQ: np.greater_equal,
+    TokenType.LESS: np.less,
+    TokenType.LESS_EQ: np.less_equal,
+}
+
+COMPARISONS = {
+    TokenType.GREATER,
+    TokenType.GREATER_EQ,
+    TokenType.LESS,
+    TokenType.LESS_EQ,
+}
+
+
+@dataclass
+class Column:
+    """The values of an expression for every row"""
+
+    kind: str
+    # An array with one entry per row, or a Python value shared by all rows
+    data: object
+
+    @property
+    def scalar(self) -> bool:
+        return not isinstance(self.data, np.ndarray)
+
+
+@dataclass
+class RowError:
+    token: Token
+    message: str
+    # Indices of the rows that failed with this error
+    rows: np.ndarray
+
+
+@dataclass
+class BatchResult:
+    # float64 or bool for uniformly typed results, object otherwise. The
+    # entries of failed rows are unspecified.
+    values: np.ndarray
+    errors: List[RowError]
+
+    @property
+    def failed(self) -> np.ndarray:
+        mask = np.zeros(len(self.values), dtype=bool)
+        for error in self.errors:
+            mask[error.rows] = True
+        return mask
+
+
+def _lox_value(value: object) -> object:
+    # Lox has a single number type
+    if isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)):
+        return float(value)
+    if isinstance(value, (np.floating, np.bool_, np.str_)):
+        return value.item()
+    return value
+
+
+class BatchEvaluator(ex.Visitor):
+    """Evaluates an expression over columns of values, one column at a time
+
+    Variables name columns: NumPy arrays or Python sequences of equal length,
+    holding numbers (integers are taken as Lox numbers), booleans, strings
+    or None. Operators on uniformly typed columns run as NumPy operations;
+    only columns mixing types are evaluated row by row, with the semantics
+    of `ExprEvaluator`. A row stops at its first runtime error, which is
+    reported with the same message and token, together with the indices of
+    all rows it happened in.
+    """
+
+    def __init__(self, columns: Mapping[str, Sequence]):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns have different lengths: {}".format(sorted(lengths)))
+
+        self.length = lengths.pop() if lengths else 0
+        self.columns: Dict[str, Column] = {
+            name: self._input_column(values) for name, values in columns.items()
+        }
+
+        # Index into `errors` of the first error of each row, or -1
+        self.first_error = np.full(self.length, -1, dtype=np.intp)
+        self.errors: List[Tuple[Token, str]] = []
+        self.error_index: Dict[Tuple[int, str], int] = {}
+
+        self.row_evaluator = ExprEvaluator(Environment())
+
+    def evaluate(self, expr: ex.Expr) -> BatchResult:
+        column = self._evaluate(expr)
+        return BatchResult(self._array(column), self._row_errors())
+
+    def _evaluate(self, expr: ex.Expr) -> Column:
+        with np.errstate(all="ignore"):
+            return expr.accept(self)
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr) -> Column:
+        return Column(KIND_OF_TYPE.get(type(expr.value), OBJECT), expr.value)
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr) -> Column:
+        return expr.expr.accept(self)
+
+    def visit_variable_expr(self, expr: ex.VariableExpr) -> Column:
+        column = self.columns.get(expr.name.lexeme)
+        if column is None:
+            raise Environment.undefined(expr.name)
+        return column
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr) -> Column:
+        value = expr.value.accept(self)
+        if expr.name.lexeme not in self.columns:
+            raise Environment.unassignable(expr.name)
+        self.columns[expr.name.lexeme] = value
+        return value
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr) -> Column:
+        right = expr.right.accept(self)
+        return self._split(lambda column: self._unary(expr.operator, column), right)
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr) -> Column:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        return self._split(lambda a, b: self._binary(expr.operator, a, b), left, right)
+
+    # Operators on typed columns
+
+    def _unary(self, operator: Token, right: Column) -> Column:
+        token_type = operator.token_type
+        if token_type == TokenType.BANG:
+            if right.kind == BOOL:
+                return Column(BOOL, not right.data if right.scalar else ~right.data)
+            # Numbers and strings are truthy, nil is not
+            return Column(BOOL, right.kind == NIL)
+
+        if right.kind in NUMBERS:
+            if right.scalar:
+                return Column(FLOAT, -float(right.data))
+            return Column(FLOAT, -right.data.astype(np.float64))
+
+        return self._per_row(
+            operator,
+            lambda value: self.row_evaluator.visit_unary_expr(
+                ex.UnaryExpr(operator, ex.LiteralExpr(value))
+            ),
+            right,
+        )
+
+    def _binary(self, operator: Token, left: Column, right: Column) -> Column:
+        token_type = operator.token_type
+        kinds = (left.kind, right.kind)
+
+        def row_binary(a: object, b: object) -> object:
+            return self.row_evaluator.visit_binary_expr(
+                ex.BinaryExpr(ex.LiteralExpr(a), operator, ex.LiteralExpr(b))
+            )
+
+        if token_type in NUMERIC_UFUNCS and kinds == (FLOAT, FLOAT):
+            if token_type == TokenType.SLASH:
+                # Python raises on division by zero where NumPy gives inf
+                zero = np.flatnonzero(np.broadcast_to(right.data == 0.0, (self.length,)))
+                if len(zero):
+                    operands = [self._take(left, zero), self._take(right, zero)]
+                    self._on_rows(zero, partial(self._per_row, operator, row_binary), operands)
+            result = NUMERIC_UFUNCS[token_type](left.data, right.data)
+            return Column(BOOL if token_type in COMPARISONS else FLOAT, result)
+
+        if token_type == TokenType.PLUS and kinds in ((FLOAT, FLOAT), (STR, STR)):
+            return Column(left.kind, left.data + right.data)
+
+        if token_type in (TokenType.EQ_EQ, TokenType.BANG_EQ):
+            equal = self._equal(left, right)
+            return Column(BOOL, equal if token_type == TokenType.EQ_EQ else ~equal)
+
+        # Every other combination of types fails the operand checks, which
+        # only look at types: one row tells the error of all of them
+        return self._per_row(operator, row_binary, left, right, type_error=True)
+
+    # Helpers
+
+    def _split(self, operation: Callable, *operands: Column) -> Column:
+        """Apply `operation` to typed columns, splitting mixed ones by type
+
+        Rows are grouped by the types of their operands and `operation` runs
+        once per group, on typed sub-columns of just those rows.
+        """
+        if all(operand.kind != OBJECT for operand in operands):
+            return operation(*operands)
+
+        live = np.flatnonzero(self.first_error < 0)
+        codes = np.zeros(len(live), dtype=np.int64)
+        for operand in operands:
+            codes = codes * len(KINDS) + self._kind_codes(operand)[live]
+
+        pieces = []
+        for code in np.unique(codes):
+            rows = live[codes == code]
+            parts = [self._take(operand, rows) for operand in operands]
+            pieces.append((rows, self._on_rows(rows, operation, parts)))
+        return self._merge(pieces)
+
+    def _on_rows(self, rows: np.ndarray, operation: Callable, operands: List[Column]) -> Column:
+        """Run `operation` as if `rows` were all the rows there are"""
+        first_error, length = self.first_error, self.length
+        self.first_error, self.length = first_error[rows], len(rows)
+        try:
+            return operation(*operands)
+        finally:
+            first_error[rows] = self.first_error
+            self.first_error, self.length = first_error, length
+
+    def _merge(self, pieces: List[Tuple[np.ndarray, Column]]) -> Column:
+        kinds = {column.kind for _, column in pieces}
+        if len(kinds) == 1 and OBJECT not in kinds:
+            (kind,) = kinds
+            dtype = {FLOAT: np.float64, BOOL: bool}.get(kind, object)
+            out = np.full(self.length, FILLER[kind], dtype=dtype)
+            for rows, column in pieces:
+                out[rows] = column.data
+            return Column(kind, out)
+
+        out = np.empty(self.length, dtype=object)
+        for rows, column in pieces:
+            out[rows] = self._objects(column, len(rows))
+        return Column(OBJECT, out)
+
+    def _kind_codes(self, column: Column) -> np.ndarray:
+        if column.kind != OBJECT:
+            return np.full(self.length, KIND_CODES[column.kind], dtype=np.int64)
+        return self._type_codes(column.data)
+
+    def _type_codes(self, values: np.ndarray) -> np.ndarray:
+        codes = map(TYPE_CODES.get, map(type, values), repeat(KIND_CODES[OBJECT]))
+        return np.fromiter(codes, dtype=np.int64, count=len(values))
+
+    def _take(self, column: Column, rows: np.ndarray) -> Column:
+        """The typed column of `rows`, which all hold values of one type"""
+        if column.scalar:
+            return column
+        data = column.data[rows]
+        if column.kind != OBJECT or len(rows) == 0:
+            return Column(column.kind, data)
+
+        kind = KIND_OF_TYPE.get(type(data[0]), OBJECT)
+        if kind == FLOAT:
+            return Column(FLOAT, data.astype(np.float64))
+        if kind == BOOL:
+            return Column(BOOL, data.astype(bool))
+        return Column(kind, data)
+
+    def _equal(self, left: Column, right: Column):
+        if left.kind in NUMBERS and right.kind in NUMBERS:
+            # `true == 1` holds in Lox, as it does in Python
+            return np.equal(left.data, right.data)
+        if left.kind != right.kind:
+            return np.False_
+        if left.kind == NIL:
+            return np.True_
+        if left.scalar and right.scalar:
+            return np.bool_(left.data == right.data)
+        return np.equal(
+            self._objects(left), self._objects(right), dtype=object
+        ).astype(bool)
+
+    def _per_row(
+        self, token: Token, function: Callable, *operands: Column, type_error: bool = False
+    ) -> Column:
+        """Apply `function` to the values of every row that has not failed
+
+        With `type_error`, the first row that raises an `IntepreterRuntimeError`
+        is taken to fail the same way for every row.
+        """
+        values = [self._objects(operand) for operand in operands]
+        out = np.empty(self.length, dtype=object)
+        live = np.flatnonzero(self.first_error < 0)
+        for row in live:
+            try:
+                out[row] = function(*(column[row] for column in values))
+            except IntepreterRuntimeError as e:
+                if type_error:
+                    self._fail(e.token, str(e), live)
+                    break
+                self._fail(e.token, str(e), np.array([row]))
+            except (ArithmeticError, TypeError, ValueError) as e:
+                # What the tree-walker lets escape, e.g. `-"abc"`
+                self._fail(token, str(e), np.array([row]))
+        return self._infer(out)
+
+    def _fail(self, token: Token, message: str, rows: np.ndarray):
+        rows = rows[self.first_error[rows] < 0]
+        if len(rows) == 0:
+            return
+
+        key = (id(token), message)
+        index = self.error_index.get(key)
+        if index is None:
+            index = self.error_index[key] = len(self.errors)
+            self.errors.append((token, message))
+        self.first_error[rows] = index
+
+    def _row_errors(self) -> List[RowError]:
+        failed = np.flatnonzero(self.first_error >= 0)
+        order = np.argsort(self.first_error[failed], kind="stable")
+        failed = failed[order]
+        indices = self.first_error[failed]
+
+        # Rows are grouped by error, in the order the errors first happened
+        groups = np.split(failed, np.flatnonzero(np.diff(indices)) + 1)
+        return [
+            RowError(*self.errors[self.first_error[rows[0]]], rows) for rows in groups if len(rows)
+        ]
+
+    def _input_column(self, values: Sequence) -> Column:
+        if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+            return Column(FLOAT, values.astype(np.float64, copy=False))
+        if isinstance(values, np.ndarray) and values.dtype.kind == "b":
+            return Column(BOOL, values)
+
+        out = np.empty(len(values), dtype=object)
+        out[:] = values if isinstance(values, (list, np.ndarray)) else list(values)
+        if not set(map(type, out)) <= LOX_TYPES:
+            for row in np.flatnonzero(self._type_codes(out) == KIND_CODES[OBJECT]):
+                out[row] = _lox_value(out[row])
+        return self._infer(out, check_errors=False)
+
+    def _infer(self, values: np.ndarray, check_errors: bool = True) -> Column:
+        """Narrow an object array to a typed column if its rows allow it"""
+        rows = values[self.first_error < 0] if check_errors else values
+        kinds = {KIND_OF_TYPE.get(t, OBJECT) for t in set(map(type, rows))}
+        if len(kinds) != 1 or OBJECT in kinds:
+            return Column(OBJECT, values)
+
+        (kind,) = kinds
+        if check_errors:
+            values[self.first_error >= 0] = FILLER[kind]
+        if kind == FLOAT:
+            return Column(FLOAT, values.astype(np.float64))
+        if kind == BOOL:
+            return Column(BOOL, values.astype(bool))
+        return Column(kind, values)
+
+    def _objects(self, column: Column, length: int = None) -> np.ndarray:
+        """The column as an object array of plain Python values"""
+        if column.scalar:
+            length = self.length if length is None else length
+            out = np.empty(length, dtype=object)
+            out[:] = [_lox_value(column.data)] * length
+            return out
+        return column.data.astype(object, copy=False)
+
+    def _array(self, column: Column) -> np.ndarray:
+        if not column.scalar:
+            return column.data
+        if column.kind == FLOAT:
+            return np.full(self.length, column.data, dtype=np.float64)
+        if column.kind == BOOL:
+            return np.full(self.length, column.data, dtype=bool)
+        return self._objects(column)
+
+
+def evaluate_batch(expr: ex.Expr, columns: Mapping[str, Sequence]) -> BatchResult:
+    """Evaluate `expr` for every row of `columns`; see `BatchEvaluator`"""
+    return BatchEvaluator(columns).evaluate(expr)
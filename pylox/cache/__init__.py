@@ -0,0 +1,2 @@
+from .program_cache import ProgramCache
+from .source_cache import SourceCache, ParsedSource, CacheStats
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from pylox.ast.stmt import Stmt
+from pylox.cache import serializer
+from pylox.intepreter.utils import gc_paused
+
+# Bump whenever the serialized layout or the AST node classes change
+FORMAT_VERSION = 2
+
+MAGIC = b"LOXC"
+# magic, format version, payload length, payload digest
+HEADER = struct.Struct("<4sHQ16s")
+SUFFIX = ".loxc"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Eviction goes down to this share of `max_bytes`, so that the stores
+# right after it do not have to evict again
+EVICT_TO = 0.9
+
+# The serialized AST is repetitive; the fastest level already shrinks it ~5x
+COMPRESSION_LEVEL = 1
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ProgramCache:
+    """Parsed (and optimized) programs stored on disk, keyed by their source
+
+    Entries hold the compressed output of `serializer.dumps` and are named
+    after a hash of the source, the format version and the optimizer
+    settings, so an edited script or a different pipeline never sees a
+    stale program. Files are written atomically, checked against their
+    header on load (a bad entry is a miss and gets removed), and the least
+    recently used ones are evicted once the directory grows past
+    `max_bytes`.
+
+    The size of the directory is counted once when the cache is opened and
+    kept up to date by each store; it is counted again only to evict.
+    Entries other processes write are missed until then.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Bytes and number of the entries
+        self.total_bytes = 0
+        self.entry_count = 0
+        self._scan()
+
+    def key(self, source: str, variant: str = "") -> str:
+        """Cache key of `source`; `variant` describes how it was processed"""
+        h = hashlib.sha256()
+        h.update(f"pylox-{FORMAT_VERSION}\0{variant}\0".encode())
+        h.update(source.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / (key + SUFFIX)
+
+    def load(self, source: str, variant: str = "") -> Optional[List[Stmt]]:
+        path = self.path(self.key(source, variant))
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        statements = self._decode(data)
+        if statements is None:
+            self._discard(path, len(data))
+            return None
+
+        try:
+            # Recently used entries are the last to be evicted
+            os.utime(path)
+        except OSError:
+            pass
+        return statements
+
+    def store(self, source: str, statements: List[Stmt], variant: str = "") -> bool:
+        """Write an entry; failures only cost the cache, so they return False"""
+        try:
+            payload = zlib.compress(serializer.dumps(statements), COMPRESSION_LEVEL)
+        except (TypeError, ValueError):
+            # Values marshal cannot represent
+            return False
+
+        data = HEADER.pack(MAGIC, FORMAT_VERSION, len(payload), _digest(payload)) + payload
+        path = self.path(self.key(source, variant))
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = None
+        try:
+            self._write_atomic(path, data)
+        except OSError:
+            return False
+
+        if replaced is None:
+            self.entry_count += 1
+        else:
+            self.total_bytes -= replaced
+        self.total_bytes += len(data)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Remove least recently used entries once over `max_bytes`
+
+        The directory is counted again first, then entries are removed until
+        it is down to `EVICT_TO` of `max_bytes`.
+        """
+        entries = self._scan()
+        if self.total_bytes <= self.max_bytes:
+            return
+        for _, size, path in entries:
+            if self.total_bytes <= self.max_bytes * EVICT_TO:
+                break
+            self._discard(path, size)
+
+    def clear(self):
+        for path in self.directory.glob("*" + SUFFIX):
+            self._remove(path)
+        self.total_bytes = self.entry_count = 0
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        """Modification time, size and path of each entry, least recently used
+        first; counts `total_bytes` and `entry_count` again"""
+        entries = []
+        for path in self.directory.glob("*" + SUFFIX):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        self.total_bytes = sum(size for _, size, _ in entries)
+        self.entry_count = len(entries)
+        return entries
+
+    def _decode(self, data: bytes) -> Optional[List[Stmt]]:
+        if len(data) < HEADER.size:
+            return None
+
+        magic, version, length, digest = HEADER.unpack_from(data)
+        payload = data[HEADER.size:]
+        if (
+            magic != MAGIC
+            or version != FORMAT_VERSION
+            or length != len(payload)
+            or digest != _digest(payload)
+        ):
+            return None
+
+        try:
+            with gc_paused():
+                return serializer.loads(zlib.decompress(payload))
+        except (zlib.error, EOFError, ValueError, TypeError, KeyError, IndexError, StopIteration):
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes):
+        # Readers see either the old entry or the complete new one
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)
+        except BaseException:
+            self._remove(Path(temp))
+            raise
+
+    def _discard(self, path: Path, size: int):
+        self._remove(path)
+        self.total_bytes -= size
+        self.entry_count -= 1
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,141 @@
+import marshal
+from dataclasses import fields
+from typing import Dict, List, Tuple
+from pylox.token import Token, TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+
+"""
+Compact serialization of parsed programs
+
+A program is flattened into a post-order list: every node is written after
+its children as its tag followed by its token indices and literal values.
+Tokens go into a separate table, each stored once. Both directions use an
+explicit stack, so trees of any depth round-trip, and the result is a
+`marshal` payload of plain tuples, which loads much faster than pickling
+the node objects.
+
+Resolved slots are not stored: a loaded program is resolved again against
+the environment it runs in. Statement lines are.
+"""
+
+# Expression tags are their `kind`; statement tags follow them
+NODE_CLASSES = ex.KINDS + st.KINDS
+STMT_TAG_OFFSET = len(ex.KINDS)
+NONE_TAG = -1
+
+CHILD = 0
+TOKEN = 1
+VALUE = 2
+
+FIELD_KINDS = {"Expr": CHILD, "Stmt": CHILD, "Token": TOKEN, "object": VALUE, "int": VALUE}
+
+# Filled in by the resolver, for the environment the program runs in
+RESOLVED_FIELDS = {"slot"}
+
+
+def _schema(cls) -> Tuple[Tuple[str, int], ...]:
+    return tuple(
+        (field.name, FIELD_KINDS[field.type])
+        for field in fields(cls)
+        if field.name not in RESOLVED_FIELDS
+    )
+
+
+SCHEMAS = tuple(_schema(cls) for cls in NODE_CLASSES)
+# Field kinds in constructor order, and how many children to pop
+DECODERS = tuple(
+    (tuple(kind for _, kind in schema), sum(kind == CHILD for _, kind in schema))
+    for schema in SCHEMAS
+)
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+def dumps(statements: List[st.Stmt]) -> bytes:
+    # Token rows are flattened into one tuple; equal strings share one
+    # object so marshal writes them once and refers back to them after
+    tokens: list = []
+    token_index: Dict[int, int] = {}
+    strings: Dict[str, str] = {}
+    out: list = []
+
+    # Entries are (node, visited); a node is written once its children are
+    stack = [(stmt, False) for stmt in reversed(statements)]
+    while stack:
+        node, visited = stack.pop()
+        if node is None:
+            out.append(NONE_TAG)
+            continue
+
+        tag = node.kind if isinstance(node, ex.Expr) else node.kind + STMT_TAG_OFFSET
+        schema = SCHEMAS[tag]
+        if not visited:
+            stack.append((node, True))
+            for name, field_kind in reversed(schema):
+                if field_kind == CHILD:
+                    stack.append((getattr(node, name), False))
+            continue
+
+        out.append(tag)
+        for name, field_kind in schema:
+            value = getattr(node, name)
+            if field_kind == TOKEN:
+                index = token_index.get(id(value))
+                if index is None:
+                    index = token_index[id(value)] = len(tokens) // 4
+                    literal = value.literal
+                    if isinstance(literal, str):
+                        literal = strings.setdefault(literal, literal)
+                    tokens += (
+                        value.token_type.value,
+                        strings.setdefault(value.lexeme, value.lexeme),
+                        literal,
+                        value.line,
+                    )
+                out.append(index)
+            elif field_kind == VALUE:
+                if isinstance(value, str):
+                    value = strings.setdefault(value, value)
+                out.append(value)
+
+    return marshal.dumps((len(statements), tuple(tokens), tuple(out)))
+
+
+def loads(data: bytes) -> List[st.Stmt]:
+    count, token_row, flat = marshal.loads(data)
+    tokens = [
+        Token(TOKEN_TYPES[token_row[i]], token_row[i + 1], token_row[i + 2], token_row[i + 3])
+        for i in range(0, len(token_row), 4)
+    ]
+
+    stack: list = []
+    position = 0
+    end = len(flat)
+    while position < end:
+        tag = flat[position]
+        position += 1
+        if tag == NONE_TAG:
+            stack.append(None)
+            continue
+
+        # Children were written in field order, so they are the top of the stack
+        field_kinds, child_count = DECODERS[tag]
+        if child_count:
+            children = iter(stack[-child_count:])
+            del stack[-child_count:]
+
+        arguments = []
+        for field_kind in field_kinds:
+            if field_kind == CHILD:
+                arguments.append(next(children))
+            elif field_kind == TOKEN:
+                arguments.append(tokens[flat[position]])
+                position += 1
+            else:
+                arguments.append(flat[position])
+                position += 1
+        stack.append(NODE_CLASSES[tag](*arguments))
+
+    if len(stack) != count:
+        raise ValueError("Malformed program: expected {} statements".format(count))
+    return stack
@@ -0,0 +1,102 @@
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Union
+from pylox.token import Token
+from pylox.lexer.token_buffer import TokenBuffer
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Measured footprint of the tokens and AST per character of typical source.
+# Walking every entry to size it would cost about as much as parsing it again.
+ESTIMATED_BYTES_PER_CHAR = 64
+
+
+@dataclass
+class ParsedSource:
+    """What the front end made of a source: its tokens and its AST"""
+
+    # None when the AST came from a `ProgramCache`
+    tokens: Optional[Union[List[Token], TokenBuffer]]
+    # A List[Stmt] for programs, an Expr for expressions
+    ast: object
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class SourceCache:
+    """Thread-safe LRU map from source text to its `ParsedSource`
+
+    Bounded both by number of entries and by (estimated) bytes; whichever
+    limit is hit first evicts the least recently used entries. Only sources
+    that lexed and parsed without errors should be stored, so errors are
+    reported again on every call.
+
+    `Intepreter` keys its entries by itself, since resolving writes slots
+    into the AST; only its forks share them. A cache shared by several
+    interpreters bounds their combined memory but does not share entries
+    between them.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (variant, source) -> (entry, size in bytes)
+        self.entries: OrderedDict = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, source: str, variant: Hashable = None) -> Optional[ParsedSource]:
+        """The entry for `source`; `variant` tells apart how it was parsed"""
+        key = (variant, source)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, source: str, parsed: ParsedSource, variant: Hashable = None):
+        key = (variant, source)
+        size = ESTIMATED_BYTES_PER_CHAR * len(source) + sys.getsizeof(source)
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+
+            # An entry larger than the whole cache would only evict the rest
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+
+            self.entries[key] = (parsed, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self.lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self.entries), self.bytes)
+
+    def __len__(self) -> int:
+        return len(self.entries)
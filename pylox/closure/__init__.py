@@ -0,0 +1 @@
+from .compiler import ClosureCompiler
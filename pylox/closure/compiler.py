@@ -0,0 +1,198 @@
+from typing import Callable, List
+from pylox.token import Token, TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter.environment import Environment, UNDEFINED
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.output import OutputSink
+from pylox.intepreter.rope import STRING_TYPES, concat
+from pylox.intepreter.utils import stringify, is_truthy
+
+Closure = Callable[[], object]
+
+ADD_MESSAGE = "Operands should be two numbers or two strings"
+NUMBERS_MESSAGE = "Operands must be numbers"
+
+
+def _add(operator: Token, left: Closure, right: Closure) -> Closure:
+    def add():
+        lhs = left()
+        rhs = right()
+        if isinstance(lhs, float) and isinstance(rhs, float):
+            return lhs + rhs
+        if isinstance(lhs, STRING_TYPES) and isinstance(rhs, STRING_TYPES):
+            return concat(lhs, rhs)
+        raise IntepreterRuntimeError(operator, ADD_MESSAGE)
+
+    return add
+
+
+def _numeric(apply: Callable[[float, float], object]):
+    """Builds a closure factory for an operator that only accepts numbers"""
+
+    def factory(operator: Token, left: Closure, right: Closure) -> Closure:
+        def numeric():
+            lhs = left()
+            rhs = right()
+            if not (isinstance(lhs, float) and isinstance(rhs, float)):
+                raise IntepreterRuntimeError(operator, NUMBERS_MESSAGE)
+            return apply(lhs, rhs)
+
+        return numeric
+
+    return factory
+
+
+def _subtract(operator: Token, left: Closure, right: Closure) -> Closure:
+    # The most common arithmetic operators are spelled out instead of going
+    # through `_numeric`, saving one call per evaluation
+    def subtract():
+        lhs = left()
+        rhs = right()
+        if not (isinstance(lhs, float) and isinstance(rhs, float)):
+            raise IntepreterRuntimeError(operator, NUMBERS_MESSAGE)
+        return lhs - rhs
+
+    return subtract
+
+
+def _multiply(operator: Token, left: Closure, right: Closure) -> Closure:
+    def multiply():
+        lhs = left()
+        rhs = right()
+        if not (isinstance(lhs, float) and isinstance(rhs, float)):
+            raise IntepreterRuntimeError(operator, NUMBERS_MESSAGE)
+        return lhs * rhs
+
+    return multiply
+
+
+def _equal(_: Token, left: Closure, right: Closure) -> Closure:
+    return lambda: left() == right()
+
+
+def _not_equal(_: Token, left: Closure, right: Closure) -> Closure:
+    return lambda: left() != right()
+
+
+BINARY_FACTORIES = {
+    TokenType.PLUS: _add,
+    TokenType.MINUS: _subtract,
+    TokenType.STAR: _multiply,
+    TokenType.SLASH: _numeric(lambda a, b: a / b),
+    TokenType.GREATER: _numeric(lambda a, b: a > b),
+    TokenType.GREATER_EQ: _numeric(lambda a, b: a >= b),
+    TokenType.LESS: _numeric(lambda a, b: a < b),
+    TokenType.LESS_EQ: _numeric(lambda a, b: a <= b),
+    TokenType.EQ_EQ: _equal,
+    TokenType.BANG_EQ: _not_equal,
+}
+
+
+class ClosureCompiler(ex.Visitor, st.Visitor):
+    """Compiles AST nodes into nested Python closures
+
+    All dispatch on node types and operators happens once, at compile time.
+    The resulting closures take no arguments and are bound to the slots of
+    `env`, so a compiled program can be run repeatedly against the same
+    environment. Printed lines go to `output`.
+    """
+
+    def __init__(self, env: Environment, output: OutputSink):
+        self.env = env
+        self.output = output
+
+    def compile(self, statements: List[st.Stmt]) -> Closure:
+        compiled = tuple(stmt.accept(self) for stmt in statements)
+
+        def program():
+            for stmt in compiled:
+                stmt()
+
+        return program
+
+    def compile_expr(self, expr: ex.Expr) -> Closure:
+        return expr.accept(self)
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt) -> Closure:
+        value = stmt.expr.accept(self)
+        write = self.output.write
+        return lambda: write(stringify(value()))
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt) -> Closure:
+        return stmt.expr.accept(self)
+
+    def visit_var_stmt(self, stmt: st.VarStmt) -> Closure:
+        values = self.env.values
+        slot = stmt.slot
+        if stmt.initializer is None:
+
+            def declare():
+                values[slot] = None
+
+            return declare
+
+        value = stmt.initializer.accept(self)
+
+        def define():
+            values[slot] = value()
+
+        return define
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr) -> Closure:
+        value = expr.value
+        return lambda: value
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr) -> Closure:
+        return expr.expr.accept(self)
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr) -> Closure:
+        right = expr.right.accept(self)
+
+        match expr.operator.token_type:
+            case TokenType.MINUS:
+                return lambda: -float(right())
+            case TokenType.BANG:
+                return lambda: not is_truthy(right())
+
+        raise ValueError("Unknown unary operator {}".format(expr.operator.lexeme))
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr) -> Closure:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        factory = BINARY_FACTORIES[expr.operator.token_type]
+        return factory(expr.operator, left, right)
+
+    def visit_variable_expr(self, expr: ex.VariableExpr) -> Closure:
+        values = self.env.values
+        undefined = self.env.undefined
+        slot = expr.slot
+        name = expr.name
+
+        def variable():
+            value = values[slot]
+            if value is UNDEFINED:
+                raise undefined(name)
+            return value
+
+        return variable
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr) -> Closure:
+        values = self.env.values
+        unassignable = self.env.unassignable
+        slot = expr.slot
+        name = expr.name
+        value = expr.value.accept(self)
+
+        def assignment():
+            result = value()
+            if values[slot] is UNDEFINED:
+                raise unassignable(name)
+            values[slot] = result
+            return result
+
+        return assignment
@@ -1 +1,46 @@
-from .interpreter import Intepreter
\ No newline at end of file
+"""The tree-walking intepreter and the front end shared by every engine
+
+Like the names of `pylox`, the names exported here are imported on first
+use. The engines, the resolver and the caches import the leaf modules of
+this package (`environment`, `exc`, `utils`, `rope`, `output`) while
+`interpreter` imports them in turn; loading `interpreter` from here up
+front would make importing any of them first a cycle.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # What `__getattr__` resolves, spelled out for static tools
+    from pylox.intepreter.interpreter import Intepreter
+    from pylox.intepreter.budget import Budget
+    from pylox.intepreter.profiler import Profiler
+    from pylox.intepreter.output import OutputSink, BufferedSink, FileSink, MemorySink, NullSink
+    from pylox.intepreter.snapshot import Snapshot
+
+# Name -> module it is imported from when first looked up
+_LAZY = {
+    "Intepreter": "pylox.intepreter.interpreter",
+    "Budget": "pylox.intepreter.budget",
+    "Profiler": "pylox.intepreter.profiler",
+    "OutputSink": "pylox.intepreter.output",
+    "BufferedSink": "pylox.intepreter.output",
+    "FileSink": "pylox.intepreter.output",
+    "MemorySink": "pylox.intepreter.output",
+    "NullSink": "pylox.intepreter.output",
+    "Snapshot": "pylox.intepreter.snapshot",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module 'pylox.intepreter' has no attribute '{}'".format(name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
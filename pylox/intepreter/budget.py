@@ -0,0 +1,128 @@
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Optional
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter.exc import FuelExhausted, DeadlineExceeded
+from pylox.intepreter.expression import ExprEvaluator
+from pylox.intepreter.statement import StmtEvaluator
+
+# Units of fuel spent between two reads of the clock
+CLOCK_INTERVAL = 256
+
+# Names of the fields holding child nodes, indexed by `kind`
+EXPR_CHILDREN = tuple(
+    tuple(field.name for field in fields(cls) if field.type == "Expr") for cls in ex.KINDS
+)
+STMT_CHILDREN = tuple(
+    tuple(field.name for field in fields(cls) if field.type == "Expr") for cls in st.KINDS
+)
+
+
+@dataclass
+class Budget:
+    """Limits on a single `Intepreter.run`"""
+
+    # Units of work: one per statement and one per expression node evaluated
+    fuel: Optional[int] = None
+    # Wall-clock seconds
+    timeout: Optional[float] = None
+
+
+def statement_cost(stmt: st.Stmt) -> int:
+    """Fuel a statement burns: its own node plus every expression node in it"""
+    cost = 1
+    stack = [getattr(stmt, name) for name in STMT_CHILDREN[stmt.kind]]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            cost += 1
+            stack.extend(getattr(node, name) for name in EXPR_CHILDREN[node.kind])
+    return cost
+
+
+class Meter:
+    """What is left of a `Budget` while a program runs
+
+    Spending fuel is one subtraction and one comparison against
+    `checkpoint`, below which the limits are actually looked at: fuel
+    running out, or, every `CLOCK_INTERVAL` units, the deadline.
+    """
+
+    __slots__ = ("budget", "fuel", "deadline", "checkpoint", "line")
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.fuel = budget.fuel if budget.fuel is not None else sys.maxsize
+        self.deadline = None
+        self.checkpoint = 0
+        if budget.timeout is not None:
+            self.deadline = time.monotonic() + budget.timeout
+            self.checkpoint = max(self.fuel - CLOCK_INTERVAL, 0)
+        # Line of the statement being run, to report errors at
+        self.line = 0
+
+    def charge(self, cost: int, line: int):
+        """Spend `cost` units on the statement at `line`"""
+        self.line = line
+        self.fuel -= cost
+        if self.fuel < self.checkpoint:
+            self.check()
+
+    def tick(self):
+        """Spend one unit on the current statement"""
+        self.fuel -= 1
+        if self.fuel < self.checkpoint:
+            self.check()
+
+    def check(self):
+        if self.fuel < 0:
+            raise FuelExhausted(self.line, "Out of fuel after {} steps".format(self.budget.fuel))
+        if self.deadline is not None:
+            if time.monotonic() > self.deadline:
+                raise DeadlineExceeded(
+                    self.line, "Deadline of {}s exceeded".format(self.budget.timeout)
+                )
+            self.checkpoint = max(self.fuel - CLOCK_INTERVAL, 0)
+
+
+@dataclass
+class MeteredExprEvaluator(ExprEvaluator):
+    """`ExprEvaluator` spending one unit of fuel per node
+
+    Only the dispatch table differs, so unmetered evaluation is untouched.
+    """
+
+    meter: Meter
+
+    def dispatch_table(self) -> list:
+        tick = self.meter.tick
+
+        def metered(visit):
+            def visit_metered(expr: ex.Expr):
+                tick()
+                return visit(expr)
+
+            return visit_metered
+
+        return [metered(visit) for visit in super().dispatch_table()]
+
+
+@dataclass
+class MeteredStmtEvaluator(StmtEvaluator):
+    """`StmtEvaluator` spending one unit of fuel per statement"""
+
+    meter: Meter
+
+    def dispatch_table(self) -> list:
+        charge = self.meter.charge
+
+        def metered(visit):
+            def visit_metered(stmt: st.Stmt):
+                charge(1, stmt.line)
+                return visit(stmt)
+
+            return visit_metered
+
+        return [metered(visit) for visit in super().dispatch_table()]
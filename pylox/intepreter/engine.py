@@ -0,0 +1,185 @@
+from abc import ABC, abstractmethod
+from types import CodeType
+from typing import List
+
+from pylox.ast import Expr, Stmt
+from pylox.intepreter.budget import (
+    Meter,
+    MeteredExprEvaluator,
+    MeteredStmtEvaluator,
+    statement_cost,
+)
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.exc import NestedTooDeeply
+from pylox.intepreter.output import OutputSink
+from pylox.intepreter.profiler import Profiler, ProfilingExprEvaluator, ProfilingStmtEvaluator
+from pylox.intepreter.expression import ExprEvaluator
+from pylox.intepreter.statement import StmtEvaluator
+from pylox.intepreter.utils import gc_paused
+from pylox.vm import BytecodeCompiler, VM
+from pylox.closure import ClosureCompiler
+from pylox.quickening import QuickeningCompiler
+from pylox.transpiler import Transpiler
+
+
+class Engine(ABC):
+    """Executes parsed programs against an environment
+
+    Programs go through `compile` once and may then be `run` any number
+    of times. Printed lines go to `output`.
+    """
+
+    def __init__(self, env: Environment, output: OutputSink):
+        self.env = env
+        self.output = output
+
+    @abstractmethod
+    def compile(self, statements: List[Stmt]) -> object: ...
+
+    @abstractmethod
+    def compile_expr(self, expr: Expr) -> object: ...
+
+    @abstractmethod
+    def run(self, program: object) -> object: ...
+
+    def compile_metered(self, statements: List[Stmt]) -> object:
+        """Compile `statements` for `run_metered`
+
+        Statements are compiled one by one, so that fuel is charged and the
+        clock read between them. A statement is charged its whole cost
+        before it runs.
+        """
+        return [(statement_cost(stmt), stmt.line, self.compile([stmt])) for stmt in statements]
+
+    def run_metered(self, program: object, meter: Meter) -> object:
+        for cost, line, compiled in program:
+            meter.charge(cost, line)
+            self.run(compiled)
+        return None
+
+
+class TreeEngine(Engine):
+    """The tree-walking evaluator"""
+
+    def __init__(self, env: Environment, output: OutputSink):
+        super().__init__(env, output)
+        self.expr_evaluator = ExprEvaluator(env)
+        self.stmt_evaluator = StmtEvaluator(self.expr_evaluator, env, output)
+
+    def compile(self, statements: List[Stmt]) -> object:
+        return statements
+
+    def compile_expr(self, expr: Expr) -> object:
+        return expr
+
+    def run(self, program: object) -> object:
+        if isinstance(program, Expr):
+            return self.expr_evaluator.evaluate(program)
+
+        _run_statements(self.stmt_evaluator, program)
+        return None
+
+    def compile_metered(self, statements: List[Stmt]) -> object:
+        return statements
+
+    def run_metered(self, program: object, meter: Meter) -> object:
+        # Charged node by node, so even a single statement can be interrupted
+        expr_evaluator = MeteredExprEvaluator(self.env, meter)
+        stmt_evaluator = MeteredStmtEvaluator(expr_evaluator, self.env, self.output, meter)
+        _run_statements(stmt_evaluator, program)
+        return None
+
+    def run_profiled(self, program: object, profiler: Profiler) -> object:
+        expr_evaluator = ProfilingExprEvaluator(self.env, profiler)
+        stmt_evaluator = ProfilingStmtEvaluator(expr_evaluator, self.env, self.output, profiler)
+        _run_statements(stmt_evaluator, program)
+        return None
+
+
+def _run_statements(stmt_evaluator: StmtEvaluator, program: List[Stmt]):
+    stmt = None
+    try:
+        for stmt in program:
+            stmt_evaluator.evaluate(stmt)
+    except RecursionError:
+        # The evaluators recurse once per nested expression
+        raise NestedTooDeeply(stmt.line) from None
+
+
+class VMEngine(Engine):
+    """Bytecode compiler plus stack-based virtual machine"""
+
+    def __init__(self, env: Environment, output: OutputSink):
+        super().__init__(env, output)
+        self.vm = VM(env, output)
+
+    def compile(self, statements: List[Stmt]) -> object:
+        with gc_paused():
+            return BytecodeCompiler().compile(statements)
+
+    def compile_expr(self, expr: Expr) -> object:
+        with gc_paused():
+            return BytecodeCompiler().compile_expr(expr)
+
+    def run(self, program: object) -> object:
+        return self.vm.run(program)
+
+
+class ClosureEngine(Engine):
+    """AST nodes compiled once into nested, pre-bound Python closures"""
+
+    def compile(self, statements: List[Stmt]) -> object:
+        with gc_paused():
+            return ClosureCompiler(self.env, self.output).compile(statements)
+
+    def compile_expr(self, expr: Expr) -> object:
+        with gc_paused():
+            return ClosureCompiler(self.env, self.output).compile_expr(expr)
+
+    def run(self, program: object) -> object:
+        return program()
+
+
+class QuickeningEngine(Engine):
+    """A tree of nodes that specialize themselves on the types they see"""
+
+    def compile(self, statements: List[Stmt]) -> object:
+        with gc_paused():
+            return QuickeningCompiler(self.env, self.output).compile(statements)
+
+    def compile_expr(self, expr: Expr) -> object:
+        with gc_paused():
+            return QuickeningCompiler(self.env, self.output).compile_expr(expr)
+
+    def run(self, program: object) -> object:
+        return program.evaluate()
+
+
+class TranspilerEngine(Engine):
+    """Programs transpiled to Python source and compiled to code objects"""
+
+    def compile(self, statements: List[Stmt]) -> object:
+        with gc_paused():
+            return self._load(Transpiler().compile_code(statements))
+
+    def compile_expr(self, expr: Expr) -> object:
+        with gc_paused():
+            return self._load(Transpiler().compile_expr_code(expr))
+
+    def run(self, program: object) -> object:
+        return program(self.env, self.output.write)
+
+    def _load(self, code: CodeType):
+        namespace = {"__name__": "pylox_program"}
+        # pylint: disable=W0122
+        exec(code, namespace)
+        return namespace["run"]
+
+
+ENGINES = {
+    "tree": TreeEngine,
+    "vm": VMEngine,
+    "closure": ClosureEngine,
+    "quick": QuickeningEngine,
+    "python": TranspilerEngine,
+}
@@ -1,26 +1,116 @@
+from collections import ChainMap
+from itertools import islice
+from typing import List, MutableMapping, Tuple
 from pylox import Token
 from pylox.intepreter.exc import IntepreterRuntimeError
 
+UNDEFINED = object()
+
 
 class Environment:
+    """Global variables, stored in a flat list of slots
+
+    Slots are allocated by name when a variable is declared (usually by the
+    `Resolver`), so resolved code can use `get_at`/`assign_at`/`define_at`
+    without hashing anything. The name-based methods remain for callers that
+    have no resolved slot at hand.
+
+    Compiled programs hold on to `values`, so it is only ever changed in
+    place, and slots are never taken back once allocated.
+    """
+
+    __slots__ = ("slots", "values", "shared")
+
     def __init__(self):
-        self._env = {}
+        self.slots: MutableMapping[str, int] = {}
+        self.values: List[object] = []
+        # Whether a fork reads through `slots`, which must then be copied
+        # before it changes
+        self.shared = False
+
+    def fork(self) -> "Environment":
+        """A new environment starting out with the same variables
+
+        The values are copied, which only copies references. The fork looks
+        slots up through this environment's, and keeps the ones it declares
+        itself in a layer of its own, so neither forking nor declaring
+        copies all the names.
+        """
+        forked = Environment()
+        forked.slots = ChainMap({}, self.slots)
+        forked.values = self.values.copy()
+        self.shared = True
+        return forked
+
+    def slot(self, name: str) -> int:
+        """Get the slot of a variable, allocating it if needed"""
+        index = self.slots.get(name)
+        if index is None:
+            if self.shared:
+                # For a `ChainMap`, only its own layer is copied
+                self.slots = self.slots.copy()
+                self.shared = False
+            index = len(self.values)
+            self.slots[name] = index
+            self.values.append(UNDEFINED)
+        return index
 
     def get(self, name: Token) -> object:
-        value = self._env.get(name)
-        if value is None:
-            raise IntepreterRuntimeError(
-                name, "Variable undefined: {}".format(name.lexeme)
-            )
-        return value
+        index = self.slots.get(name.lexeme)
+        if index is None:
+            raise self.undefined(name)
+        return self.get_at(index, name)
 
     def define(self, name: Token, initializer: object):
-        self._env[name] = initializer
+        self.values[self.slot(name.lexeme)] = initializer
 
     def assign(self, name: Token, value: object):
-        if name not in self._env:
-            raise IntepreterRuntimeError(
-                name, "Variable {} is assigned before declaration".format(name.lexeme)
-            )
-        self._env[name] = value
-        
\ No newline at end of file
+        index = self.slots.get(name.lexeme)
+        if index is None:
+            raise self.unassignable(name)
+        self.assign_at(index, name, value)
+
+    def get_at(self, slot: int, name: Token) -> object:
+        value = self.values[slot]
+        if value is UNDEFINED:
+            raise self.undefined(name)
+        return value
+
+    def define_at(self, slot: int, value: object):
+        self.values[slot] = value
+
+    def assign_at(self, slot: int, name: Token, value: object):
+        if self.values[slot] is UNDEFINED:
+            raise self.unassignable(name)
+        self.values[slot] = value
+
+    def restore(self, names: Tuple[str, ...], values: Tuple[object, ...]):
+        """Set the variables `names` to `values`, and undefine all others
+
+        `names` are in slot order. When the slots of this environment start
+        out the same way, as they do when restoring the state it or a fork of
+        it had earlier, the values are copied over in one go.
+        """
+        count, known = len(names), len(self.slots)
+        if tuple(islice(self.slots, count)) == names[:known]:
+            for name in names[known:]:
+                self.slot(name)
+            self.values[:count] = values
+            self.values[count:] = [UNDEFINED] * (len(self.values) - count)
+            return
+
+        self.values[:] = [UNDEFINED] * len(self.values)
+        for name, value in zip(names, values):
+            self.values[self.slot(name)] = value
+
+    @staticmethod
+    def undefined(name: Token) -> IntepreterRuntimeError:
+        return IntepreterRuntimeError(
+            name, "Variable undefined: {}".format(name.lexeme)
+        )
+
+    @staticmethod
+    def unassignable(name: Token) -> IntepreterRuntimeError:
+        return IntepreterRuntimeError(
+            name, "Variable {} is assigned before declaration".format(name.lexeme)
+        )
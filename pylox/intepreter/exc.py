@@ -4,3 +4,34 @@ class IntepreterRuntimeError(Exception):
     def __init__(self, token: Token, message: str):
         super().__init__(message)
         self.token = token
+
+
+class BudgetExceeded(IntepreterRuntimeError):
+    """A program was stopped for running too long
+
+    Reported at the line of the statement that was interrupted, since the
+    budget has no token of its own.
+    """
+
+    def __init__(self, line: int, message: str):
+        super().__init__(None, message)
+        self.line = line
+
+
+class FuelExhausted(BudgetExceeded):
+    pass
+
+
+class DeadlineExceeded(BudgetExceeded):
+    pass
+
+
+class NestedTooDeeply(IntepreterRuntimeError):
+    """An expression nested deeper than the Python stack of the tree-walker
+
+    Reported at the line of its statement, like `BudgetExceeded`.
+    """
+
+    def __init__(self, line: int):
+        super().__init__(None, "Expression nested too deeply")
+        self.line = line
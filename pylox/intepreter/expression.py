@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Tuple, Type, Union
 from dataclasses import dataclass
 from pylox.token import TokenType, Token
 from pylox.ast.expr import (
@@ -13,12 +13,18 @@ from pylox.ast.expr import (
 )
 from pylox.intepreter.exc import IntepreterRuntimeError
 from pylox.intepreter.environment import Environment
+from pylox.intepreter.utils import is_truthy
+from pylox.intepreter.rope import STRING_TYPES, concat
 
 
 @dataclass
 class ExprEvaluator(Visitor):
     env: Environment
 
+    def __post_init__(self):
+        # Indexed by `Expr.kind`, replacing `accept` double dispatch
+        self.dispatch = self.dispatch_table()
+
     def visit_literal_expr(self, expr: LiteralExpr) -> object:
         return expr.value
 
@@ -42,14 +48,14 @@ class ExprEvaluator(Visitor):
 
         match (expr.operator.token_type):
             case TokenType.PLUS:
-                if not (
-                    self.are_same_type(str, left, right)
-                    or self.are_same_type(float, left, right)
-                ):
+                if self.are_same_type(float, left, right):
+                    result = left + right
+                elif self.are_same_type(STRING_TYPES, left, right):
+                    result = concat(left, right)
+                else:
                     raise IntepreterRuntimeError(
                         expr.operator, "Operands should be two numbers or two strings"
                     )
-                result = left + right
             case TokenType.MINUS:
                 self.ensure_numbers(expr.operator, left, right)
                 result = left - right
@@ -65,13 +71,12 @@ class ExprEvaluator(Visitor):
             case TokenType.LESS:
                 self.ensure_numbers(expr.operator, left, right)
                 result = left < right
-                self.ensure_numbers(expr.operator, left, right)
             case TokenType.GREATER_EQ:
-                result = left >= right
                 self.ensure_numbers(expr.operator, left, right)
+                result = left >= right
             case TokenType.LESS_EQ:
                 self.ensure_numbers(expr.operator, left, right)
-                result = left < right
+                result = left <= right
             case TokenType.BANG_EQ:
                 result = left != right
             case TokenType.EQ_EQ:
@@ -80,28 +85,22 @@ class ExprEvaluator(Visitor):
         return result
 
     def visit_variable_expr(self, expr: VariableExpr):
-        return self.env.get(expr.name)
+        return self.env.get_at(expr.slot, expr.name)
 
     def visit_assignment_expr(self, expr: AssignmentExpr):
         value = self.evaluate(expr.value)
-        self.env.assign(expr.name, value)
+        self.env.assign_at(expr.slot, expr.name, value)
+        return value
 
     def ensure_numbers(self, operator: Token, *args: object):
         if not self.are_same_type(float, *args):
             raise IntepreterRuntimeError(operator, "Operands must be numbers")
 
-    def are_same_type(self, t: Type, *args: object):
+    def are_same_type(self, t: Union[Type, Tuple[Type, ...]], *args: object):
         return all(isinstance(arg, t) for arg in args)
 
     def is_truthy(self, value: object) -> bool:
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, int):
-            return bool(value)
-        if value is None:
-            return False
-
-        return True
+        return is_truthy(value)
 
     def evaluate(self, expr: Expr) -> object:
-        return expr.accept(self)
+        return self.dispatch[expr.kind](expr)
@@ -1,32 +1,214 @@
-from typing import List
+import copy
+from contextlib import nullcontext
+from typing import Callable, ContextManager, List, Optional
 
 from pylox import Token, Expr, Stmt, ErrorReporter
-from pylox.lexer import Scanner
+from pylox.lexer import SCANNERS
 from pylox.parser import Parser
-from pylox.intepreter.expression import ExprEvaluator
-from pylox.intepreter.statement import StmtEvaluator
+from pylox.resolver import Resolver, nesting_depth
+from pylox.optimizer import Optimizer, OptimizerOptions
+from pylox.cache import ProgramCache, SourceCache, ParsedSource
+from pylox.intepreter.engine import ENGINES
+from pylox.intepreter.budget import Budget, Meter
 from pylox.intepreter.environment import Environment
-from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.output import OutputSink, BufferedSink
+from pylox.intepreter.profiler import Profiler
+from pylox.intepreter.rope import Rope
+from pylox.intepreter.snapshot import Snapshot
+from pylox.intepreter.exc import IntepreterRuntimeError, BudgetExceeded, NestedTooDeeply
 
 class Intepreter:
-    def __init__(self):
+    def __init__(
+        self,
+        engine: str = "tree",
+        optimizer: OptimizerOptions = None,
+        scanner: str = "char",
+        cache: ProgramCache = None,
+        source_cache: SourceCache = None,
+        budget: Budget = None,
+        profiler: Profiler = None,
+        output: OutputSink = None,
+        phases: Callable[[str], ContextManager] = None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine: {}".format(engine))
+        if profiler is not None and (engine != "tree" or budget is not None):
+            # Only the tree-walker still has nodes to time once compiled
+            raise ValueError("Profiling needs the tree engine and no budget")
+        if scanner not in SCANNERS:
+            raise ValueError("Unknown scanner: {}".format(scanner))
+
         self.env = Environment()
         self.error_reporter = ErrorReporter()
-        self.expr_evaluator = ExprEvaluator(self.env)
-        self.stmt_evaluator = StmtEvaluator(self.expr_evaluator, self.env)
+        # Printed lines, buffered to stdout by default and flushed by `run`
+        self.output = output if output is not None else BufferedSink()
+        self.engine = ENGINES[engine](self.env, self.output)
+        self.optimizer = Optimizer(optimizer) if optimizer is not None else None
+        self.scanner = scanner
+        self.cache = cache
+        self.source_cache = source_cache
+        # Limits every `run`; programs are compiled for metering if set
+        self.budget = budget
+        # Records every `run` of the tree engine if set
+        self.profiler = profiler
+        # Keys the entries of `source_cache` this intepreter and its forks share
+        self.cache_scope = object()
+        # Entered around each phase of `compile` and `run`, by name, if set
+        self.phases = phases
+
+    def snapshot(self) -> Snapshot:
+        """The current value of every global variable"""
+        return Snapshot.of(self.env)
+
+    def restore(self, snapshot: Snapshot):
+        """Put the variables back to `snapshot`, undefining any declared since
+
+        The snapshot may come from another intepreter, e.g. loaded from
+        disk. Programs compiled before remain valid and can be run again.
+        """
+        self.env.restore(snapshot.names, snapshot.values)
+
+    def fork(self, output: OutputSink = None) -> "Intepreter":
+        """A new intepreter with the same settings, starting from the current variables
+
+        Running programs in the fork does not change this intepreter, nor the
+        other way round. The environment is forked copy-on-write, so a fork
+        costs little even after a large prelude. Printed lines go to `output`,
+        or to the same sink as this intepreter's.
+
+        A fork shares the entries of `source_cache` with this intepreter, so
+        the two must not compile or run programs at the same time.
+        """
+        forked = copy.copy(self)
+        forked.env = self.env.fork()
+        forked.error_reporter = ErrorReporter()
+        forked.output = output if output is not None else self.output
+        forked.engine = type(self.engine)(forked.env, forked.output)
+        return forked
 
     def intepret(self, source: str) -> object:
-        tokens, e = self.lex(source)
-        if e.had_error:
+        program = self.compile(source)
+        if program is None:
             return None
-        
-        statements, e = self.parse(tokens)
+
+        return self.run(program)
+
+    def compile(self, source: str) -> object:
+        """Lex, parse and compile `source` for the selected engine
+
+        The result can be passed to `run` any number of times. Returns None
+        if the source has errors.
+        """
+        statements = self._front_end(source)
+        if statements is None:
+            return None
+
+        return self._compile_optimized(statements)
+
+    def _front_end(self, source: str) -> Optional[List[Stmt]]:
+        """Parsed and optimized statements of `source`, cached where enabled"""
+        variant = self._cache_variant()
+        if self.source_cache is not None:
+            parsed = self.source_cache.get(source, self._source_cache_key("program"))
+            if parsed is not None:
+                return parsed.ast
+
+        tokens = None
+        statements = self.cache.load(source, variant) if self.cache is not None else None
+        if statements is None:
+            with self._phase("lex"):
+                tokens, e = self.lex(source)
+            if e.had_error:
+                return None
+
+            with self._phase("parse"):
+                statements, e = self.parse(tokens)
+            if e.had_error:
+                return None
+
+            if self.optimizer is not None:
+                with self._phase("optimize"):
+                    try:
+                        statements = self.optimize(statements)
+                    except RecursionError:
+                        self._nested_too_deeply(statements)
+                        return None
+            if self.cache is not None:
+                self.cache.store(source, statements, variant)
+
+        if self.source_cache is not None:
+            self.source_cache.put(
+                source, ParsedSource(tokens, statements), self._source_cache_key("program")
+            )
+        return statements
+
+    def _cache_variant(self) -> str:
+        # Programs are cached after optimization, so the passes are part of the key
+        return repr(self.optimizer.options) if self.optimizer is not None else ""
+
+    def _source_cache_key(self, kind: str) -> tuple:
+        # Resolving writes slots into the cached AST, so entries are only
+        # handed to this intepreter and its forks, which resolve them again
+        # before every run
+        return (kind, self._cache_variant(), self.cache_scope)
+
+    def _compile_statements(self, statements: List[Stmt]) -> object:
+        return self._compile_optimized(self.optimize(statements))
+
+    def _compile_optimized(self, statements: List[Stmt]) -> object:
+        with self._phase("resolve"):
+            e = self.resolve(statements)
         if e.had_error:
             return None
-        
-        return self.evaluate(statements)
+
+        with self._phase("compile"):
+            try:
+                if self.budget is not None:
+                    return self.engine.compile_metered(statements)
+                return self.engine.compile(statements)
+            except RecursionError:
+                self._nested_too_deeply(statements)
+                return None
+
+    def _nested_too_deeply(self, statements: List[Stmt]) -> ErrorReporter:
+        # The parser and the resolver take any depth, but the optimizer and
+        # the engines recurse; reported at the most deeply nested statement
+        def depth(stmt: Stmt) -> int:
+            expr = getattr(stmt, "expr", None) or getattr(stmt, "initializer", None)
+            return nesting_depth(expr) if expr is not None else 0
+
+        error_reporter = ErrorReporter()
+        error_reporter.error(max(statements, key=depth).line, "Expression nested too deeply")
+        return error_reporter
+
+    def _phase(self, name: str) -> ContextManager:
+        return self.phases(name) if self.phases is not None else nullcontext()
+
+    def run(self, program: object):
+        try:
+            try:
+                with self._phase("run"):
+                    if self.profiler is not None:
+                        self.engine.run_profiled(program, self.profiler)
+                    elif self.budget is None:
+                        self.engine.run(program)
+                    else:
+                        self.engine.run_metered(program, Meter(self.budget))
+            finally:
+                # Before any error is reported, so it follows the output
+                self.output.flush()
+        except (BudgetExceeded, NestedTooDeeply) as e:
+            self.error_reporter.error(e.line, f"Runtime error: {str(e)}")
+        except IntepreterRuntimeError as e:
+            self.error_reporter.error_token(e.token, f"Runtime error: {str(e)}")
     
     def _intepret_expr(self, source: str) -> object:
+        parsed = None
+        if self.source_cache is not None:
+            parsed = self.source_cache.get(source, self._source_cache_key("expr"))
+        if parsed is not None:
+            return self.evaluate_expr(parsed.ast)
+
         tokens, e = self.lex(source)
         if e.had_error:
             return None
@@ -34,12 +216,15 @@ class Intepreter:
         ast, e = self._parse_expr(tokens)
         if e.had_error:
             return None
-        
+
+        if self.source_cache is not None:
+            self.source_cache.put(source, ParsedSource(tokens, ast), self._source_cache_key("expr"))
         return self.evaluate_expr(ast)
     
-    def lex(self, source: str):
+    def lex(self, source: str, scanner: str = None):
+        """Tokenize `source` with the given scanner, or the default one"""
         error_reporter = ErrorReporter()
-        scanner = Scanner(source, error_reporter)
+        scanner = SCANNERS[scanner or self.scanner](source, error_reporter)
         tokens = scanner.scan_tokens()
 
         return tokens, error_reporter
@@ -51,6 +236,23 @@ class Intepreter:
 
         return statements, error_reporter
     
+    def optimize(self, statements: List[Stmt]) -> List[Stmt]:
+        if self.optimizer is None:
+            return statements
+        return self.optimizer.optimize(statements)
+
+    def resolve(self, statements: List[Stmt]) -> ErrorReporter:
+        error_reporter = ErrorReporter()
+        Resolver(self.env, error_reporter).resolve(statements)
+
+        return error_reporter
+
+    def _resolve_expr(self, ast: Expr) -> ErrorReporter:
+        error_reporter = ErrorReporter()
+        Resolver(self.env, error_reporter).resolve_expr(ast)
+
+        return error_reporter
+
     def _parse_expr(self, tokens: List[Token]):
         error_reporter = ErrorReporter()
         parser = Parser(tokens, error_reporter)
@@ -60,11 +262,21 @@ class Intepreter:
         return statements, error_reporter
     
     def evaluate_expr(self, ast: Expr):
-        return self.expr_evaluator.evaluate(ast)
+        if self.optimizer is not None:
+            ast = self.optimizer.optimize_expr(ast)
+
+        if self._resolve_expr(ast).had_error:
+            return None
+
+        result = self.engine.run(self.engine.compile_expr(ast))
+        # Ropes are internal to the engines; callers get the string
+        if isinstance(result, Rope):
+            return result.flatten()
+        return result
 
     def evaluate(self, statements: List[Stmt]):
-        try:
-            for stmt in statements:
-                self.stmt_evaluator.evaluate(stmt)
-        except IntepreterRuntimeError as e:
-            self.error_reporter.error_token(e.token, f"Runtime error: {str(e)}")
+        program = self._compile_statements(statements)
+        if program is None:
+            return None
+
+        return self.run(program)
@@ -0,0 +1,94 @@
+"""Where the lines written by `print` statements go
+
+Every engine writes through the `OutputSink` of its intepreter, one call
+per `print`. `Intepreter.run` flushes the sink once the program ends, and
+before a runtime error is reported, so output and errors keep their order.
+"""
+import sys
+from abc import ABC, abstractmethod
+from typing import List, Optional, TextIO
+
+# Characters collected before a buffered sink writes them out
+DEFAULT_BUFFER_SIZE = 8192
+
+
+class OutputSink(ABC):
+    @abstractmethod
+    def write(self, line: str) -> None:
+        """Output one printed line, given without its newline"""
+
+    def flush(self) -> None:
+        """Write out anything still buffered"""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class BufferedSink(OutputSink):
+    """Lines joined and written to a stream once `buffer_size` characters are collected
+
+    Without a stream, lines go to whatever `sys.stdout` is when they are
+    written out, so redirecting stdout around `run` still captures them. A
+    buffer size of 0 writes every line as it is printed.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if buffer_size < 0:
+            raise ValueError("The buffer size cannot be negative")
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.lines: List[str] = []
+        self.size = 0
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+        self.size += len(line) + 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        if self.lines:
+            self.lines.append("")
+            stream.write("\n".join(self.lines))
+            self.lines = []
+            self.size = 0
+        stream.flush()
+
+
+class FileSink(BufferedSink):
+    """A `BufferedSink` to a file it opens, and closes on `close`"""
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE, append: bool = False):
+        # pylint: disable=R1732
+        super().__init__(open(path, "a" if append else "w", encoding="utf-8"), buffer_size)
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.stream.close()
+
+
+class MemorySink(OutputSink):
+    """Printed lines kept in a list, e.g. to check the output of a program"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+    def getvalue(self) -> str:
+        """The output as it would have been printed"""
+        return "".join(line + "\n" for line in self.lines)
+
+    def clear(self) -> None:
+        self.lines = []
+
+
+class NullSink(OutputSink):
+    """Discards the output, e.g. to time a program without its I/O"""
+
+    def write(self, line: str) -> None:
+        pass
@@ -0,0 +1,191 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter.expression import ExprEvaluator
+from pylox.intepreter.statement import StmtEvaluator
+
+DEFAULT_REPORT_LIMIT = 20
+
+
+@dataclass
+class NodeStats:
+    node: object
+    # Line of the node's token, or of its statement for nodes without one
+    line: int
+    label: str
+    calls: int = 0
+    # Seconds spent in the node, with and without its children
+    total: float = 0.0
+    self_time: float = 0.0
+
+
+class Frame:
+    """A node as reached through one particular chain of parents"""
+
+    __slots__ = ("stats", "children", "self_time")
+
+    def __init__(self, stats: Optional[NodeStats]):
+        self.stats = stats
+        self.children: Dict[int, "Frame"] = {}
+        self.self_time = 0.0
+
+
+def _token_of(node: object):
+    match node:
+        case ex.BinaryExpr(operator=token) | ex.UnaryExpr(operator=token):
+            return token
+        case ex.VariableExpr(name=token) | ex.AssignmentExpr(name=token) | st.VarStmt(name=token):
+            return token
+    return None
+
+
+class Profiler:
+    """Call counts and times of the nodes of the programs run under it
+
+    Pass one to `Intepreter(profiler=...)`: runs then go through evaluator
+    subclasses that time every node, keeping both per-node totals and the
+    tree of parent chains the nodes were reached through. The results
+    accumulate over runs until `reset`.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        # By node identity; the stats keep their node alive, so ids are not reused
+        self.nodes: Dict[int, NodeStats] = {}
+        self.root = Frame(None)
+        self._frames: List[Frame] = [self.root]
+        self._starts: List[float] = []
+        self._child_times: List[float] = []
+        self._line = 0
+
+    def enter(self, node: object):
+        parent = self._frames[-1]
+        frame = parent.children.get(id(node))
+        if frame is None:
+            stats = self.nodes.get(id(node))
+            if stats is None:
+                stats = self.nodes[id(node)] = self._stats(node)
+            frame = parent.children[id(node)] = Frame(stats)
+
+        if isinstance(node, st.Stmt):
+            self._line = frame.stats.line
+        self._frames.append(frame)
+        self._child_times.append(0.0)
+        self._starts.append(self.clock())
+
+    def exit(self):
+        elapsed = self.clock() - self._starts.pop()
+        self_time = elapsed - self._child_times.pop()
+        frame = self._frames.pop()
+
+        stats = frame.stats
+        stats.calls += 1
+        stats.total += elapsed
+        stats.self_time += self_time
+        frame.self_time += self_time
+        if self._child_times:
+            self._child_times[-1] += elapsed
+
+    def report(self, limit: int = DEFAULT_REPORT_LIMIT) -> str:
+        """The lines and nodes with the most self time, `limit` of each"""
+        nodes = sorted(self.nodes.values(), key=lambda stats: stats.self_time, reverse=True)
+        lines: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0])
+        for stats in nodes:
+            lines[stats.line][0] += stats.calls
+            lines[stats.line][1] += stats.self_time
+
+        out = [
+            "{} node evaluations in {:.3f}ms".format(
+                sum(stats.calls for stats in nodes),
+                1000 * sum(stats.self_time for stats in nodes),
+            ),
+            "",
+            "{:>6} {:>9} {:>10}".format("line", "calls", "self ms"),
+        ]
+        for line, (calls, self_time) in sorted(
+            lines.items(), key=lambda item: item[1][1], reverse=True
+        )[:limit]:
+            out.append("{:>6} {:>9} {:>10.3f}".format(line, calls, 1000 * self_time))
+
+        out += ["", "{:>6} {:>9} {:>10} {:>10}  {}".format("line", "calls", "total ms", "self ms", "node")]
+        for stats in nodes[:limit]:
+            out.append(
+                "{:>6} {:>9} {:>10.3f} {:>10.3f}  {}".format(
+                    stats.line, stats.calls, 1000 * stats.total, 1000 * stats.self_time, stats.label
+                )
+            )
+        return "\n".join(out)
+
+    def collapsed(self) -> str:
+        """Self time by stack of nodes, in the folded format of flamegraph tools
+
+        One line per stack: frames separated by ";", then the self time in
+        microseconds.
+        """
+        samples: Dict[str, int] = defaultdict(int)
+        # (frame, path of its parent)
+        stack = [(child, "") for child in self.root.children.values()]
+        while stack:
+            frame, parent_path = stack.pop()
+            path = parent_path + ";" + frame.stats.label if parent_path else frame.stats.label
+            samples[path] += round(1e6 * frame.self_time)
+            stack.extend((child, path) for child in frame.children.values())
+
+        return "".join(
+            "{} {}\n".format(path, count) for path, count in sorted(samples.items()) if count > 0
+        )
+
+    def _stats(self, node: object) -> NodeStats:
+        token = _token_of(node)
+        line = self._line
+        if isinstance(node, st.Stmt):
+            line = node.line
+        elif token is not None:
+            line = token.line
+
+        label = type(node).__name__
+        if token is not None:
+            label += " " + token.lexeme
+        # ";" separates frames in the collapsed output
+        label = "{}:{}".format(label, line).replace(";", ",")
+        return NodeStats(node, line, label)
+
+
+def _profiled(profiler: Profiler, table: list) -> list:
+    enter, exit_ = profiler.enter, profiler.exit
+
+    def profiled(visit):
+        def visit_profiled(node):
+            enter(node)
+            try:
+                return visit(node)
+            finally:
+                exit_()
+
+        return visit_profiled
+
+    return [profiled(visit) for visit in table]
+
+
+@dataclass
+class ProfilingExprEvaluator(ExprEvaluator):
+    """`ExprEvaluator` timing every node; only the dispatch table differs"""
+
+    profiler: Profiler
+
+    def dispatch_table(self) -> list:
+        return _profiled(self.profiler, super().dispatch_table())
+
+
+@dataclass
+class ProfilingStmtEvaluator(StmtEvaluator):
+    profiler: Profiler
+
+    def dispatch_table(self) -> list:
+        return _profiled(self.profiler, super().dispatch_table())
@@ -0,0 +1,78 @@
+"""Lox strings built by concatenation, without copying
+
+`s = s + piece` on Python strings copies all of `s` every time, so
+building a string piece by piece is quadratic. `concat` instead returns a
+`Rope` holding both operands once the result is long enough to make that
+worth it. A rope is flattened into one `str` only when its characters are
+needed: when it is printed (`str`), compared (`==`, `!=`) or hashed. The
+flat string is kept, so that happens once per rope.
+
+Ropes compare and hash like the strings they stand for, and pickle as
+plain strings, so programs cannot tell the two apart.
+"""
+from typing import Union
+
+# Shorter results are plain strings: copying a few characters is cheaper
+# than another object to flatten later
+MIN_ROPE_LENGTH = 256
+
+
+class Rope:
+    __slots__ = ("left", "right", "length", "flat")
+
+    def __init__(self, left: "LoxString", right: "LoxString"):
+        self.left = left
+        self.right = right
+        self.length = len(left) + len(right)
+        self.flat = None
+
+    def flatten(self) -> str:
+        if self.flat is None:
+            # Ropes built in a loop are as deep as it ran, so no recursion
+            parts = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if type(node) is str:
+                    parts.append(node)
+                elif node.flat is not None:
+                    parts.append(node.flat)
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+            self.flat = "".join(parts)
+            # The pieces are no longer needed, and may be large
+            self.left = self.right = None
+        return self.flat
+
+    def __str__(self) -> str:
+        return self.flatten()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, Rope)):
+            return self.flatten() == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.flatten())
+
+    def __reduce__(self):
+        return (str, (self.flatten(),))
+
+    def __repr__(self) -> str:
+        return "Rope({!r})".format(self.flatten())
+
+
+LoxString = Union[str, Rope]
+# What `isinstance` checks for a Lox string
+STRING_TYPES = (str, Rope)
+
+
+def concat(left: LoxString, right: LoxString) -> LoxString:
+    if len(left) + len(right) < MIN_ROPE_LENGTH:
+        # Both are short, so both are `str`
+        return left + right
+    return Rope(left, right)
@@ -0,0 +1,70 @@
+import marshal
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Tuple, Union
+from pylox.intepreter.environment import Environment, UNDEFINED
+from pylox.intepreter.rope import Rope
+
+"""
+Saved global state of an intepreter
+
+A snapshot holds the name of every slot of an `Environment`, in slot
+order, and the value in it. Ropes are flattened when the snapshot is
+taken, so every value is a plain float, string, bool or None, or
+`UNDEFINED` for a variable that was never assigned. `dumps` writes that
+as a `marshal` payload of two tuples behind a small header, which loads in
+a fraction of the time it takes to run the code that built the state.
+"""
+
+# Bump whenever the serialized layout changes
+FORMAT_VERSION = 1
+
+MAGIC = b"LOXS"
+# magic, format version, payload length
+HEADER = struct.Struct("<4sHQ")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    names: Tuple[str, ...]
+    values: Tuple[object, ...]
+
+    @classmethod
+    def of(cls, env: Environment) -> "Snapshot":
+        values = tuple(
+            value.flatten() if type(value) is Rope else value for value in env.values
+        )
+        return cls(tuple(env.slots), values)
+
+    def dumps(self) -> bytes:
+        # UNDEFINED cannot be marshalled; those slots are listed apart
+        undefined = tuple(i for i, value in enumerate(self.values) if value is UNDEFINED)
+        values = tuple(None if value is UNDEFINED else value for value in self.values)
+        payload = marshal.dumps((self.names, values, undefined))
+        return HEADER.pack(MAGIC, FORMAT_VERSION, len(payload)) + payload
+
+    @classmethod
+    def loads(cls, data: bytes) -> "Snapshot":
+        if len(data) < HEADER.size:
+            raise ValueError("Not a snapshot")
+        magic, version, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION or length != len(data) - HEADER.size:
+            raise ValueError("Not a snapshot, or one of another version")
+
+        try:
+            names, values, undefined = marshal.loads(data[HEADER.size:])
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError("Corrupt snapshot") from e
+        values = list(values)
+        for index in undefined:
+            values[index] = UNDEFINED
+        return cls(names, tuple(values))
+
+    def save(self, path: Union[str, os.PathLike]):
+        Path(path).write_bytes(self.dumps())
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "Snapshot":
+        return cls.loads(Path(path).read_bytes())
@@ -3,23 +3,30 @@ from pylox.ast.stmt import ExpressionStmt, PrintStmt, Stmt, VarStmt, Visitor
 from pylox.intepreter.expression import ExprEvaluator
 from pylox.intepreter.utils import stringify
 from pylox.intepreter.environment import Environment
+from pylox.intepreter.output import OutputSink
 
 @dataclass
 class StmtEvaluator(Visitor):
     expr_evaluator: ExprEvaluator
     env: Environment
-    
+    output: OutputSink
+
+    def __post_init__(self):
+        self.dispatch = self.dispatch_table()
+
     def visit_print_stmt(self, stmt: PrintStmt):
         result = self.expr_evaluator.evaluate(stmt.expr)
-        print(stringify(result))
+        self.output.write(stringify(result))
 
     def visit_expression_stmt(self, stmt: ExpressionStmt):
         self.expr_evaluator.evaluate(stmt.expr)
 
     def visit_var_stmt(self, stmt: VarStmt):
-        value = self.expr_evaluator.evaluate(stmt.initializer)
-        self.env.define(stmt.name, value)
+        value = None
+        if stmt.initializer is not None:
+            value = self.expr_evaluator.evaluate(stmt.initializer)
+        self.env.define_at(stmt.slot, value)
 
     def evaluate(self, stmt: Stmt):
-        return stmt.accept(self)
+        return self.dispatch[stmt.kind](stmt)
     
\ No newline at end of file
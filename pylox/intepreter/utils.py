@@ -1,6 +1,36 @@
+import gc
+from contextlib import contextmanager
+
+
 def stringify(obj: object):
     s = str(obj)
-    if isinstance(obj, float):
-        s.endswith(".0")
-        s = s[:s.find(".0")]
+    if isinstance(obj, float) and s.endswith(".0"):
+        s = s[:-2]
     return s
+
+
+def is_truthy(value: object) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return bool(value)
+    if value is None:
+        return False
+
+    return True
+
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic garbage collector for the duration of the block
+
+    Compiling a large tree allocates a lot of long-lived, acyclic objects,
+    which makes the collector rescan the growing heap over and over again.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
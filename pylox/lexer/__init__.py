@@ -1 +1,11 @@
 from .scanner import Scanner
+from .regex_scanner import RegexScanner
+from .stream_scanner import StreamScanner
+from .buffer_scanner import BufferScanner
+from .token_buffer import TokenBuffer
+
+SCANNERS = {
+    "char": Scanner,
+    "regex": RegexScanner,
+    "buffer": BufferScanner,
+}
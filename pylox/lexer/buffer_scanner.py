@@ -0,0 +1,87 @@
+from typing import Callable, Optional, Tuple
+from pylox.token import TokenType
+from pylox.lexer.scanner import Scanner, KEYWORDS
+from pylox.lexer.regex_scanner import RegexScanner, MASTER_PATTERN, OPERATORS
+from pylox.lexer.token_buffer import TokenBuffer
+
+KEYWORD_IDS = {keyword: token_type.value for keyword, token_type in KEYWORDS.items()}
+OPERATOR_IDS = {op: token_type.value for op, token_type in OPERATORS.items()}
+
+
+class BufferScanner(RegexScanner):
+    """A `RegexScanner` that produces a `TokenBuffer` instead of a list"""
+
+    def scan_tokens(self) -> TokenBuffer:
+        buffer = TokenBuffer(self.source)
+        pos, line = self.scan_into(buffer)
+        buffer.append(TokenType.EOF, pos, pos, line)
+        return buffer
+
+    def scan_into(
+        self,
+        buffer: TokenBuffer,
+        pos: int = 0,
+        line: int = 1,
+        stop_from: Optional[int] = None,
+        stop: Callable[[int], bool] = None,
+    ) -> Tuple[int, int]:
+        """Append the tokens from `pos` on, which is on `line`, to `buffer`
+
+        `pos` must not be inside a token or comment. Scanning stops at the
+        end of the source, or between tokens at the first position from
+        `stop_from` on that `stop` accepts. Returns that position and its
+        line.
+        """
+        # pylint: disable=R0912,R0914
+        source = self.source
+        types, starts, ends, lines = buffer.types, buffer.starts, buffer.ends, buffer.lines
+        match = MASTER_PATTERN.match
+        ident = TokenType.IDENT.value
+        number = TokenType.NUMBER.value
+        string = TokenType.STRING.value
+        end = len(source)
+        if stop_from is None:
+            stop_from = end + 1
+
+        fallback = Scanner(source, self.reporter)
+
+        while pos < end:
+            if pos >= stop_from and stop(pos):
+                break
+            m = match(source, pos)
+            kind = m.lastgroup
+
+            if kind == "ident":
+                types.append(KEYWORD_IDS.get(m[kind], ident))
+            elif kind == "operator":
+                types.append(OPERATOR_IDS[m[kind]])
+            elif kind == "newline":
+                line += 1
+                pos = m.end()
+                continue
+            elif kind == "number":
+                types.append(number)
+            elif kind == "string":
+                line += m[kind].count("\n")
+                types.append(string)
+            elif kind == "other":
+                state = fallback.state
+                state.start = state.current = m.start(kind)
+                state.line = line
+                # pylint: disable=W0212
+                fallback._scan_token()
+                if fallback.tokens:
+                    token = fallback.tokens.pop()
+                    buffer.append(token.token_type, state.start, state.current, token.line)
+                pos, line = state.current, state.line
+                continue
+            else:
+                pos = m.end()
+                continue
+
+            starts.append(m.start(kind))
+            pos = m.end()
+            ends.append(pos)
+            lines.append(line)
+
+        return pos, line
@@ -0,0 +1,116 @@
+import re
+from typing import List, Tuple
+from pylox.token import Token, TokenType
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.scanner import Scanner, ONE_CHAR_TOKENS, CONDITIONAL_TOKENS, KEYWORDS
+
+OPERATORS = dict(ONE_CHAR_TOKENS)
+OPERATORS["/"] = TokenType.SLASH
+for _char, (_single, (_next, _double)) in CONDITIONAL_TOKENS.items():
+    OPERATORS[_char] = _single
+    OPERATORS[_char + _next] = _double
+
+# Anything next to a non-ASCII character is left to the `Scanner`, whose
+# `isdigit`/`isalpha` checks accept more than the ASCII classes below. The
+# lookaheads also keep numbers and identifiers from matching a prefix only.
+# Leading blanks are skipped as part of every match.
+LOOKAHEAD = 2
+NON_ASCII = r"[^\x00-\x7f]"
+MASTER_PATTERN = re.compile(
+    r"[ \t\r]*(?:"
+    + "|".join((
+        r"(?P<newline>\n)",
+        r"(?P<comment>//[^\n]*)",
+        r'(?P<string>"[^"]*")',
+        rf"(?P<number>[0-9]+(?:\.[0-9]+)?)(?![0-9]|\.[0-9]|\.?{NON_ASCII})",
+        rf"(?P<ident>[A-Za-z_][A-Za-z0-9_]*)(?![A-Za-z0-9_]|{NON_ASCII})",
+        "(?P<operator>{})".format(
+            "|".join(re.escape(op) for op in sorted(OPERATORS, key=len, reverse=True))
+        ),
+        r"(?P<other>.)",
+        r"(?P<end>\Z)",
+    ))
+    + ")"
+)
+
+
+class RegexScanner:
+    """A faster Lox lexer, driven by one compiled regular expression
+
+    Produces the same tokens, line numbers and error reports as `Scanner`,
+    which it hands over to for anything the pattern does not cover
+    (unterminated strings, illegal or non-ASCII characters).
+    """
+
+    def __init__(self, source: str, error_reporter: ErrorReporter):
+        self.source: str = source
+        self.tokens: List[Token] = []
+        self.reporter = error_reporter
+
+    def scan_tokens(self) -> List[Token]:
+        _, line = self._scan(self.source, 0, 1, final=True)
+        self.tokens.append(Token(TokenType.EOF, "", None, line))
+        return self.tokens
+
+    def _scan(self, source: str, pos: int, line: int, final: bool) -> Tuple[int, int]:
+        """Scan `source` from `pos` into `self.tokens`
+
+        Unless `final` is set, `source` is only a prefix of the input, and
+        scanning stops before any token that may continue past its end.
+        Returns the position and line number scanning stopped at.
+        """
+        # pylint: disable=R0912
+        tokens = self.tokens
+        append = tokens.append
+        match = MASTER_PATTERN.match
+        end = len(source)
+        safe_end = end if final else end - LOOKAHEAD
+        ident, number, string = TokenType.IDENT, TokenType.NUMBER, TokenType.STRING
+
+        fallback = Scanner(source, self.reporter)
+        fallback.tokens = tokens
+
+        while pos < end:
+            m = match(source, pos)
+            kind = m.lastgroup
+            m_end = m.end()
+            if m_end > safe_end:
+                break
+
+            if kind == "ident":
+                text = m[kind]
+                append(Token(KEYWORDS.get(text, ident), text, None, line))
+            elif kind == "operator":
+                text = m[kind]
+                append(Token(OPERATORS[text], text, None, line))
+            elif kind == "newline":
+                line += 1
+            elif kind == "number":
+                text = m[kind]
+                append(Token(number, text, float(text), line))
+            elif kind == "string":
+                text = m[kind]
+                line += text.count("\n")
+                append(Token(string, text, text[1:-1], line))
+            elif kind == "other":
+                start = m.start(kind)
+                # A string without its closing quote yet may still get one
+                if not final and source[start] == '"':
+                    break
+
+                state = fallback.state
+                state.start = state.current = start
+                state.line = line
+                count = len(tokens)
+                # pylint: disable=W0212
+                fallback._scan_token()
+                if state.current > safe_end:
+                    del tokens[count:]
+                    break
+
+                pos, line = state.current, state.line
+                continue
+
+            pos = m_end
+
+        return pos, line
@@ -0,0 +1,69 @@
+import codecs
+import os
+from typing import BinaryIO, Iterator, Union
+from pylox.token import Token, TokenType
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.regex_scanner import RegexScanner
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+BLANKS = " \t\r"
+
+
+class StreamScanner:
+    """Lexes a UTF-8 encoded Lox file chunk by chunk
+
+    Tokens are yielded as soon as they are complete, and only the unfinished
+    tail of the current chunk is carried over to the next one. Memory use is
+    therefore bounded by the chunk size plus the longest single token, not by
+    the size of the file. The tokens and error reports are the same as those
+    of `Scanner` on the whole file.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        error_reporter: ErrorReporter,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.source = source
+        self.reporter = error_reporter
+        self.chunk_size = chunk_size
+
+    def iter_tokens(self) -> Iterator[Token]:
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as file:
+                yield from self._iter_tokens(file)
+        else:
+            yield from self._iter_tokens(self.source)
+
+    def _iter_tokens(self, file: BinaryIO) -> Iterator[Token]:
+        scanner = RegexScanner("", self.reporter)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        line = 1
+
+        while True:
+            data = file.read(self.chunk_size)
+            final = not data
+            text = pending + decoder.decode(data, final=final)
+
+            # pylint: disable=W0212
+            pos, line = scanner._scan(text, 0, line, final)
+            yield from scanner.tokens
+            scanner.tokens.clear()
+
+            if final:
+                break
+            pending = self._carry_over(text[pos:])
+
+        yield Token(TokenType.EOF, "", None, line)
+
+    @staticmethod
+    def _carry_over(rest: str) -> str:
+        """The part of an unscanned tail that the next chunk still needs"""
+        rest = rest.lstrip(BLANKS)
+        # The text of a comment does not matter, only where it ends
+        if rest.startswith("//") and "\n" not in rest:
+            return "//"
+        return rest
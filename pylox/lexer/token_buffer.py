@@ -0,0 +1,108 @@
+from array import array
+from typing import List
+from pylox.token import Token, TokenType
+
+# Token types by their `value`, which is what a `TokenBuffer` stores
+TOKEN_TYPES = [None] + list(TokenType)
+
+
+class TokenBuffer:
+    """Tokens stored column-wise in parallel arrays
+
+    Each token costs four machine ints (type id, start and end offsets into
+    the source, line number) instead of a `Token` object and a copy of its
+    lexeme. Lexemes and literals are sliced out of the source on demand.
+    """
+
+    __slots__ = ("source", "types", "starts", "ends", "lines")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.lines = array("i")
+
+    def append(self, token_type: TokenType, start: int, end: int, line: int):
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> "TokenView":
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def lexeme(self, index: int) -> str:
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def literal(self, index: int) -> object:
+        token_type = TOKEN_TYPES[self.types[index]]
+        if token_type == TokenType.NUMBER:
+            return float(self.lexeme(index))
+        if token_type == TokenType.STRING:
+            return self.source[self.starts[index] + 1 : self.ends[index] - 1]
+        return None
+
+    def token(self, index: int) -> Token:
+        """A standalone `Token` for the token at `index`"""
+        return Token(
+            TOKEN_TYPES[self.types[index]],
+            self.lexeme(index),
+            self.literal(index),
+            self.lines[index],
+        )
+
+    def to_tokens(self) -> List[Token]:
+        return [self.token(i) for i in range(len(self.types))]
+
+
+class TokenView:
+    """A lazy, `Token`-like view of one entry of a `TokenBuffer`"""
+
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer: TokenBuffer, index: int):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def token_type(self) -> TokenType:
+        return self.buffer.token_type(self.index)
+
+    @property
+    def lexeme(self) -> str:
+        return self.buffer.lexeme(self.index)
+
+    @property
+    def literal(self) -> object:
+        return self.buffer.literal(self.index)
+
+    @property
+    def line(self) -> int:
+        return self.buffer.lines[self.index]
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, (Token, TokenView))
+            and self.token_type == other.token_type
+            and self.lexeme == other.lexeme
+        )
+
+    def __hash__(self) -> int:
+        return (self.token_type.name, self.lexeme).__hash__()
+
+    def __repr__(self) -> str:
+        return "TokenView({})".format(self.to_string())
+
+    def to_string(self) -> str:
+        return "{} {} {}".format(self.token_type, self.lexeme, self.literal)
@@ -0,0 +1 @@
+from .optimizer import Optimizer, OptimizerOptions
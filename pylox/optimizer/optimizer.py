@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from pylox.token import TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter.utils import is_truthy
+
+NUMERIC_FOLDS = {
+    TokenType.MINUS: lambda a, b: a - b,
+    TokenType.STAR: lambda a, b: a * b,
+    TokenType.GREATER: lambda a, b: a > b,
+    TokenType.GREATER_EQ: lambda a, b: a >= b,
+    TokenType.LESS: lambda a, b: a < b,
+    TokenType.LESS_EQ: lambda a, b: a <= b,
+}
+
+EQUALITY_FOLDS = {
+    TokenType.EQ_EQ: lambda a, b: a == b,
+    TokenType.BANG_EQ: lambda a, b: a != b,
+}
+
+FLOAT_RESULTS = {TokenType.MINUS, TokenType.STAR, TokenType.SLASH}
+BOOL_RESULTS = set(EQUALITY_FOLDS) | {
+    TokenType.GREATER,
+    TokenType.GREATER_EQ,
+    TokenType.LESS,
+    TokenType.LESS_EQ,
+}
+
+
+@dataclass
+class OptimizerOptions:
+    """Switches for the individual optimizer passes"""
+
+    # Evaluate operators whose operands are all literals
+    fold_constants: bool = True
+    # Replace `(expr)` with `expr`
+    strip_groupings: bool = True
+    # Collapse `!!expr` and `--expr` when `expr` is already a bool/number
+    simplify_unary: bool = True
+    # Rewrite `x * 1`, `1 * x`, `x / 1` and `x - 0` to `x` when `x` is a number
+    simplify_identities: bool = True
+
+
+def static_type(expr: ex.Expr) -> Optional[type]:
+    """The type `expr` evaluates to, if it can be told without running it"""
+    match expr:
+        case ex.LiteralExpr(value=value):
+            return type(value)
+        case ex.GroupingExpr(expr=inner):
+            return static_type(inner)
+        case ex.UnaryExpr(operator=operator):
+            return float if operator.token_type == TokenType.MINUS else bool
+        case ex.BinaryExpr(operator=operator):
+            if operator.token_type in FLOAT_RESULTS:
+                return float
+            if operator.token_type in BOOL_RESULTS:
+                return bool
+    return None
+
+
+class Optimizer(ex.Visitor, st.Visitor):
+    """Rewrites a parsed program into a cheaper, equivalent one
+
+    Only rewrites that cannot change the program's output are performed: a
+    subtree that would raise at runtime (e.g. `1 + "a"` or `1 / 0`) is left
+    as is, so the error is still reported when, and where, it happens.
+    """
+
+    def __init__(self, options: OptimizerOptions = None):
+        self.options = options or OptimizerOptions()
+
+    def optimize(self, statements: List[st.Stmt]) -> List[st.Stmt]:
+        return [stmt.accept(self) for stmt in statements]
+
+    def optimize_expr(self, expr: ex.Expr) -> ex.Expr:
+        return expr.accept(self)
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt) -> st.Stmt:
+        return st.PrintStmt(stmt.expr.accept(self), stmt.line)
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt) -> st.Stmt:
+        return st.ExpressionStmt(stmt.expr.accept(self), stmt.line)
+
+    def visit_var_stmt(self, stmt: st.VarStmt) -> st.Stmt:
+        if stmt.initializer is None:
+            return st.VarStmt(stmt.name, None, stmt.line)
+        return st.VarStmt(stmt.name, stmt.initializer.accept(self), stmt.line)
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr) -> ex.Expr:
+        return expr
+
+    def visit_variable_expr(self, expr: ex.VariableExpr) -> ex.Expr:
+        return expr
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr) -> ex.Expr:
+        return ex.AssignmentExpr(expr.name, expr.value.accept(self))
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr) -> ex.Expr:
+        inner = expr.expr.accept(self)
+        if self.options.strip_groupings:
+            return inner
+        return ex.GroupingExpr(inner)
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr) -> ex.Expr:
+        right = expr.right.accept(self)
+        token_type = expr.operator.token_type
+
+        if self.options.fold_constants and isinstance(right, ex.LiteralExpr):
+            if token_type == TokenType.BANG:
+                return ex.LiteralExpr(not is_truthy(right.value))
+            if isinstance(right.value, float):
+                return ex.LiteralExpr(-right.value)
+
+        if self.options.simplify_unary:
+            inner = self._ungroup(right)
+            if (
+                isinstance(inner, ex.UnaryExpr)
+                and inner.operator.token_type == token_type
+            ):
+                # `--x` is `float(x)` and `!!x` is `is_truthy(x)`: both are
+                # only `x` itself when `x` already has the resulting type
+                operand = inner.right
+                expected = float if token_type == TokenType.MINUS else bool
+                if static_type(operand) is expected:
+                    return operand
+
+        return ex.UnaryExpr(expr.operator, right)
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr) -> ex.Expr:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+
+        if self.options.fold_constants:
+            folded = self._fold(expr, left, right)
+            if folded is not None:
+                return folded
+
+        if self.options.simplify_identities:
+            simplified = self._simplify(expr, left, right)
+            if simplified is not None:
+                return simplified
+
+        return ex.BinaryExpr(left, expr.operator, right)
+
+    # Helpers
+
+    def _fold(self, expr: ex.BinaryExpr, left: ex.Expr, right: ex.Expr):
+        if not (isinstance(left, ex.LiteralExpr) and isinstance(right, ex.LiteralExpr)):
+            return None
+
+        a, b = left.value, right.value
+        token_type = expr.operator.token_type
+        both_numbers = isinstance(a, float) and isinstance(b, float)
+
+        if token_type in EQUALITY_FOLDS:
+            return ex.LiteralExpr(EQUALITY_FOLDS[token_type](a, b))
+        if token_type == TokenType.PLUS:
+            if both_numbers or (isinstance(a, str) and isinstance(b, str)):
+                return ex.LiteralExpr(a + b)
+        elif token_type == TokenType.SLASH:
+            if both_numbers and b != 0:
+                return ex.LiteralExpr(a / b)
+        elif token_type in NUMERIC_FOLDS and both_numbers:
+            return ex.LiteralExpr(NUMERIC_FOLDS[token_type](a, b))
+
+        return None
+
+    def _simplify(self, expr: ex.BinaryExpr, left: ex.Expr, right: ex.Expr):
+        token_type = expr.operator.token_type
+
+        # `x + 0` is not an identity: -0.0 + 0 gives 0.0
+        if token_type == TokenType.STAR:
+            if self._is_number(right, 1.0) and static_type(left) is float:
+                return left
+            if self._is_number(left, 1.0) and static_type(right) is float:
+                return right
+        elif token_type == TokenType.SLASH:
+            if self._is_number(right, 1.0) and static_type(left) is float:
+                return left
+        elif token_type == TokenType.MINUS:
+            if self._is_number(right, 0.0) and static_type(left) is float:
+                return left
+
+        return None
+
+    @staticmethod
+    def _is_number(expr: ex.Expr, value: float) -> bool:
+        return (
+            isinstance(expr, ex.LiteralExpr)
+            and isinstance(expr.value, float)
+            and expr.value == value
+        )
+
+    @staticmethod
+    def _ungroup(expr: ex.Expr) -> ex.Expr:
+        while isinstance(expr, ex.GroupingExpr):
+            expr = expr.expr
+        return expr
@@ -1 +1,2 @@
 from .parser import Parser
+from .incremental import Document, Edit
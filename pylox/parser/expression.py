@@ -41,8 +41,10 @@ class ExpressionParser:
         if self.state.match_type(TokenType.EQ):
             if not isinstance(expr, VariableExpr):
                 self.state.error(self.state.previous(), "Not an assignment target")
+                self.parse_equality()
+                return expr
             right = self.parse_equality()
-            return AssignmentExpr(getattr(expr, "name"), right)
+            return AssignmentExpr(expr.name, right)
 
         return expr
 
@@ -94,7 +96,7 @@ class ExpressionParser:
     def parse_unary(self) -> Expr:
         while self.state.match_type(TokenType.BANG, TokenType.MINUS):
             op = self.state.previous()
-            right = self.parse_primary()
+            right = self.parse_unary()
             return UnaryExpr(op, right)
 
         return self.parse_primary()
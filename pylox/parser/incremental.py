@@ -0,0 +1,335 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, fields
+from typing import List, Optional
+from pylox.token import Token, TokenType
+from pylox.error_reporter import ErrorReporter
+from pylox.ast import Stmt
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.lexer.buffer_scanner import BufferScanner
+from pylox.lexer.regex_scanner import LOOKAHEAD
+from pylox.lexer.token_buffer import TOKEN_TYPES, TokenBuffer
+from pylox.parser.parser import Parser
+from pylox.parser.exc import ParseError
+
+
+@dataclass
+class Edit:
+    """`deleted` characters at `offset` replaced by `inserted`"""
+
+    offset: int
+    deleted: int = 0
+    inserted: str = ""
+
+    def apply(self, source: str) -> str:
+        if not (0 <= self.offset and self.deleted >= 0 and self.offset + self.deleted <= len(source)):
+            raise ValueError("Edit out of the bounds of the source")
+        return source[: self.offset] + self.inserted + source[self.offset + self.deleted :]
+
+
+class _QuietReporter(ErrorReporter):
+    """Notes errors without printing them; the full parse then reports them"""
+
+    def report(self, line: int, where: str, message: str):
+        self.had_error = True
+
+
+class Document:
+    """A source kept lexed and parsed across edits
+
+    An edit re-lexes from the last token before it until the scanner falls
+    back in step with the old tokens, and re-parses from the first statement
+    those tokens belong to until the parser reaches the start of an old
+    statement again. The statements before and after are reused, the same
+    objects, so `statements` always equals what a full parse of `source`
+    returns. `tokens` and `statements` are updated in place.
+
+    The offsets and lines an edit moves the tokens and statements after it
+    by are not applied to them right away: each keeps one pending shift,
+    from a mark on, and an edit only applies it to (or takes it back from)
+    what lies between the mark and the edit. Edits close to one another cost
+    what they change, however long the source after them; reading `tokens`
+    or `statements` applies the rest.
+
+    A source with errors is lexed and parsed in full, as is the first
+    source after it, and the errors are reported to `error_reporter`.
+    """
+
+    def __init__(self, source: str = "", expression_parser: str = "pratt"):
+        self.expression_parser = expression_parser
+        self.source = source
+        self.error_reporter = ErrorReporter()
+        self._tokens: TokenBuffer = None
+        self._statements: Optional[List[Stmt]] = None
+        # Index of the token after each statement
+        self._ends = array("i")
+        # Tokens from `_token_mark` on are `_offset_shift` characters and
+        # `_token_lines` lines further on than they hold; statements from
+        # `_statement_mark` on end `_index_shift` tokens and
+        # `_statement_lines` lines further on
+        self._token_mark = self._offset_shift = self._token_lines = 0
+        self._statement_mark = self._index_shift = self._statement_lines = 0
+        # Tokens scanned, statements parsed, and tokens and statements
+        # shifted by the last update
+        self.relexed = 0
+        self.reparsed = 0
+        self.shifted = 0
+        self._parse_all()
+
+    @property
+    def had_error(self) -> bool:
+        return self.error_reporter.had_error
+
+    @property
+    def tokens(self) -> TokenBuffer:
+        self._move_token_mark(len(self._tokens))
+        self._offset_shift = self._token_lines = 0
+        return self._tokens
+
+    @property
+    def statements(self) -> Optional[List[Stmt]]:
+        if self._statements is not None:
+            self._move_statement_mark(len(self._statements))
+            self._index_shift = self._statement_lines = 0
+        return self._statements
+
+    def edit(self, edit: Edit) -> bool:
+        """Apply `edit` to the source; False if the new source has errors"""
+        source = edit.apply(self.source)
+        if self.had_error or not self._update(edit, source):
+            self.source = source
+            self._parse_all()
+        return not self.had_error
+
+    def _parse_all(self):
+        self.error_reporter = ErrorReporter()
+        self._tokens = BufferScanner(self.source, self.error_reporter).scan_tokens()
+        self.relexed = len(self._tokens)
+        self._statements, self._ends = None, array("i")
+        self._token_mark = self._offset_shift = self._token_lines = 0
+        self._statement_mark = self._index_shift = self._statement_lines = 0
+        self.reparsed = self.shifted = 0
+        if self.error_reporter.had_error:
+            return
+
+        parser = Parser(self._tokens, self.error_reporter, self.expression_parser)
+        statements = []
+        try:
+            while not parser.state.eof():
+                statements.append(parser.stmt_parser.parse_declaration())
+                self._ends.append(parser.state.position)
+        except ParseError:
+            return
+        self._statements = statements
+        self.reparsed = len(statements)
+
+    def _update(self, edit: Edit, source: str) -> bool:
+        """Re-lex and re-parse around `edit`; False if that hit an error"""
+        # pylint: disable=R0914
+        old = self._tokens
+        count = len(old)
+        mark, offset = self._token_mark, self._offset_shift
+        delta = len(edit.inserted) - edit.deleted
+        edit_end = edit.offset + edit.deleted
+        line_delta = edit.inserted.count("\n") - self.source.count("\n", edit.offset, edit_end)
+
+        # The scanner looks ahead of a token to find its end, so tokens
+        # ending just before the edit are scanned again too
+        first = _search(old.ends, edit.offset - LOOKAHEAD, 0, count - 1, mark, offset, bisect_right)
+        pos = _at(old.ends, first - 1, mark, offset) if first else 0
+        line = _at(old.lines, first - 1, mark, self._token_lines) if first else 1
+
+        # Past the inserted text, scanning is back in step at the start of
+        # any old token: from there on, the source is the same as before
+        def in_step(new_pos: int) -> bool:
+            index = _search(old.starts, new_pos - delta, first, count, mark, offset, bisect_left)
+            return index < count and _at(old.starts, index, mark, offset) == new_pos - delta
+
+        reporter = _QuietReporter()
+        fresh = TokenBuffer(source)
+        pos, line = BufferScanner(source, reporter).scan_into(
+            fresh, pos, line, edit.offset + len(edit.inserted), in_step
+        )
+        if reporter.had_error:
+            return False
+        if pos < len(source):
+            rest = _search(old.starts, pos - delta, first, count, mark, offset, bisect_left)
+        else:
+            fresh.append(TokenType.EOF, pos, pos, line)
+            rest = count
+
+        # The old tokens from `rest` on stay as they are; the edit adds to
+        # their pending shift
+        self.shifted = 0
+        self._move_token_mark(rest)
+        tokens = old
+        tokens.source = source
+        tokens.types[first:rest] = fresh.types
+        tokens.starts[first:rest] = fresh.starts
+        tokens.ends[first:rest] = fresh.ends
+        tokens.lines[first:rest] = fresh.lines
+        fresh_end = first + len(fresh)
+        self._token_mark = fresh_end
+        self._offset_shift += delta
+        self._token_lines += line_delta
+
+        # Old token indexes from `rest` on move by `shift`
+        shift = fresh_end - rest
+        ends, statement_mark, index_shift = self._ends, self._statement_mark, self._index_shift
+        index = _search(ends, first, 0, len(ends), statement_mark, index_shift, bisect_right)
+        view = _ShiftedTokens(tokens, fresh_end, self._offset_shift, self._token_lines)
+        parser = Parser(view, reporter, self.expression_parser)
+        parser.state.position = _at(ends, index - 1, statement_mark, index_shift) if index else 0
+
+        # Parsed until the parser is at the start of an old statement again
+        parsed, parsed_ends = [], array("i")
+        reuse = len(self._statements)
+        try:
+            while not parser.state.eof():
+                position = parser.state.position
+                if position >= fresh_end:
+                    following = self._statement_at(position - shift, index)
+                    if following is not None:
+                        reuse = following
+                        break
+                parsed.append(parser.stmt_parser.parse_declaration())
+                parsed_ends.append(parser.state.position)
+        except ParseError:
+            return False
+        # Some errors are reported without stopping the parser
+        if reporter.had_error:
+            return False
+
+        self._move_statement_mark(reuse)
+        self._statements[index:reuse] = parsed
+        ends[index:reuse] = parsed_ends
+        self._statement_mark = index + len(parsed)
+        self._index_shift += shift
+        self._statement_lines += line_delta
+
+        self.source = source
+        self.relexed = len(fresh)
+        self.reparsed = len(parsed)
+        return True
+
+    def _statement_at(self, position: int, low: int) -> Optional[int]:
+        """Index of the statement starting at token `position`, if any"""
+        if position == 0:
+            return 0
+        ends, mark, shift = self._ends, self._statement_mark, self._index_shift
+        index = _search(ends, position, low, len(ends), mark, shift, bisect_left)
+        if index < len(ends) and _at(ends, index, mark, shift) == position:
+            return index + 1
+        return None
+
+    def _move_token_mark(self, to: int):
+        """Apply the pending shift to the tokens up to `to`, or take it back from them"""
+        mark, offset, lines = self._token_mark, self._offset_shift, self._token_lines
+        low, high = (mark, to) if mark <= to else (to, mark)
+        if to < mark:
+            offset, lines = -offset, -lines
+        if offset or lines:
+            tokens = self._tokens
+            tokens.starts[low:high] = _shifted(tokens.starts[low:high], offset)
+            tokens.ends[low:high] = _shifted(tokens.ends[low:high], offset)
+            tokens.lines[low:high] = _shifted(tokens.lines[low:high], lines)
+            self.shifted += high - low
+        self._token_mark = to
+
+    def _move_statement_mark(self, to: int):
+        """Apply the pending shift to the statements up to `to`, or take it back from them"""
+        mark, index_shift, lines = self._statement_mark, self._index_shift, self._statement_lines
+        low, high = (mark, to) if mark <= to else (to, mark)
+        if to < mark:
+            index_shift, lines = -index_shift, -lines
+        if index_shift:
+            self._ends[low:high] = _shifted(self._ends[low:high], index_shift)
+        if lines:
+            for stmt in self._statements[low:high]:
+                _shift_lines(stmt, lines)
+        if index_shift or lines:
+            self.shifted += high - low
+        self._statement_mark = to
+
+
+class _ShiftedTokens(TokenBuffer):
+    """The tokens of a `Document` as they read with their pending shift"""
+
+    __slots__ = ("mark", "offset", "line_shift")
+
+    def __init__(self, tokens: TokenBuffer, mark: int, offset: int, line_shift: int):
+        super().__init__(tokens.source)
+        self.types, self.starts, self.ends, self.lines = (
+            tokens.types,
+            tokens.starts,
+            tokens.ends,
+            tokens.lines,
+        )
+        self.mark = mark
+        self.offset = offset
+        self.line_shift = line_shift
+
+    def lexeme(self, index: int) -> str:
+        start = _at(self.starts, index, self.mark, self.offset)
+        return self.source[start : _at(self.ends, index, self.mark, self.offset)]
+
+    def literal(self, index: int) -> object:
+        if self.types[index] == TokenType.STRING.value:
+            return self.lexeme(index)[1:-1]
+        return super().literal(index)
+
+    def token(self, index: int) -> Token:
+        return Token(
+            TOKEN_TYPES[self.types[index]],
+            self.lexeme(index),
+            self.literal(index),
+            _at(self.lines, index, self.mark, self.line_shift),
+        )
+
+
+def _search(values: array, value: int, low: int, high: int, mark: int, shift: int, search) -> int:
+    """`search` (`bisect_left` or `bisect_right`) for `value` in `values[low:high]`,
+    as if `shift` were added to the values from `mark` on"""
+    if low < mark:
+        index = search(values, value, low, min(mark, high))
+        if index < mark:
+            return index
+    return search(values, value - shift, max(low, mark), high)
+
+
+def _at(values: array, index: int, mark: int, shift: int) -> int:
+    """`values[index]`, with `shift` added from `mark` on"""
+    return values[index] + shift if index >= mark else values[index]
+
+
+def _shifted(values: array, delta: int) -> array:
+    if not delta:
+        return values
+    return array("i", map(delta.__add__, values))
+
+
+def _fields_of_type(kinds: tuple, type_name: str) -> List[tuple]:
+    return [tuple(f.name for f in fields(kind) if f.type == type_name) for kind in kinds]
+
+
+# Names of the token and child fields of each node class, by `kind`
+STMT_TOKENS = _fields_of_type(st.KINDS, "Token")
+STMT_CHILDREN = _fields_of_type(st.KINDS, "Expr")
+EXPR_TOKENS = _fields_of_type(ex.KINDS, "Token")
+EXPR_CHILDREN = _fields_of_type(ex.KINDS, "Expr")
+
+
+def _shift_lines(stmt: Stmt, delta: int):
+    """Move `stmt` and every token in it `delta` lines down"""
+    stmt.line += delta
+    for name in STMT_TOKENS[stmt.kind]:
+        getattr(stmt, name).line += delta
+    stack = [getattr(stmt, name) for name in STMT_CHILDREN[stmt.kind]]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        for name in EXPR_TOKENS[node.kind]:
+            getattr(node, name).line += delta
+        stack.extend([getattr(node, name) for name in EXPR_CHILDREN[node.kind]])
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Union
 from pylox.token import Token
 from pylox.error_reporter import ErrorReporter
 from pylox.ast import Expr, Stmt
-from pylox.parser.state import ParserState
+from pylox.parser.state import ParserState, BufferParserState
+from pylox.lexer.token_buffer import TokenBuffer
 from pylox.parser.expression import ExpressionParser
+from pylox.parser.pratt import PrattParser
 from pylox.parser.statement import StatementParser
 from pylox.parser.exc import ParseError
 
@@ -31,11 +33,26 @@ exprStmt       → expression ";" ;
 printStmt      → "print" expression ";" ;
 """
 
+# Both build the same trees; the recursive one is limited by the Python
+# recursion limit on deeply nested expressions
+EXPRESSION_PARSERS = {
+    "pratt": PrattParser,
+    "recursive": ExpressionParser,
+}
+
 
 class Parser:
-    def __init__(self, tokens: List[Token], error_reporter: ErrorReporter):
-        self.state = ParserState(tokens, error_reporter)
-        self.expr_parser = ExpressionParser(self.state)
+    def __init__(
+        self,
+        tokens: Union[List[Token], TokenBuffer],
+        error_reporter: ErrorReporter,
+        expression_parser: str = "pratt",
+    ):
+        if isinstance(tokens, TokenBuffer):
+            self.state = BufferParserState(tokens, error_reporter)
+        else:
+            self.state = ParserState(tokens, error_reporter)
+        self.expr_parser = EXPRESSION_PARSERS[expression_parser](self.state)
         self.stmt_parser = StatementParser(self.state, self.expr_parser)
 
     def parse(self) -> List[Stmt]:
@@ -0,0 +1,142 @@
+from typing import List, Tuple
+from pylox.token import Token, TokenType
+from pylox.ast.expr import (
+    BinaryExpr,
+    UnaryExpr,
+    LiteralExpr,
+    GroupingExpr,
+    VariableExpr,
+    AssignmentExpr,
+    Expr,
+)
+from pylox.parser.state import ParserState
+
+"""
+Precedence-climbing parser for the grammar in `pylox.parser.expression`
+
+Operands and pending operators live on explicit stacks instead of the Python
+call stack, so nesting depth is only bounded by memory. Every token is
+looked at once or twice, against the tables below.
+"""
+
+# Binding powers. Markers for an open "(" or a pending assignment sit below
+# every operator, so reductions stop at them. The token of a marker is the
+# "(", the assigned variable's name, or the "=" of an invalid assignment.
+MARKER = 0
+EQUALITY = 1
+COMPARISON = 2
+TERM = 3
+FACTOR = 4
+UNARY = 5
+
+BINARY_PRECEDENCE = {
+    TokenType.EQ_EQ: EQUALITY,
+    TokenType.BANG_EQ: EQUALITY,
+    TokenType.LESS: COMPARISON,
+    TokenType.LESS_EQ: COMPARISON,
+    TokenType.GREATER: COMPARISON,
+    TokenType.GREATER_EQ: COMPARISON,
+    TokenType.PLUS: TERM,
+    TokenType.MINUS: TERM,
+    TokenType.STAR: FACTOR,
+    TokenType.SLASH: FACTOR,
+}
+
+PREFIX_OPERATORS = {TokenType.BANG, TokenType.MINUS}
+
+KEYWORD_LITERALS = {
+    TokenType.FALSE: False,
+    TokenType.TRUE: True,
+    TokenType.NIL: None,
+}
+
+
+class PrattParser:
+    """Drop-in replacement for `ExpressionParser` without recursion"""
+
+    def __init__(self, state: ParserState):
+        self.state = state
+
+    def parse_expr(self) -> Expr:
+        state = self.state
+        current_type = state.current_type
+
+        operands: List[Expr] = []
+        # (binding power, token)
+        operators: List[Tuple[int, Token]] = []
+
+        while True:
+            # Prefix position: unary operators and "(" until a primary
+            token_type = current_type()
+            while token_type in PREFIX_OPERATORS or token_type is TokenType.LEFT_PAREN:
+                state.position += 1
+                if token_type is TokenType.LEFT_PAREN:
+                    operators.append((MARKER, state.previous()))
+                else:
+                    operators.append((UNARY, state.previous()))
+                token_type = current_type()
+
+            if token_type in KEYWORD_LITERALS:
+                state.position += 1
+                operands.append(LiteralExpr(KEYWORD_LITERALS[token_type]))
+            elif token_type is TokenType.NUMBER or token_type is TokenType.STRING:
+                state.position += 1
+                operands.append(LiteralExpr(state.previous().literal))
+            elif token_type is TokenType.IDENT:
+                state.position += 1
+                operands.append(VariableExpr(state.previous()))
+            else:
+                raise state.error(state.peek(), "Expected expression")
+
+            # Infix position: reduce until an operator needs another operand
+            while True:
+                token_type = current_type()
+                precedence = BINARY_PRECEDENCE.get(token_type)
+                if precedence is not None:
+                    self._reduce(operands, operators, precedence)
+                    state.position += 1
+                    operators.append((precedence, state.previous()))
+                    break
+
+                # The equality at this level is complete
+                self._reduce(operands, operators, EQUALITY)
+                marker = operators[-1][1] if operators else None
+
+                if marker is not None and marker.token_type is not TokenType.LEFT_PAREN:
+                    # Right-hand side of an assignment; like the rest of the
+                    # expression it is an equality, so a second "=" ends it
+                    operators.pop()
+                    value = operands.pop()
+                    if marker.token_type is TokenType.IDENT:
+                        operands.append(AssignmentExpr(marker, value))
+                    marker = operators[-1][1] if operators else None
+                elif token_type is TokenType.EQ:
+                    state.position += 1
+                    target = operands[-1]
+                    if isinstance(target, VariableExpr):
+                        operands.pop()
+                        operators.append((MARKER, target.name))
+                    else:
+                        # Reported but not thrown: the value is parsed and
+                        # dropped, leaving the target in its place
+                        state.error(state.previous(), "Not an assignment target")
+                        operators.append((MARKER, state.previous()))
+                    break
+
+                if marker is None:
+                    return operands.pop()
+
+                # Close the innermost group, which becomes an operand
+                state.match_or_throw(TokenType.RIGHT_PAREN, "Missing closing parenthesis")
+                operators.pop()
+                operands.append(GroupingExpr(operands.pop()))
+
+    def _reduce(self, operands: List[Expr], operators: List[Tuple[int, Token]], precedence: int):
+        """Apply pending operators binding at least as tightly as `precedence`"""
+        while operators and operators[-1][0] >= precedence:
+            power, operator = operators.pop()
+            right = operands.pop()
+            if power == UNARY:
+                operands.append(UnaryExpr(operator, right))
+            else:
+                operands.append(BinaryExpr(operands.pop(), operator, right))
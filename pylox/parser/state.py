@@ -3,6 +3,9 @@ from typing import List
 from pylox.token import Token, TokenType
 from pylox.error_reporter import ErrorReporter
 from pylox.parser.exc import ParseError
+from pylox.lexer.token_buffer import TokenBuffer, TOKEN_TYPES
+
+EOF_ID = TokenType.EOF.value
 
 @dataclass
 class ParserState:
@@ -22,11 +25,15 @@ class ParserState:
         return ParseError()
 
     def match_type(self, *args: TokenType):
-        if any(self.check_current_type(t) for t in args):
-            self.advance()
+        token_type = self.tokens[self.position].token_type
+        if token_type in args and token_type is not TokenType.EOF:
+            self.position += 1
             return True
         return False
 
+    def current_type(self) -> TokenType:
+        return self.tokens[self.position].token_type
+
     def check_current_type(self, t: TokenType):
         if self.eof():
             return False
@@ -45,4 +52,51 @@ class ParserState:
 
     def eof(self):
         return self.peek().token_type == TokenType.EOF
-    
\ No newline at end of file
+    
+
+@dataclass
+class BufferParserState(ParserState):
+    """A `ParserState` reading token types straight off a `TokenBuffer`
+
+    Tokens are only materialized as `Token`s when the parser keeps them (in
+    AST nodes); lookahead for errors gets a lazy `TokenView`.
+    """
+
+    tokens: TokenBuffer
+
+    def __post_init__(self):
+        self.types = self.tokens.types
+
+    def match_or_throw(self, t: TokenType, message: str):
+        if self.check_current_type(t):
+            self.position += 1
+            return self.previous()
+
+        raise self.error(self.peek(), message)
+
+    def match_type(self, *args: TokenType):
+        token_type = TOKEN_TYPES[self.types[self.position]]
+        if token_type in args and token_type is not TokenType.EOF:
+            self.position += 1
+            return True
+        return False
+
+    def check_current_type(self, t: TokenType):
+        return self.types[self.position] == t.value and t is not TokenType.EOF
+
+    def current_type(self) -> TokenType:
+        return TOKEN_TYPES[self.types[self.position]]
+
+    def advance(self):
+        if not self.eof():
+            self.position += 1
+        return self.previous()
+
+    def peek(self):
+        return self.tokens[self.position]
+
+    def previous(self):
+        return self.tokens.token(self.position - 1)
+
+    def eof(self):
+        return self.types[self.position] == EOF_ID
@@ -39,11 +39,11 @@ class StatementParser:
     
     def parse_declaration(self) -> Stmt:
         if self.state.match_type(TokenType.VAR):
-            return self.parse_var_decl()
+            return self.parse_var_decl(self.state.previous().line)
         
         return self.parse_stmt()
     
-    def parse_var_decl(self) -> Stmt:
+    def parse_var_decl(self, line: int) -> Stmt:
         var_name = self.state.match_or_throw(TokenType.IDENT, "Expect variable name")
 
         initializer = None 
@@ -52,21 +52,21 @@ class StatementParser:
         
         self.state.match_or_throw(TokenType.SEMICOLON, "Expect ; after variable declaration")
         
-        return VarStmt(var_name, initializer)
+        return VarStmt(var_name, initializer, line)
 
 
     def parse_stmt(self) -> Stmt:
         if self.state.match_type(TokenType.PRINT):
-            return self.parse_print()
+            return self.parse_print(self.state.previous().line)
         
-        return self.parse_expr_stmt()
+        return self.parse_expr_stmt(self.state.peek().line)
 
-    def parse_print(self) -> Stmt:
+    def parse_print(self, line: int) -> Stmt:
         expr = self.expr_parser.parse_expr()
         self.state.match_or_throw(TokenType.SEMICOLON, "Expected ; after value")
-        return PrintStmt(expr)
+        return PrintStmt(expr, line)
 
-    def parse_expr_stmt(self) -> Stmt:
+    def parse_expr_stmt(self, line: int) -> Stmt:
         expr = self.expr_parser.parse_expr()
         self.state.match_or_throw(TokenType.SEMICOLON, "Expected ; after value")
-        return ExpressionStmt(expr)
+        return ExpressionStmt(expr, line)
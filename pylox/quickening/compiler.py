@@ -0,0 +1,81 @@
+from typing import List
+from pylox.token import TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.output import OutputSink
+from pylox.quickening.nodes import (
+    AssignmentNode,
+    BinaryNode,
+    BlockNode,
+    EqualNode,
+    LiteralNode,
+    Node,
+    NotEqualNode,
+    PrintNode,
+    UnaryNode,
+    VariableNode,
+    VarNode,
+)
+
+
+class QuickeningCompiler(ex.Visitor, st.Visitor):
+    """Builds a tree of self-specializing `Node`s from AST nodes
+
+    Like the AST, the tree is walked to run it, but its operator nodes
+    rewrite themselves for the types they see, so a compiled program gets
+    faster the more it is run. Nodes are bound to the slots of `env`, and
+    printed lines go to `output`.
+    """
+
+    def __init__(self, env: Environment, output: OutputSink):
+        self.env = env
+        self.output = output
+
+    def compile(self, statements: List[st.Stmt]) -> Node:
+        return BlockNode([stmt.accept(self) for stmt in statements])
+
+    def compile_expr(self, expr: ex.Expr) -> Node:
+        return expr.accept(self)
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt) -> Node:
+        return PrintNode(stmt.expr.accept(self), self.output.write)
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt) -> Node:
+        return stmt.expr.accept(self)
+
+    def visit_var_stmt(self, stmt: st.VarStmt) -> Node:
+        if stmt.initializer is None:
+            initializer = LiteralNode(None)
+        else:
+            initializer = stmt.initializer.accept(self)
+        return VarNode(self.env, stmt.slot, initializer)
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr) -> Node:
+        return LiteralNode(expr.value)
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr) -> Node:
+        return expr.expr.accept(self)
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr) -> Node:
+        return UnaryNode(expr.operator, expr.right.accept(self))
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr) -> Node:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        match expr.operator.token_type:
+            case TokenType.EQ_EQ:
+                return EqualNode(left, right)
+            case TokenType.BANG_EQ:
+                return NotEqualNode(left, right)
+        return BinaryNode(expr.operator, left, right)
+
+    def visit_variable_expr(self, expr: ex.VariableExpr) -> Node:
+        return VariableNode(self.env, expr.slot, expr.name)
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr) -> Node:
+        return AssignmentNode(self.env, expr.slot, expr.name, expr.value.accept(self))
@@ -0,0 +1,342 @@
+"""Executable nodes that specialize themselves on the values they see
+
+Binary and unary nodes start out uninitialized. Their first evaluation
+goes through the generic path, with every type check, and then rewrites
+the node into a variant for the operand types it saw by swapping its
+class for a sibling with the same slots. A specialized variant checks one
+cheap guard (`type(x) is float`) instead. When the guard fails, the node
+de-optimizes back to uninitialized, to specialize again on its next
+evaluation. A node that de-optimizes `MAX_DEOPTIMIZATIONS` times stays on
+the generic path for good.
+
+Results, runtime errors and the tokens they are reported at match
+`ExprEvaluator`.
+"""
+from abc import ABC, abstractmethod
+from operator import ge, gt, le, lt, mul, sub, truediv
+from typing import Callable, Dict, List, Tuple
+from pylox.token import Token, TokenType
+from pylox.intepreter.environment import Environment, UNDEFINED
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.rope import STRING_TYPES, Rope, concat
+from pylox.intepreter.utils import is_truthy, stringify
+
+# The guards check exact types on purpose, not with `isinstance`: variants
+# are looked up by the exact operand types, so a guard must hold for those
+# types only and not for their subclasses, and `type(x) is float` is also
+# the cheaper check. Nodes specialize by assigning `__class__`, which is
+# not in their slots but is allowed between classes with the same slots.
+# pylint: disable=unidiomatic-typecheck,assigning-non-slot
+
+MAX_DEOPTIMIZATIONS = 4
+
+ADD_MESSAGE = "Operands should be two numbers or two strings"
+NUMBERS_MESSAGE = "Operands must be numbers"
+
+NUMERIC_OPERATORS: Dict[TokenType, Callable[[float, float], object]] = {
+    TokenType.MINUS: sub,
+    TokenType.STAR: mul,
+    TokenType.SLASH: truediv,
+    TokenType.GREATER: gt,
+    TokenType.GREATER_EQ: ge,
+    TokenType.LESS: lt,
+    TokenType.LESS_EQ: le,
+}
+
+
+def binary(operator: Token, left: object, right: object) -> object:
+    """The generic path of arithmetic and comparison operators"""
+    if operator.token_type is TokenType.PLUS:
+        if isinstance(left, float) and isinstance(right, float):
+            return left + right
+        if isinstance(left, STRING_TYPES) and isinstance(right, STRING_TYPES):
+            return concat(left, right)
+        raise IntepreterRuntimeError(operator, ADD_MESSAGE)
+
+    if not (isinstance(left, float) and isinstance(right, float)):
+        raise IntepreterRuntimeError(operator, NUMBERS_MESSAGE)
+    return NUMERIC_OPERATORS[operator.token_type](left, right)
+
+
+def unary(operator: Token, right: object) -> object:
+    if operator.token_type is TokenType.MINUS:
+        return -float(right)
+    return not is_truthy(right)
+
+
+class Node(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def evaluate(self) -> object: ...
+
+
+class BinaryNode(Node):
+    """An arithmetic or comparison operator, not specialized yet"""
+
+    __slots__ = ("operator", "left", "right", "deoptimizations")
+
+    def __init__(self, operator: Token, left: Node, right: Node):
+        self.operator = operator
+        self.left = left
+        self.right = right
+        self.deoptimizations = 0
+
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        variant = BINARY_VARIANTS.get((self.operator.token_type, type(left), type(right)))
+        if variant is not None:
+            self.__class__ = variant
+        return binary(self.operator, left, right)
+
+    def deoptimize(self, left: object, right: object) -> object:
+        """Take the generic path for operands a variant's guard rejected"""
+        self.deoptimizations += 1
+        if self.deoptimizations < MAX_DEOPTIMIZATIONS:
+            self.__class__ = BinaryNode
+        else:
+            self.__class__ = GenericBinaryNode
+        return binary(self.operator, left, right)
+
+
+class GenericBinaryNode(BinaryNode):
+    """A `BinaryNode` that has seen too many types to specialize"""
+
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        return binary(self.operator, self.left.evaluate(), self.right.evaluate())
+
+
+# The most common operators are spelled out instead of going through
+# `_float_variant`, saving one call per evaluation
+
+
+class FloatAddNode(BinaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        if type(left) is float and type(right) is float:
+            return left + right
+        return self.deoptimize(left, right)
+
+
+class StringConcatNode(BinaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        if type(left) in STRING_TYPES and type(right) in STRING_TYPES:
+            return concat(left, right)
+        return self.deoptimize(left, right)
+
+
+class FloatSubtractNode(BinaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        if type(left) is float and type(right) is float:
+            return left - right
+        return self.deoptimize(left, right)
+
+
+class FloatMultiplyNode(BinaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        if type(left) is float and type(right) is float:
+            return left * right
+        return self.deoptimize(left, right)
+
+
+def _float_variant(name: str, apply: Callable[[float, float], object]) -> type:
+    def evaluate(self) -> object:
+        left = self.left.evaluate()
+        right = self.right.evaluate()
+        if type(left) is float and type(right) is float:
+            return apply(left, right)
+        return self.deoptimize(left, right)
+
+    return type(name, (BinaryNode,), {"__slots__": (), "evaluate": evaluate})
+
+
+# (operator, left type, right type) -> the variant for those operands
+BINARY_VARIANTS: Dict[Tuple[TokenType, type, type], type] = {
+    (TokenType.PLUS, float, float): FloatAddNode,
+    (TokenType.PLUS, str, str): StringConcatNode,
+    (TokenType.PLUS, str, Rope): StringConcatNode,
+    (TokenType.PLUS, Rope, str): StringConcatNode,
+    (TokenType.PLUS, Rope, Rope): StringConcatNode,
+    (TokenType.MINUS, float, float): FloatSubtractNode,
+    (TokenType.STAR, float, float): FloatMultiplyNode,
+    (TokenType.SLASH, float, float): _float_variant("FloatDivideNode", truediv),
+    (TokenType.GREATER, float, float): _float_variant("FloatGreaterNode", gt),
+    (TokenType.GREATER_EQ, float, float): _float_variant("FloatGreaterEqualNode", ge),
+    (TokenType.LESS, float, float): _float_variant("FloatLessNode", lt),
+    (TokenType.LESS_EQ, float, float): _float_variant("FloatLessEqualNode", le),
+}
+
+
+class UnaryNode(Node):
+    """`-` or `!`, not specialized yet"""
+
+    __slots__ = ("operator", "right", "deoptimizations")
+
+    def __init__(self, operator: Token, right: Node):
+        self.operator = operator
+        self.right = right
+        self.deoptimizations = 0
+
+    def evaluate(self) -> object:
+        right = self.right.evaluate()
+        variant = UNARY_VARIANTS.get((self.operator.token_type, type(right)))
+        if variant is not None:
+            self.__class__ = variant
+        return unary(self.operator, right)
+
+    def deoptimize(self, right: object) -> object:
+        self.deoptimizations += 1
+        if self.deoptimizations < MAX_DEOPTIMIZATIONS:
+            self.__class__ = UnaryNode
+        else:
+            self.__class__ = GenericUnaryNode
+        return unary(self.operator, right)
+
+
+class GenericUnaryNode(UnaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        return unary(self.operator, self.right.evaluate())
+
+
+class FloatNegateNode(UnaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        right = self.right.evaluate()
+        if type(right) is float:
+            return -right
+        return self.deoptimize(right)
+
+
+class BoolNotNode(UnaryNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        right = self.right.evaluate()
+        if type(right) is bool:
+            return not right
+        return self.deoptimize(right)
+
+
+UNARY_VARIANTS: Dict[Tuple[TokenType, type], type] = {
+    (TokenType.MINUS, float): FloatNegateNode,
+    (TokenType.BANG, bool): BoolNotNode,
+}
+
+
+class EqualNode(Node):
+    """`==`, which accepts any operands and so has nothing to specialize"""
+
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: Node, right: Node):
+        self.left = left
+        self.right = right
+
+    def evaluate(self) -> object:
+        return self.left.evaluate() == self.right.evaluate()
+
+
+class NotEqualNode(EqualNode):
+    __slots__ = ()
+
+    def evaluate(self) -> object:
+        return self.left.evaluate() != self.right.evaluate()
+
+
+class LiteralNode(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value: object):
+        self.value = value
+
+    def evaluate(self) -> object:
+        return self.value
+
+
+class VariableNode(Node):
+    __slots__ = ("env", "values", "slot", "name")
+
+    def __init__(self, env: Environment, slot: int, name: Token):
+        self.env = env
+        self.values = env.values
+        self.slot = slot
+        self.name = name
+
+    def evaluate(self) -> object:
+        value = self.values[self.slot]
+        if value is UNDEFINED:
+            raise self.env.undefined(self.name)
+        return value
+
+
+class AssignmentNode(VariableNode):
+    __slots__ = ("value",)
+
+    def __init__(self, env: Environment, slot: int, name: Token, value: Node):
+        super().__init__(env, slot, name)
+        self.value = value
+
+    def evaluate(self) -> object:
+        result = self.value.evaluate()
+        if self.values[self.slot] is UNDEFINED:
+            raise self.env.unassignable(self.name)
+        self.values[self.slot] = result
+        return result
+
+
+class PrintNode(Node):
+    __slots__ = ("expr", "write")
+
+    def __init__(self, expr: Node, write: Callable[[str], None]):
+        self.expr = expr
+        self.write = write
+
+    def evaluate(self) -> object:
+        self.write(stringify(self.expr.evaluate()))
+
+
+class VarNode(Node):
+    __slots__ = ("values", "slot", "initializer")
+
+    def __init__(self, env: Environment, slot: int, initializer: Node):
+        self.values = env.values
+        self.slot = slot
+        self.initializer = initializer
+
+    def evaluate(self) -> object:
+        self.values[self.slot] = self.initializer.evaluate()
+
+
+class BlockNode(Node):
+    """Statements run in order; the result of expression statements is dropped"""
+
+    __slots__ = ("statements",)
+
+    def __init__(self, statements: List[Node]):
+        self.statements = tuple(statements)
+
+    def evaluate(self) -> object:
+        for stmt in self.statements:
+            stmt.evaluate()
+        return None
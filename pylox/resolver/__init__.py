@@ -0,0 +1 @@
+from .resolver import Resolver, nesting_depth
@@ -0,0 +1,108 @@
+from typing import List
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter.environment import Environment
+
+
+class Resolver(ex.Visitor, st.Visitor):
+    """Static pass between parsing and evaluation
+
+    Gives every variable declaration, reference and assignment the index of
+    the `Environment` slot it lives in, and reports references to variables
+    that cannot have been declared yet. Lox code is straight-line for now,
+    so a name is declared at some point iff a `var` for it came earlier in
+    this program, or in one previously run against the same environment.
+
+    Expressions are walked with an explicit stack, like the Pratt parser
+    builds them, so any expression the parser accepts resolves however
+    deeply it nests.
+    """
+
+    def __init__(self, env: Environment, reporter: ErrorReporter):
+        self.env = env
+        self.reporter = reporter
+
+    def resolve(self, statements: List[st.Stmt]):
+        for stmt in statements:
+            stmt.accept(self)
+
+    def resolve_expr(self, expr: ex.Expr):
+        # Each node is visited after its operands, left to right, so errors
+        # are reported in source order
+        stack = [(expr, False)]
+        while stack:
+            node, operands_resolved = stack.pop()
+            operands = () if operands_resolved else _operands(node)
+            if not operands:
+                node.accept(self)
+                continue
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(operands))
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt):
+        self.resolve_expr(stmt.expr)
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt):
+        self.resolve_expr(stmt.expr)
+
+    def visit_var_stmt(self, stmt: st.VarStmt):
+        if stmt.initializer is not None:
+            self.resolve_expr(stmt.initializer)
+
+        stmt.slot = self.env.slot(stmt.name.lexeme)
+
+    # Expressions, visited by `resolve_expr` once their operands are
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr):
+        pass
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr):
+        pass
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr):
+        pass
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr):
+        pass
+
+    def visit_variable_expr(self, expr: ex.VariableExpr):
+        if expr.name.lexeme not in self.env.slots:
+            self.reporter.error_token(expr.name, str(Environment.undefined(expr.name)))
+            return
+
+        expr.slot = self.env.slots[expr.name.lexeme]
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr):
+        if expr.name.lexeme not in self.env.slots:
+            self.reporter.error_token(
+                expr.name, str(Environment.unassignable(expr.name))
+            )
+            return
+
+        expr.slot = self.env.slots[expr.name.lexeme]
+
+
+def _operands(expr: ex.Expr) -> tuple:
+    if isinstance(expr, ex.BinaryExpr):
+        return (expr.left, expr.right)
+    if isinstance(expr, ex.GroupingExpr):
+        return (expr.expr,)
+    if isinstance(expr, ex.UnaryExpr):
+        return (expr.right,)
+    if isinstance(expr, ex.AssignmentExpr):
+        return (expr.value,)
+    return ()
+
+
+def nesting_depth(expr: ex.Expr) -> int:
+    """How many expressions deep `expr` nests, itself included"""
+    depth = 0
+    stack = [(expr, 1)]
+    while stack:
+        node, level = stack.pop()
+        depth = max(depth, level)
+        stack.extend((operand, level + 1) for operand in _operands(node))
+    return depth
@@ -0,0 +1,2 @@
+from .jobs import Job, JobResult, WorkerOptions, run_job
+from .runner import BatchRunner, BatchReport
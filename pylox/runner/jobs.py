@@ -0,0 +1,123 @@
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from pylox.token import Token, TokenType
+from pylox.intepreter import Intepreter, Budget
+from pylox.optimizer import OptimizerOptions
+from pylox.cache import ProgramCache
+
+# Job statuses
+OK = "ok"
+# Lexing, parsing or resolving reported errors; nothing ran
+COMPILE_ERROR = "compile_error"
+# A Lox runtime error stopped the program
+RUNTIME_ERROR = "runtime_error"
+# The engine raised something other than a Lox error
+CRASHED = "crashed"
+# The job itself could not be read
+INVALID = "invalid"
+
+# Types a variable can be given from JSON; integers become Lox numbers
+VARIABLE_TYPES = (bool, int, float, str, type(None))
+
+
+@dataclass
+class Job:
+    """A program to run on its own, with the globals it starts with"""
+
+    source: str
+    variables: Dict[str, object] = field(default_factory=dict)
+    # Copied to the result as is
+    id: object = None
+
+    @classmethod
+    def from_json(cls, line: str) -> "Job":
+        """Read a job from its JSON object, raising ValueError if malformed"""
+        data = json.loads(line)
+        if not isinstance(data, dict) or not isinstance(data.get("source"), str):
+            raise ValueError("A job must be an object with a string `source`")
+
+        variables = data.get("variables") or {}
+        if not isinstance(variables, dict):
+            raise ValueError("`variables` must be an object")
+        for name, value in variables.items():
+            if not isinstance(value, VARIABLE_TYPES):
+                raise ValueError("Variable {} is not a number, bool, string or null".format(name))
+
+        return cls(data["source"], variables, data.get("id"))
+
+
+@dataclass
+class JobResult:
+    id: object
+    status: str
+    # Everything the program printed, error reports included
+    output: str
+    # What went wrong, for the statuses that have no report in `output`
+    error: Optional[str] = None
+    # Time spent in the worker
+    seconds: float = 0.0
+
+    def to_json(self) -> str:
+        data = {"id": self.id, "status": self.status, "output": self.output}
+        if self.error is not None:
+            data["error"] = self.error
+        data["seconds"] = self.seconds
+        return json.dumps(data)
+
+
+@dataclass
+class WorkerOptions:
+    """How every worker sets up its interpreters"""
+
+    engine: str = "tree"
+    optimizer: Optional[OptimizerOptions] = None
+    # Directory of a `ProgramCache` shared by all workers
+    cache_directory: Optional[str] = None
+    # Limits on each job, so no script can hold a worker forever
+    budget: Optional[Budget] = None
+
+
+# Set once per worker process by `init_worker`
+_options = WorkerOptions()
+_cache: Optional[ProgramCache] = None
+
+
+def init_worker(options: WorkerOptions):
+    """Configure this process and run a program once, so jobs start warm"""
+    global _options, _cache  # pylint: disable=W0603
+    _options = options
+    _cache = ProgramCache(options.cache_directory) if options.cache_directory else None
+    run_job(Job("var warm = 1 + 2; print warm;"))
+
+
+def run_job(job: Job) -> JobResult:
+    """Run `job` in a fresh environment, capturing what it prints"""
+    start = time.perf_counter()
+    intepreter = Intepreter(
+        _options.engine, optimizer=_options.optimizer, cache=_cache, budget=_options.budget
+    )
+    for name, value in job.variables.items():
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        intepreter.env.define(Token(TokenType.IDENT, name, None, 0), value)
+
+    out = io.StringIO()
+    status, error = OK, None
+    try:
+        with redirect_stdout(out):
+            program = intepreter.compile(job.source)
+            if program is None:
+                status = COMPILE_ERROR
+            else:
+                intepreter.run(program)
+                if intepreter.error_reporter.had_error:
+                    status = RUNTIME_ERROR
+    except Exception as e:  # pylint: disable=W0703
+        # One bad program must not take the worker down with it
+        status, error = CRASHED, "{}: {}".format(type(e).__name__, e)
+
+    return JobResult(job.id, status, out.getvalue(), error, time.perf_counter() - start)
@@ -0,0 +1,144 @@
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
+from pylox.runner.jobs import INVALID, Job, JobResult, WorkerOptions, init_worker, run_job
+
+DEFAULT_CHUNK_SIZE = 16
+# Chunks submitted per worker before waiting for the oldest one
+DEFAULT_IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass
+class BatchReport:
+    jobs: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    # Wall-clock time of the whole batch
+    seconds: float = 0.0
+    # Time each job spent in its worker, in submission order
+    latencies: List[float] = field(default_factory=list)
+
+    def add(self, result: JobResult):
+        self.jobs += 1
+        self.statuses[result.status] += 1
+        self.latencies.append(result.seconds)
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the job latencies, `q` in [0, 100]"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * q // 100))
+        return ordered[min(int(rank), len(ordered)) - 1]
+
+    def format(self) -> str:
+        statuses = ", ".join(
+            "{} {}".format(count, status) for status, count in sorted(self.statuses.items())
+        )
+        return "{} jobs in {:.3f}s ({:.1f} jobs/s); latency p50 {:.3f}ms, p99 {:.3f}ms; {}".format(
+            self.jobs,
+            self.seconds,
+            self.jobs_per_second,
+            1000 * self.percentile(50),
+            1000 * self.percentile(99),
+            statuses or "no jobs",
+        )
+
+
+def _read_job(line_number: int, job: Union[str, Job]) -> Union[Job, JobResult]:
+    if isinstance(job, Job):
+        return job
+    try:
+        return Job.from_json(job)
+    except ValueError as e:
+        return JobResult(None, INVALID, "", "Line {}: {}".format(line_number, e))
+
+
+def _run_chunk(chunk: List[tuple]) -> List[JobResult]:
+    # Jobs are decoded here rather than in the parent, which only does I/O
+    results = []
+    for line_number, job in chunk:
+        job = _read_job(line_number, job)
+        results.append(job if isinstance(job, JobResult) else run_job(job))
+    return results
+
+
+class BatchRunner:
+    """Runs independent Lox jobs on a pool of worker processes
+
+    Jobs are JSON lines (see `Job.from_json`) or `Job` objects. They are
+    sent to the workers in chunks, and the results come back in
+    submission order. At most `max_in_flight` chunks are pending at a
+    time: the runner waits for the oldest one before reading more jobs,
+    so memory stays bounded however long the input is, at the cost of
+    waiting on a slow job while later ones are already done.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        options: Optional[WorkerOptions] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_in_flight: Optional[int] = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.options = options or WorkerOptions()
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or DEFAULT_IN_FLIGHT_PER_WORKER * self.workers
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+
+    def run(
+        self, jobs: Iterable[Union[str, Job]], report: Optional[BatchReport] = None
+    ) -> Iterator[JobResult]:
+        """Yield the result of every job, in order, adding them to `report`"""
+        start = time.perf_counter()
+        pending: deque = deque()
+        with ProcessPoolExecutor(
+            self.workers, initializer=init_worker, initargs=(self.options,)
+        ) as pool:
+            for chunk in self._chunks(jobs):
+                if len(pending) >= self.max_in_flight:
+                    yield from self._collect(pending.popleft().result(), report)
+                pending.append(pool.submit(_run_chunk, chunk))
+
+            while pending:
+                yield from self._collect(pending.popleft().result(), report)
+
+        if report is not None:
+            report.seconds += time.perf_counter() - start
+
+    def run_file(self, jobs: TextIO, results: TextIO) -> BatchReport:
+        """Run the JSON lines of `jobs`, writing one JSON line per result"""
+        report = BatchReport()
+        for result in self.run(jobs, report):
+            results.write(result.to_json())
+            results.write("\n")
+        return report
+
+    def _chunks(self, jobs: Iterable[Union[str, Job]]) -> Iterator[List[tuple]]:
+        chunk = []
+        for line_number, job in enumerate(jobs, 1):
+            if isinstance(job, str) and not job.strip():
+                continue
+            chunk.append((line_number, job))
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _collect(self, results: List[JobResult], report: Optional[BatchReport]):
+        for result in results:
+            if report is not None:
+                report.add(result)
+            yield result
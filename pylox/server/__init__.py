@@ -0,0 +1,4 @@
+# `LoxServer` lives in `pylox.server.server`: importing it loads the whole
+# intepreter, which the client must not pay for
+from .protocol import ProtocolError, default_socket_path
+from .client import run_remote, run_remote_file
@@ -0,0 +1,77 @@
+import socket
+import struct
+import sys
+from typing import Optional, TextIO
+from pylox.sysexits import EX_NOINPUT, EX_PROTOCOL, EX_UNAVAILABLE
+from pylox.server.protocol import (
+    ERROR,
+    EXIT,
+    OUTPUT,
+    RUN,
+    STATUS,
+    ProtocolError,
+    decode,
+    default_socket_path,
+    encode,
+    recv_frame,
+    send_frame,
+)
+
+
+def run_remote(
+    source: str,
+    socket_path: Optional[str] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> int:
+    """Run `source` on the server at `socket_path`, as if it ran here
+
+    What the script prints is written to `stdout` as it arrives, and the
+    exit status of the script is returned.
+    """
+    socket_path = socket_path or default_socket_path()
+    stdout = stdout if stdout is not None else sys.stdout
+    stderr = stderr if stderr is not None else sys.stderr
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError as e:
+        sock.close()
+        print("pylox: cannot reach the server at {}: {}".format(socket_path, e), file=stderr)
+        return EX_UNAVAILABLE
+
+    with sock:
+        try:
+            send_frame(sock, RUN, encode(source))
+            while True:
+                frame = recv_frame(sock)
+                if frame is None:
+                    raise ProtocolError("Connection closed before the exit status")
+                kind, payload = frame
+                if kind == OUTPUT:
+                    stdout.write(decode(payload))
+                elif kind == ERROR:
+                    stderr.write(decode(payload))
+                elif kind == EXIT:
+                    stdout.flush()
+                    return STATUS.unpack(payload)[0]
+                else:
+                    raise ProtocolError("Unexpected frame kind {}".format(kind))
+        except (OSError, ProtocolError, struct.error) as e:
+            stdout.flush()
+            print("pylox: lost the server at {}: {}".format(socket_path, e), file=stderr)
+            return EX_PROTOCOL
+
+
+def run_remote_file(path: str, socket_path: Optional[str] = None) -> int:
+    """Run the script at `path`, or on stdin for -, with `run_remote`"""
+    if path == "-":
+        return run_remote(sys.stdin.read(), socket_path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print("pylox: cannot read {}: {}".format(path, e), file=sys.stderr)
+        return EX_NOINPUT
+    return run_remote(source, socket_path)
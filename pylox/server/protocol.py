@@ -0,0 +1,92 @@
+import os
+import socket
+import struct
+import tempfile
+from typing import Optional, Tuple
+
+"""
+Frames exchanged over the socket of `pylox serve`
+
+Every message is a frame: its kind in one byte, the length of its payload
+in four (big-endian), then the payload. A client sends a single RUN frame
+holding the source of a script, and reads frames until EXIT. OUTPUT frames
+carry what the script printed, errors included, as they are written out;
+ERROR frames carry what the server itself has to say, for stderr. EXIT
+ends the exchange with the exit status, and the server closes the
+connection.
+
+This module and the client only import the standard library and
+`pylox.sysexits`, so the client does not pay for importing the intepreter.
+"""
+
+# Client to server: the script to run, UTF-8
+RUN = 1
+# Server to client: printed text, UTF-8
+OUTPUT = 2
+# Server to client: a message for stderr, UTF-8
+ERROR = 3
+# Server to client: the exit status, one signed byte
+EXIT = 4
+
+KINDS = (RUN, OUTPUT, ERROR, EXIT)
+
+HEADER = struct.Struct(">BI")
+STATUS = struct.Struct(">b")
+
+# Larger frames are rejected before anything is read into memory
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def default_socket_path() -> str:
+    """Where the server listens unless told otherwise, one socket per user"""
+    return os.path.join(tempfile.gettempdir(), "pylox-{}.sock".format(os.getuid()))
+
+
+def encode(text: str) -> bytes:
+    return text.encode("utf-8", "surrogatepass")
+
+
+def decode(payload: bytes) -> str:
+    return payload.decode("utf-8", "surrogatepass")
+
+
+def send_frame(sock: socket.socket, kind: int, payload: bytes = b""):
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError("Frame of {} bytes is too large".format(len(payload)))
+    sock.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Tuple[int, bytes]]:
+    """The next frame; None if the peer closed the connection between frames"""
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    kind, length = HEADER.unpack(header)
+    if kind not in KINDS:
+        raise ProtocolError("Unknown frame kind {}".format(kind))
+    if length > MAX_PAYLOAD:
+        raise ProtocolError("Frame of {} bytes is too large".format(length))
+
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        raise ProtocolError("Connection closed inside a frame")
+    return kind, payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """`size` bytes, or None if the connection was closed before the first"""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ProtocolError("Connection closed inside a frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
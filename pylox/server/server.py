@@ -0,0 +1,160 @@
+import errno
+import os
+import socket
+import socketserver
+from contextlib import redirect_stdout
+from typing import Optional
+from pylox.cache import ProgramCache, SourceCache
+from pylox.intepreter import Intepreter, BufferedSink, NullSink
+from pylox.runner import WorkerOptions
+from pylox.sysexits import EX_DATAERR, EX_OK, EX_SOFTWARE, EX_USAGE
+from pylox.server.protocol import (
+    ERROR,
+    EXIT,
+    OUTPUT,
+    RUN,
+    STATUS,
+    ProtocolError,
+    decode,
+    default_socket_path,
+    encode,
+    recv_frame,
+    send_frame,
+)
+
+
+# Seconds a client may leave the server waiting on it, for its script or
+# while output is written back, before it is dropped
+CLIENT_TIMEOUT = 10.0
+
+
+class _FrameStream:
+    """A text stream writing OUTPUT frames, for the script's sink and errors"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+
+    def write(self, text: str) -> int:
+        if text:
+            send_frame(self.sock, OUTPUT, encode(text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.serve_client(self.request)
+
+
+class LoxServer(socketserver.UnixStreamServer):
+    """Runs Lox scripts sent over a Unix domain socket, one at a time
+
+    The intepreter, its engine, its parse caches and every module they need
+    are set up once, then each script runs in a fork of that intepreter: a
+    fresh `Environment` holding only the variables of `prelude`, if given.
+    What a script prints, error reports included, is streamed back to the
+    client as it is written out. Scripts run one after the other, as the
+    engines are bound by the interpreter lock anyway; clients wait their
+    turn in the listen backlog. So that one client that goes quiet does
+    not hold up the others, it is dropped after `client_timeout` seconds
+    of waiting on it.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        options: Optional[WorkerOptions] = None,
+        prelude: Optional[str] = None,
+        client_timeout: Optional[float] = CLIENT_TIMEOUT,
+    ):
+        self.socket_path = socket_path or default_socket_path()
+        self.client_timeout = client_timeout
+        options = options or WorkerOptions()
+        self.intepreter = Intepreter(
+            options.engine,
+            optimizer=options.optimizer,
+            cache=ProgramCache(options.cache_directory) if options.cache_directory else None,
+            source_cache=SourceCache(),
+            budget=options.budget,
+            output=NullSink(),
+        )
+        if prelude is not None:
+            program = self.intepreter.compile(prelude)
+            if program is None:
+                raise ValueError("The prelude has errors")
+            self.intepreter.run(program)
+            if self.intepreter.error_reporter.had_error:
+                raise ValueError("The prelude stopped on a runtime error")
+        # The first run of each engine is the slowest; pay for it here
+        self.intepreter.fork().intepret("var warm = 1 + 2; print warm;")
+
+        _remove_stale_socket(self.socket_path)
+        super().__init__(self.socket_path, _Handler)
+
+    def serve_client(self, sock: socket.socket):
+        sock.settimeout(self.client_timeout)
+        try:
+            frame = recv_frame(sock)
+            if frame is None:
+                return
+            kind, payload = frame
+            if kind != RUN:
+                send_frame(sock, ERROR, encode("pylox: expected a script to run\n"))
+                send_frame(sock, EXIT, STATUS.pack(EX_USAGE))
+                return
+            send_frame(sock, EXIT, STATUS.pack(self.run_script(sock, payload)))
+        except (OSError, ProtocolError):
+            # The client went away, timed out or is not one; nobody is left
+            # to tell
+            pass
+
+    def run_script(self, sock: socket.socket, payload: bytes) -> int:
+        """Run the script in `payload`, streaming its output; returns its exit status"""
+        try:
+            source = decode(payload)
+        except UnicodeDecodeError as e:
+            send_frame(sock, ERROR, encode("pylox: the script is not UTF-8: {}\n".format(e)))
+            return EX_DATAERR
+
+        stream = _FrameStream(sock)
+        intepreter = self.intepreter.fork(BufferedSink(stream))
+        try:
+            # Error reports are printed, so they are caught here
+            with redirect_stdout(stream):
+                program = intepreter.compile(source)
+                if program is None:
+                    return EX_DATAERR
+                intepreter.run(program)
+        except OSError:
+            raise
+        except Exception as e:  # pylint: disable=W0703
+            # One bad script must not take the server down with it
+            message = "pylox: internal error: {}: {}\n".format(type(e).__name__, e)
+            send_frame(sock, ERROR, encode(message))
+            return EX_SOFTWARE
+
+        return EX_SOFTWARE if intepreter.error_reporter.had_error else EX_OK
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: str):
+    """Remove the socket file of a server that is gone; fail if one is still there"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "A server is already listening at {}".format(path))
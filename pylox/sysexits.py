@@ -0,0 +1,10 @@
+# Exit statuses of the command line, as in `sysexits.h`
+EX_OK = 0
+EX_USAGE = 64
+# The script has lexing, parsing or resolving errors
+EX_DATAERR = 65
+EX_NOINPUT = 66
+EX_UNAVAILABLE = 69
+# The script stopped on a runtime error
+EX_SOFTWARE = 70
+EX_PROTOCOL = 76
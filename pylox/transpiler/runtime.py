@@ -0,0 +1,20 @@
+"""Names the generated Python code relies on at runtime"""
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.utils import stringify, is_truthy
+
+_UNDEFINED = object()
+_error = IntepreterRuntimeError
+_stringify = stringify
+_truthy = is_truthy
+
+
+def _main(run) -> int:
+    """Entry point of a transpiled module executed as a script"""
+    reporter = ErrorReporter()
+    try:
+        run(Environment())
+    except IntepreterRuntimeError as e:
+        reporter.error_token(e.token, f"Runtime error: {str(e)}")
+    return 70 if reporter.had_error else 0
@@ -0,0 +1,332 @@
+from dataclasses import dataclass
+from types import CodeType
+from typing import Dict, List
+from pylox.token import Token, TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+
+# Static types tracked by the transpiler. Lox programs have no control flow
+# yet, so the type of anything derived from literals and declarations in the
+# same program is exact; only values read from the environment are `ANY`.
+ANY = "any"
+FLOAT = "float"
+STR = "str"
+BOOL = "bool"
+NIL = "nil"
+
+# Value kinds: constants and temporaries can be evaluated any number of
+# times, in any order. Variables and inline expressions cannot.
+CONSTANT = "constant"
+TEMP = "temp"
+VARIABLE = "variable"
+INLINE = "inline"
+
+VAR_PREFIX = "v_"
+
+# Nested operations are emitted as one Python expression up to this depth
+MAX_INLINE_DEPTH = 32
+
+ADD_MESSAGE = "Operands should be two numbers or two strings"
+NUMBERS_MESSAGE = "Operands must be numbers"
+
+NUMERIC_OPERATORS = {
+    TokenType.MINUS: ("-", FLOAT),
+    TokenType.STAR: ("*", FLOAT),
+    TokenType.SLASH: ("/", FLOAT),
+    TokenType.GREATER: (">", BOOL),
+    TokenType.GREATER_EQ: (">=", BOOL),
+    TokenType.LESS: ("<", BOOL),
+    TokenType.LESS_EQ: ("<=", BOOL),
+}
+
+EQUALITY_OPERATORS = {
+    TokenType.EQ_EQ: "==",
+    TokenType.BANG_EQ: "!=",
+}
+
+
+@dataclass
+class Value:
+    """A Python expression computing a Lox value"""
+
+    code: str
+    type: str
+    kind: str
+    depth: int = 0
+
+    @property
+    def stable(self) -> bool:
+        return self.kind in (CONSTANT, TEMP)
+
+
+def literal_type(value: object) -> str:
+    if value is None:
+        return NIL
+    if isinstance(value, bool):
+        return BOOL
+    if isinstance(value, float):
+        return FLOAT
+    if isinstance(value, str):
+        return STR
+    return ANY
+
+
+class Transpiler(ex.Visitor, st.Visitor):
+    """Translates a Lox program into the source of a Python module
+
+    The module defines `run(env)`, which executes the program against an
+    `Environment`. Lox variables become Python locals for the duration of the
+    run and are written back to the environment when it ends, even on error.
+    Type checks are emitted only where operand types are not known statically,
+    and raise the same errors, at the same tokens, as `ExprEvaluator`.
+    """
+
+    def __init__(self):
+        self.tokens: List[Token] = []
+        self.variables: Dict[str, str] = {}
+        self.names: Dict[str, int] = {}
+
+        self.body: List[str] = []
+        self.lines: List[str] = []
+        self.temps = 0
+
+    def transpile(self, statements: List[st.Stmt]) -> str:
+        for stmt in statements:
+            self._statement(stmt)
+        return self._module("None")
+
+    def transpile_expr(self, expr: ex.Expr) -> str:
+        self.lines = []
+        self.temps = 0
+        value = expr.accept(self)
+        self.body.extend(self.lines)
+        return self._module(value.code)
+
+    def compile_code(self, statements: List[st.Stmt], filename="<lox>") -> CodeType:
+        return compile(self.transpile(statements), filename, "exec")
+
+    def compile_expr_code(self, expr: ex.Expr, filename="<lox>") -> CodeType:
+        return compile(self.transpile_expr(expr), filename, "exec")
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt):
+        value = stmt.expr.accept(self)
+        self.lines.append(f"_print(_stringify({value.code}))")
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt):
+        value = stmt.expr.accept(self)
+        if value.kind == INLINE:
+            self.lines.append(value.code)
+
+    def visit_var_stmt(self, stmt: st.VarStmt):
+        if stmt.initializer is None:
+            value = Value("None", NIL, CONSTANT)
+        else:
+            value = stmt.initializer.accept(self)
+
+        self.lines.append(f"{self._local(stmt.name)} = {value.code}")
+        self.variables[stmt.name.lexeme] = value.type
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr) -> Value:
+        return Value(repr(expr.value), literal_type(expr.value), CONSTANT)
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr) -> Value:
+        return expr.expr.accept(self)
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr) -> Value:
+        right = expr.right.accept(self)
+
+        match expr.operator.token_type:
+            case TokenType.MINUS:
+                if right.type == FLOAT:
+                    return self._inline(f"(-{right.code})", FLOAT, right)
+                return self._inline(f"(-float({right.code}))", FLOAT, right)
+            case TokenType.BANG:
+                if right.type == BOOL:
+                    return self._inline(f"(not {right.code})", BOOL, right)
+                return self._inline(f"(not _truthy({right.code}))", BOOL, right)
+
+        raise ValueError("Unknown unary operator {}".format(expr.operator.lexeme))
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr) -> Value:
+        left = expr.left.accept(self)
+        mark = len(self.lines)
+        right = expr.right.accept(self)
+
+        # If evaluating the right operand takes statements of its own, the
+        # left operand has to be computed before them
+        if len(self.lines) > mark and not left.stable:
+            left = self._materialize(left, mark)
+
+        token_type = expr.operator.token_type
+        if token_type in EQUALITY_OPERATORS:
+            op = EQUALITY_OPERATORS[token_type]
+            return self._inline(f"({left.code} {op} {right.code})", BOOL, left, right)
+
+        if token_type == TokenType.PLUS:
+            return self._add(expr.operator, left, right)
+
+        op, result_type = NUMERIC_OPERATORS[token_type]
+        if not self._check_numbers(expr.operator, left, right):
+            return Value("None", ANY, CONSTANT)
+
+        return self._inline(f"({left.code} {op} {right.code})", result_type, left, right)
+
+    def visit_variable_expr(self, expr: ex.VariableExpr) -> Value:
+        local = self._local(expr.name)
+        if expr.name.lexeme not in self.variables:
+            self.lines.append(f"{local} = _get(_k[{self._token(expr.name)}])")
+            self.variables[expr.name.lexeme] = ANY
+
+        return Value(local, self.variables[expr.name.lexeme], VARIABLE)
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr) -> Value:
+        value = expr.value.accept(self)
+        local = self._local(expr.name)
+
+        if expr.name.lexeme not in self.variables:
+            value = self._materialize(value)
+            self.lines.append(f"_assign(_k[{self._token(expr.name)}], {value.code})")
+
+        self.lines.append(f"{local} = {value.code}")
+        self.variables[expr.name.lexeme] = value.type
+        return Value(local, value.type, VARIABLE)
+
+    # Helpers
+
+    def _add(self, operator: Token, left: Value, right: Value) -> Value:
+        types = {left.type, right.type}
+        if types in ({FLOAT}, {STR}):
+            return self._inline(f"({left.code} + {right.code})", left.type, left, right)
+
+        if not types <= {FLOAT, STR, ANY} or types == {FLOAT, STR}:
+            self._raise(operator, ADD_MESSAGE, left, right)
+            return Value("None", ANY, CONSTANT)
+
+        left, right = self._materialize(left), self._materialize(right)
+        if types == {ANY}:
+            result_type = ANY
+            self.lines.append(
+                f"if not ((type({left.code}) is float and type({right.code}) is float)"
+                f" or (type({left.code}) is str and type({right.code}) is str)):"
+            )
+        else:
+            # The static type names double as the Python type names
+            (result_type,) = types - {ANY}
+            unknown = left if left.type == ANY else right
+            self.lines.append(f"if type({unknown.code}) is not {result_type}:")
+
+        self.lines.append(f"    raise _error(_k[{self._token(operator)}], {ADD_MESSAGE!r})")
+        return self._inline(f"({left.code} + {right.code})", result_type, left, right)
+
+    def _check_numbers(self, operator: Token, left: Value, right: Value) -> bool:
+        """Emit the checks for a numeric operator; False if it always fails"""
+        if left.type == FLOAT and right.type == FLOAT:
+            return True
+
+        if not {left.type, right.type} <= {FLOAT, ANY}:
+            self._raise(operator, NUMBERS_MESSAGE, left, right)
+            return False
+
+        left, right = self._materialize(left), self._materialize(right)
+        conditions = " or ".join(
+            f"type({value.code}) is not float"
+            for value in (left, right)
+            if value.type == ANY
+        )
+        self.lines.append(f"if {conditions}:")
+        self.lines.append(
+            f"    raise _error(_k[{self._token(operator)}], {NUMBERS_MESSAGE!r})"
+        )
+        return True
+
+    def _raise(self, operator: Token, message: str, *operands: Value):
+        # Operands are still evaluated for their side effects and errors
+        for value in operands:
+            self._materialize(value)
+        self.lines.append(f"raise _error(_k[{self._token(operator)}], {message!r})")
+
+    def _inline(self, code: str, result_type: str, *operands: Value) -> Value:
+        depth = 1 + max(value.depth for value in operands)
+        value = Value(code, result_type, INLINE, depth)
+        if depth > MAX_INLINE_DEPTH:
+            return self._materialize(value)
+        return value
+
+    def _materialize(self, value: Value, position: int = None) -> Value:
+        """Store a value into a fresh temporary"""
+        if value.stable:
+            return value
+
+        temp = f"t{self.temps}"
+        self.temps += 1
+        line = f"{temp} = {value.code}"
+        if position is None:
+            self.lines.append(line)
+        else:
+            self.lines.insert(position, line)
+        return Value(temp, value.type, TEMP)
+
+    def _statement(self, stmt: st.Stmt):
+        self.lines = []
+        self.temps = 0
+        stmt.accept(self)
+        self.body.extend(self.lines)
+
+    def _local(self, name: Token) -> str:
+        if name.lexeme not in self.names:
+            self.names[name.lexeme] = self._token(name)
+        return VAR_PREFIX + name.lexeme
+
+    def _token(self, token: Token) -> int:
+        self.tokens.append(token)
+        return len(self.tokens) - 1
+
+    def _module(self, result: str) -> str:
+        lines = [
+            "# Generated by pylox",
+            "from pylox.token import Token, TokenType",
+            "from pylox.transpiler.runtime import _UNDEFINED, _error, _stringify, _truthy, _main",
+            "",
+            "_k = (",
+        ]
+        for token in self.tokens:
+            lines.append(
+                "    Token(TokenType.{}, {!r}, {!r}, {}),".format(
+                    token.token_type.name, token.lexeme, token.literal, token.line
+                )
+            )
+        lines += [
+            ")",
+            "",
+            "",
+            "def run(env, _print=print):",
+            "    _get = env.get",
+            "    _assign = env.assign",
+            "    _define = env.define",
+        ]
+
+        body = self.body + [f"return {result}"]
+        if not self.names:
+            lines += ["    " + line for line in body]
+        else:
+            local_names = [VAR_PREFIX + name for name in self.names]
+            lines.append("    {} = _UNDEFINED".format(" = ".join(local_names)))
+            lines.append("    try:")
+            lines += ["        " + line for line in body]
+            lines.append("    finally:")
+            for name, index in self.names.items():
+                lines.append(f"        if {VAR_PREFIX}{name} is not _UNDEFINED:")
+                lines.append(f"            _define(_k[{index}], {VAR_PREFIX}{name})")
+
+        lines += [
+            "",
+            "",
+            'if __name__ == "__main__":',
+            "    raise SystemExit(_main(run))",
+            "",
+        ]
+        return "\n".join(lines)
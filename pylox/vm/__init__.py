@@ -0,0 +1,3 @@
+from .chunk import Chunk, disassemble
+from .compiler import BytecodeCompiler
+from .vm import VM
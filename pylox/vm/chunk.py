@@ -0,0 +1,63 @@
+from array import array
+from typing import Dict, List, Tuple
+from pylox.token import Token
+from pylox.vm.opcodes import OpCode, OPERAND_COUNT
+
+
+class Chunk:
+    """A compiled unit of bytecode
+
+    `code` is a flat array of unsigned ints: an opcode followed by its
+    operands, if any. Literal values live in `constants`, and the
+    tokens needed at runtime (variable names and operators used in error
+    messages) live in `tokens`.
+    """
+
+    def __init__(self):
+        self.code = array("I")
+        self.constants: List[object] = []
+        self.tokens: List[Token] = []
+
+        self._constant_index: Dict[Tuple[type, object], int] = {}
+
+    def emit(self, op: OpCode, *operands: int):
+        self.code.append(op)
+        self.code.extend(operands)
+
+    def add_constant(self, value: object) -> int:
+        # Key on the type as well so that e.g. 1.0 and True do not collide
+        key = (type(value), value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_index[key] = index
+        return index
+
+    def add_token(self, token: Token) -> int:
+        self.tokens.append(token)
+        return len(self.tokens) - 1
+
+
+def disassemble(chunk: Chunk) -> str:
+    lines = []
+    ip = 0
+    while ip < len(chunk.code):
+        op = OpCode(chunk.code[ip])
+        count = OPERAND_COUNT.get(op, 0)
+        if count == 0:
+            lines.append("{:04d} {}".format(ip, op.name))
+            ip += 1
+            continue
+
+        operand = chunk.code[ip + 1]
+        if op == OpCode.CONSTANT:
+            detail = " ({!r})".format(chunk.constants[operand])
+        elif op == OpCode.DEFINE_GLOBAL:
+            detail = ""
+        else:
+            detail = " ({})".format(chunk.tokens[chunk.code[ip + count]].lexeme)
+        lines.append("{:04d} {:<14} {}{}".format(ip, op.name, operand, detail))
+        ip += 1 + count
+
+    return "\n".join(lines)
@@ -0,0 +1,105 @@
+from typing import List
+from pylox.token import TokenType
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.vm.chunk import Chunk
+from pylox.vm.opcodes import OpCode
+
+BINARY_OPCODES = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQ: OpCode.GREATER_EQ,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQ: OpCode.LESS_EQ,
+}
+
+EQUALITY_OPCODES = {
+    TokenType.EQ_EQ: OpCode.EQUAL,
+    TokenType.BANG_EQ: OpCode.NOT_EQUAL,
+}
+
+UNARY_OPCODES = {
+    TokenType.MINUS: OpCode.NEGATE,
+    TokenType.BANG: OpCode.NOT,
+}
+
+
+class BytecodeCompiler(ex.Visitor, st.Visitor):
+    """Compiles AST nodes into a `Chunk` for the `VM`"""
+
+    def __init__(self):
+        self.chunk = Chunk()
+
+    def compile(self, statements: List[st.Stmt]) -> Chunk:
+        for stmt in statements:
+            stmt.accept(self)
+        self.chunk.emit(OpCode.NIL)
+        self.chunk.emit(OpCode.RETURN)
+        return self.chunk
+
+    def compile_expr(self, expr: ex.Expr) -> Chunk:
+        expr.accept(self)
+        self.chunk.emit(OpCode.RETURN)
+        return self.chunk
+
+    # Statements
+
+    def visit_print_stmt(self, stmt: st.PrintStmt):
+        stmt.expr.accept(self)
+        self.chunk.emit(OpCode.PRINT)
+
+    def visit_expression_stmt(self, stmt: st.ExpressionStmt):
+        stmt.expr.accept(self)
+        self.chunk.emit(OpCode.POP)
+
+    def visit_var_stmt(self, stmt: st.VarStmt):
+        if stmt.initializer is None:
+            self.chunk.emit(OpCode.NIL)
+        else:
+            stmt.initializer.accept(self)
+        self.chunk.emit(OpCode.DEFINE_GLOBAL, stmt.slot)
+
+    # Expressions
+
+    def visit_literal_expr(self, expr: ex.LiteralExpr):
+        if expr.value is None:
+            self.chunk.emit(OpCode.NIL)
+        elif expr.value is True:
+            self.chunk.emit(OpCode.TRUE)
+        elif expr.value is False:
+            self.chunk.emit(OpCode.FALSE)
+        else:
+            self.chunk.emit(OpCode.CONSTANT, self.chunk.add_constant(expr.value))
+
+    def visit_grouping_expr(self, expr: ex.GroupingExpr):
+        expr.expr.accept(self)
+
+    def visit_unary_expr(self, expr: ex.UnaryExpr):
+        expr.right.accept(self)
+        self.chunk.emit(UNARY_OPCODES[expr.operator.token_type])
+
+    def visit_binary_expr(self, expr: ex.BinaryExpr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+        token_type = expr.operator.token_type
+        if token_type in EQUALITY_OPCODES:
+            self.chunk.emit(EQUALITY_OPCODES[token_type])
+        else:
+            self.chunk.emit(
+                BINARY_OPCODES[token_type], self.chunk.add_token(expr.operator)
+            )
+
+    def visit_variable_expr(self, expr: ex.VariableExpr):
+        self.chunk.emit(
+            OpCode.GET_GLOBAL, expr.slot, self.chunk.add_token(expr.name)
+        )
+
+    def visit_assignment_expr(self, expr: ex.AssignmentExpr):
+        expr.value.accept(self)
+        self.chunk.emit(
+            OpCode.SET_GLOBAL, expr.slot, self.chunk.add_token(expr.name)
+        )
@@ -0,0 +1,48 @@
+from enum import IntEnum
+
+
+class OpCode(IntEnum):
+    # Operand: index into the constant pool
+    CONSTANT = 0
+    NIL = 1
+    TRUE = 2
+    FALSE = 3
+    POP = 4
+    # Operands: environment slot, then index of the name in the token table
+    GET_GLOBAL = 5
+    SET_GLOBAL = 6
+    # Operand: environment slot
+    DEFINE_GLOBAL = 7
+    # Operand: index into the token table (the operator, for error reporting)
+    ADD = 8
+    SUBTRACT = 9
+    MULTIPLY = 10
+    DIVIDE = 11
+    GREATER = 12
+    GREATER_EQ = 13
+    LESS = 14
+    LESS_EQ = 15
+    # No operand
+    EQUAL = 16
+    NOT_EQUAL = 17
+    NEGATE = 18
+    NOT = 19
+    PRINT = 20
+    RETURN = 21
+
+
+# Number of operand words following each opcode, if any
+OPERAND_COUNT = {
+    OpCode.CONSTANT: 1,
+    OpCode.GET_GLOBAL: 2,
+    OpCode.SET_GLOBAL: 2,
+    OpCode.DEFINE_GLOBAL: 1,
+    OpCode.ADD: 1,
+    OpCode.SUBTRACT: 1,
+    OpCode.MULTIPLY: 1,
+    OpCode.DIVIDE: 1,
+    OpCode.GREATER: 1,
+    OpCode.GREATER_EQ: 1,
+    OpCode.LESS: 1,
+    OpCode.LESS_EQ: 1,
+}
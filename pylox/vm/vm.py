@@ -0,0 +1,151 @@
+from pylox.intepreter.environment import Environment, UNDEFINED
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.intepreter.output import OutputSink
+from pylox.intepreter.rope import STRING_TYPES, concat
+from pylox.intepreter.utils import stringify, is_truthy
+from pylox.vm.chunk import Chunk
+from pylox.vm.opcodes import OpCode
+
+# Bind the opcodes to plain ints so the dispatch loop compares ints, not enums
+CONSTANT = int(OpCode.CONSTANT)
+NIL = int(OpCode.NIL)
+TRUE = int(OpCode.TRUE)
+FALSE = int(OpCode.FALSE)
+POP = int(OpCode.POP)
+GET_GLOBAL = int(OpCode.GET_GLOBAL)
+DEFINE_GLOBAL = int(OpCode.DEFINE_GLOBAL)
+SET_GLOBAL = int(OpCode.SET_GLOBAL)
+ADD = int(OpCode.ADD)
+SUBTRACT = int(OpCode.SUBTRACT)
+MULTIPLY = int(OpCode.MULTIPLY)
+DIVIDE = int(OpCode.DIVIDE)
+GREATER = int(OpCode.GREATER)
+GREATER_EQ = int(OpCode.GREATER_EQ)
+LESS = int(OpCode.LESS)
+LESS_EQ = int(OpCode.LESS_EQ)
+EQUAL = int(OpCode.EQUAL)
+NOT_EQUAL = int(OpCode.NOT_EQUAL)
+NEGATE = int(OpCode.NEGATE)
+NOT = int(OpCode.NOT)
+PRINT = int(OpCode.PRINT)
+RETURN = int(OpCode.RETURN)
+
+ADD_MESSAGE = "Operands should be two numbers or two strings"
+NUMBERS_MESSAGE = "Operands must be numbers"
+
+
+class VM:
+    """A stack machine executing `Chunk`s against an `Environment`
+
+    Runtime semantics (including error messages and the tokens they are
+    reported at) mirror `ExprEvaluator` and `StmtEvaluator`.
+    """
+
+    def __init__(self, env: Environment, output: OutputSink):
+        self.env = env
+        self.output = output
+
+    def run(self, chunk: Chunk) -> object:
+        # pylint: disable=R0912,R0915
+        code = chunk.code
+        constants = chunk.constants
+        tokens = chunk.tokens
+        env = self.env
+        values = env.values
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        write = self.output.write
+        ip = 0
+
+        while True:
+            op = code[ip]
+
+            if op == CONSTANT:
+                push(constants[code[ip + 1]])
+                ip += 2
+            elif op == GET_GLOBAL:
+                value = values[code[ip + 1]]
+                if value is UNDEFINED:
+                    raise env.undefined(tokens[code[ip + 2]])
+                push(value)
+                ip += 3
+            elif op <= MULTIPLY and op >= ADD:
+                right = pop()
+                left = stack[-1]
+                if op == ADD:
+                    if isinstance(left, float) and isinstance(right, float):
+                        stack[-1] = left + right
+                    elif isinstance(left, STRING_TYPES) and isinstance(right, STRING_TYPES):
+                        stack[-1] = concat(left, right)
+                    else:
+                        raise IntepreterRuntimeError(tokens[code[ip + 1]], ADD_MESSAGE)
+                else:
+                    if not (isinstance(left, float) and isinstance(right, float)):
+                        raise IntepreterRuntimeError(
+                            tokens[code[ip + 1]], NUMBERS_MESSAGE
+                        )
+                    if op == SUBTRACT:
+                        stack[-1] = left - right
+                    else:
+                        stack[-1] = left * right
+                ip += 2
+            elif op <= LESS_EQ and op >= DIVIDE:
+                right = pop()
+                left = stack[-1]
+                if not (isinstance(left, float) and isinstance(right, float)):
+                    raise IntepreterRuntimeError(tokens[code[ip + 1]], NUMBERS_MESSAGE)
+                if op == DIVIDE:
+                    stack[-1] = left / right
+                elif op == GREATER:
+                    stack[-1] = left > right
+                elif op == GREATER_EQ:
+                    stack[-1] = left >= right
+                elif op == LESS:
+                    stack[-1] = left < right
+                else:
+                    stack[-1] = left <= right
+                ip += 2
+            elif op == EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] == right
+                ip += 1
+            elif op == NOT_EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] != right
+                ip += 1
+            elif op == SET_GLOBAL:
+                slot = code[ip + 1]
+                if values[slot] is UNDEFINED:
+                    raise env.unassignable(tokens[code[ip + 2]])
+                values[slot] = stack[-1]
+                ip += 3
+            elif op == POP:
+                pop()
+                ip += 1
+            elif op == PRINT:
+                write(stringify(pop()))
+                ip += 1
+            elif op == DEFINE_GLOBAL:
+                values[code[ip + 1]] = pop()
+                ip += 2
+            elif op == NIL:
+                push(None)
+                ip += 1
+            elif op == TRUE:
+                push(True)
+                ip += 1
+            elif op == FALSE:
+                push(False)
+                ip += 1
+            elif op == NEGATE:
+                stack[-1] = -float(stack[-1])
+                ip += 1
+            elif op == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+                ip += 1
+            elif op == RETURN:
+                return pop()
+            else:
+                raise RuntimeError("Unknown opcode {}".format(op))
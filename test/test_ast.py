@@ -0,0 +1,60 @@
+import importlib.util
+import pickle
+import unittest
+from pathlib import Path
+from pylox.ast import expr as ex
+from pylox.ast import stmt as st
+from pylox.intepreter import Intepreter
+from pylox.intepreter.expression import ExprEvaluator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_tool(name: str):
+    spec = importlib.util.spec_from_file_location(name, ROOT / "tools" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestGeneratedAst(unittest.TestCase):
+    def test_generated_up_to_date(self):
+        for tool, module in (("generate_ast_expr", ex), ("generate_ast_stmt", st)):
+            generator = load_tool(tool)
+            source = generator.generate_ast() + "\n\n" + generator.generate_visitors() + "\n"
+            self.assertEqual(source, Path(module.__file__).read_text())
+
+    def test_plain_dataclasses(self):
+        source = load_tool("generate_ast_expr").generate_ast(slots=False)
+        self.assertNotIn("slots=True", source)
+        self.assertIn("kind: ClassVar[int] = 0", source)
+
+    def test_slots(self):
+        intepreter = Intepreter()
+        statements, _ = intepreter.parse(intepreter.lex("var a = -(1 + 2); a = !a;")[0])
+        intepreter.resolve(statements)
+
+        for node in (statements[0], statements[0].initializer, statements[1].expr):
+            self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(statements)), statements)
+        self.assertEqual(pickle.loads(pickle.dumps(statements))[0].slot, 0)
+
+    def test_kinds(self):
+        for module in (ex, st):
+            for kind, cls in enumerate(module.KINDS):
+                self.assertEqual(cls.kind, kind)
+
+    def test_dispatch_table_overrides(self):
+        class Doubling(ExprEvaluator):
+            def visit_literal_expr(self, expr):
+                return expr.value * 2
+
+        intepreter = Intepreter()
+        tokens, _ = intepreter.lex("1 + 2")
+        # pylint: disable=W0212
+        ast, _ = intepreter._parse_expr(tokens)
+        self.assertEqual(Doubling(intepreter.env).evaluate(ast), 6.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
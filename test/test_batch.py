@@ -0,0 +1,119 @@
+import importlib.util
+import unittest
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.intepreter.exc import IntepreterRuntimeError
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def parse_expr(source: str):
+    tokens = Scanner(source + ";", ErrorReporter()).scan_tokens()
+    (statement,) = Parser(tokens, ErrorReporter()).parse()
+    return statement.expr
+
+
+@unittest.skipUnless(HAS_NUMPY, "pylox.batch requires NumPy")
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        # pylint: disable=C0415
+        import numpy as np
+        from pylox.batch import evaluate_batch
+
+        self.np = np
+        self.evaluate = lambda source, **columns: evaluate_batch(parse_expr(source), columns)
+
+    def test_typed_columns(self):
+        np = self.np
+        x = np.arange(5, dtype=np.float64)
+        y = np.array([True, False, True, False, True])
+
+        result = self.evaluate("(x * 2 + 1 > 4) == !y", x=x, y=y)
+        self.assertEqual(result.values.dtype, np.bool_)
+        self.assertEqual(result.values.tolist(), [True, False, False, True, False])
+        self.assertEqual(result.errors, [])
+
+        result = self.evaluate("-x / 2", x=x)
+        self.assertEqual(result.values.tolist(), [-0.0, -0.5, -1.0, -1.5, -2.0])
+
+        result = self.evaluate('s + "!"', s=np.array(["a", "b"]))
+        self.assertEqual(result.values.tolist(), ["a!", "b!"])
+
+    def test_python_sequences(self):
+        # Integers are Lox numbers
+        result = self.evaluate("x + y", x=[1, 2, 3], y=(0.5, 0.5, 0.5))
+        self.assertEqual(result.values.dtype, self.np.float64)
+        self.assertEqual(result.values.tolist(), [1.5, 2.5, 3.5])
+
+    def test_literals_only(self):
+        result = self.evaluate("1 + 2", x=[None, None])
+        self.assertEqual(result.values.tolist(), [3.0, 3.0])
+
+    def test_mixed_columns(self):
+        result = self.evaluate("x + 1 == y", x=[1, "a", 2, None, 3], y=[2, "a1", 0, 1, 4.0])
+        self.assertEqual(result.values[[0, 2, 4]].tolist(), [True, False, True])
+        self.assertEqual(len(result.errors), 1)
+
+        (error,) = result.errors
+        self.assertEqual(error.token.lexeme, "+")
+        self.assertEqual(error.message, "Operands should be two numbers or two strings")
+        self.assertEqual(error.rows.tolist(), [1, 3])
+        self.assertEqual(result.failed.tolist(), [False, True, False, True, False])
+
+    def test_first_error_per_row(self):
+        result = self.evaluate("-x + (y / 0)", x=["a", 1, 2], y=[1, "b", 3])
+        errors = [(error.token.lexeme, error.rows.tolist()) for error in result.errors]
+        self.assertEqual(errors, [("-", [0]), ("/", [2]), ("/", [1])])
+        self.assertEqual(result.errors[2].message, "Operands must be numbers")
+
+    def test_division_by_zero(self):
+        np = self.np
+        result = self.evaluate("1 / x", x=np.array([2.0, 0.0, 4.0, 0.0]))
+        self.assertEqual(result.values[[0, 2]].tolist(), [0.5, 0.25])
+
+        (error,) = result.errors
+        self.assertEqual(error.token.lexeme, "/")
+        self.assertEqual(error.rows.tolist(), [1, 3])
+
+    def test_same_as_row_by_row(self):
+        # pylint: disable=C0415
+        from pylox.intepreter import Intepreter
+        from pylox.intepreter.expression import ExprEvaluator
+        from pylox.token import Token, TokenType
+
+        columns = {"x": [1, "a", None, True, 0, "3"], "y": [2.5, "b", False, 0, "3", None]}
+        sources = ["x == y", "x != nil", "!x", "x < 2", "x + y", "-y", "x * (y - 1)"]
+        for source in sources:
+            expr = parse_expr(source)
+            result = self.evaluate(source, **columns)
+            errors = {
+                int(row): (error.token, error.message) for error in result.errors for row in error.rows
+            }
+            for row in range(len(columns["x"])):
+                intepreter = Intepreter()
+                for name, values in columns.items():
+                    value = values[row]
+                    if type(value) is int:
+                        value = float(value)
+                    intepreter.env.define(Token(TokenType.IDENT, name, None, 1), value)
+                # pylint: disable=W0212
+                intepreter._resolve_expr(expr)
+                try:
+                    expected = ExprEvaluator(intepreter.env).evaluate(expr)
+                except IntepreterRuntimeError as error:
+                    self.assertEqual(errors[row], (error.token, str(error)), (source, row))
+                except (TypeError, ValueError) as error:
+                    # `-"a"` escapes the tree-walker; it is reported at the operator
+                    self.assertEqual(errors[row][1], str(error), (source, row))
+                else:
+                    self.assertNotIn(row, errors, (source, row))
+                    self.assertEqual(result.values[row], expected, (source, row))
+
+    def test_different_lengths(self):
+        with self.assertRaises(ValueError):
+            self.evaluate("x + y", x=[1, 2], y=[1, 2, 3])
+
+    def test_undefined_variable(self):
+        with self.assertRaises(IntepreterRuntimeError):
+            self.evaluate("x + y", x=[1, 2])
@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from benchmarks import workloads, run_suite, compare, format_results
+from benchmarks.__main__ import main
+
+SCALE = 0.01
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_workloads(self):
+        names = [workload.name for workload in workloads(SCALE)]
+        self.assertEqual(len(names), len(set(names)))
+        for phase in ("lex", "parse", "evaluate", "run"):
+            self.assertTrue(any(name.startswith(phase + "/") for name in names), phase)
+
+    def test_deterministic(self):
+        first, second = workloads(SCALE), workloads(SCALE)
+        for a, b in zip(first, second):
+            self.assertEqual(a.name, b.name)
+            if a.phase == "lex":
+                self.assertEqual(a.setup(), b.setup())
+
+    def test_suite(self):
+        selected = [w for w in workloads(SCALE) if w.name.endswith(("/buffer", "/pratt", "/vm"))]
+        document = json.loads(json.dumps(run_suite(selected, repeat=1, scale=SCALE)))
+
+        self.assertEqual(set(document["results"]), {w.name for w in selected})
+        for result in document["results"].values():
+            self.assertGreater(result["units"], 0)
+            self.assertGreater(result["rate"], 0)
+            self.assertGreater(result["peak_bytes"], 0)
+
+        comparisons = compare(document, document)
+        self.assertEqual(len(comparisons), len(selected))
+        self.assertFalse(any(c.regression for c in comparisons))
+        self.assertIn("parse/deep/pratt", format_results(document, comparisons))
+
+    def test_compare(self):
+        def document(rate, peak, scale=1.0):
+            result = {"rate": rate, "peak_bytes": peak}
+            return {"format": 1, "scale": scale, "results": {"a": result}}
+
+        baseline = document(100.0, 1000)
+        for rate, peak, regression in [(95.0, 1000, False), (85.0, 1000, True), (100.0, 1200, True)]:
+            (comparison,) = compare(document(rate, peak), baseline, threshold=0.1)
+            self.assertEqual(comparison.regression, regression, (rate, peak))
+
+        self.assertEqual(compare({"format": 1, "scale": 1.0, "results": {}}, baseline), [])
+        with self.assertRaises(ValueError):
+            compare(document(100.0, 1000, scale=0.5), baseline)
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            args = ["-k", "lex/numbers/buffer", "--repeat", "1", "--scale", str(SCALE)]
+            with redirect_stderr(io.StringIO()):
+                self.assertEqual(main(args + ["-o", output]), 0)
+
+            with open(output, encoding="utf-8") as f:
+                baseline = json.load(f)
+            baseline["results"]["lex/numbers/buffer"]["rate"] *= 100
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(baseline, f)
+
+            stderr = io.StringIO()
+            with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                self.assertEqual(main(args + ["--baseline", output]), 1)
+            self.assertIn("REGRESSION", stderr.getvalue())
@@ -0,0 +1,87 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter, Budget
+from pylox.intepreter.budget import CLOCK_INTERVAL, statement_cost
+from pylox.intepreter.engine import ENGINES
+from pylox.optimizer import OptimizerOptions
+from pylox.runner import Job, WorkerOptions, run_job
+from pylox.runner import jobs
+from test.test_vm import PROGRAMS
+
+SOURCE = """var a = 1;
+print a + 2;
+var b = a * (3 + a);
+print b;
+"""
+
+
+def intepret(intepreter: Intepreter, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        intepreter.intepret(source)
+    return out.getvalue()
+
+
+class TestBudget(unittest.TestCase):
+    def test_enough_fuel(self):
+        for engine in ENGINES:
+            for source in PROGRAMS:
+                budgeted = Intepreter(engine, budget=Budget(fuel=1000, timeout=60))
+                self.assertEqual(intepret(budgeted, source), intepret(Intepreter(engine), source))
+
+    def test_out_of_fuel(self):
+        # Statements cost 2, 4, 7 and 2
+        for engine in ENGINES:
+            for fuel, printed in [(0, []), (5, []), (6, ["3"]), (14, ["3"]), (15, ["3", "4"])]:
+                out = intepret(Intepreter(engine, budget=Budget(fuel=fuel)), SOURCE)
+                lines = out.splitlines()
+                self.assertEqual(lines[: len(printed)], printed, (engine, fuel))
+                self.assertEqual(len(lines), len(printed) + (fuel < 15), (engine, fuel))
+
+            out = intepret(Intepreter(engine, budget=Budget(fuel=10)), SOURCE)
+            self.assertEqual(out, "3\n[Line 3] Error : Runtime error: Out of fuel after 10 steps\n")
+
+    def test_fuel_per_run(self):
+        intepreter = Intepreter(budget=Budget(fuel=5))
+        program = intepreter.compile("print 1 + 2;")
+        for _ in range(3):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                intepreter.run(program)
+            self.assertEqual(out.getvalue(), "3\n")
+
+    def test_deadline(self):
+        source = "var a = 0;\n" + "a = a + 1;\n" * CLOCK_INTERVAL + "print a;"
+        for engine in ENGINES:
+            out = intepret(Intepreter(engine, budget=Budget(timeout=0)), source)
+            self.assertRegex(out, r"^\[Line \d+\] Error : Runtime error: Deadline of 0s exceeded\n$")
+
+    def test_interrupted_statement(self):
+        # The tree-walker charges node by node, so assignments evaluated
+        # before the fuel ran out have happened
+        intepreter = Intepreter("tree", budget=Budget(fuel=7))
+        out = intepret(intepreter, "var a; var b;\nprint (a = 1) + (b = 2);")
+        self.assertEqual(out, "[Line 2] Error : Runtime error: Out of fuel after 7 steps\n")
+        self.assertEqual(intepreter.env.values, [1.0, None])
+
+    def test_statement_cost(self):
+        intepreter = Intepreter()
+        statements, _ = intepreter.parse(intepreter.lex("var a; var b = -(1 + a); print a = 2;")[0])
+        self.assertEqual([statement_cost(stmt) for stmt in statements], [1, 6, 3])
+
+    def test_lines_survive_optimizer(self):
+        intepreter = Intepreter(optimizer=OptimizerOptions(), budget=Budget(fuel=4))
+        out = intepret(intepreter, "print 1;\n\nprint (2 + 3) * 4;\nprint 1 + nil;")
+        self.assertEqual(out, "1\n20\n[Line 4] Error : Runtime error: Out of fuel after 4 steps\n")
+
+    def test_batch_job(self):
+        # pylint: disable=W0212
+        options = jobs._options
+        try:
+            jobs._options = WorkerOptions(budget=Budget(fuel=10))
+            result = run_job(Job(SOURCE))
+        finally:
+            jobs._options = options
+        self.assertEqual(result.status, jobs.RUNTIME_ERROR)
+        self.assertIn("Out of fuel", result.output)
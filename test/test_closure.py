@@ -0,0 +1,35 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter
+from test import test_intepreter
+from test.test_vm import PROGRAMS, run_program
+
+
+class TestClosureExpr(test_intepreter.TestIntepreterExpr):
+    def setUp(self) -> None:
+        self.intepreter = Intepreter("closure")
+
+
+class TestClosureProgram(unittest.TestCase):
+    def test_same_output(self):
+        for source in PROGRAMS:
+            self.assertEqual(
+                run_program("closure", source), run_program("tree", source)
+            )
+
+    def test_reuse_compiled(self):
+        intepreter = Intepreter("closure")
+        intepreter.intepret("var a = 0;")
+        program = intepreter.compile("a = a + 1; print a;")
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for _ in range(3):
+                intepreter.run(program)
+
+        self.assertEqual(out.getvalue(), "1\n2\n3\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
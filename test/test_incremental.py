@@ -0,0 +1,108 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.buffer_scanner import BufferScanner
+from pylox.parser import Document, Edit, Parser
+from test.test_random_programs import program
+
+SNIPPETS = ["1", ";", " ", "\n", "var x = 2;\n", '"', '"s"', "// c\n", "/", "+", "a", ".5", "(", ")", "="]
+
+
+def full_parse(source: str):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        reporter = ErrorReporter()
+        tokens = BufferScanner(source, reporter).scan_tokens()
+        statements = None if reporter.had_error else Parser(tokens, reporter).parse()
+    return tokens, statements, out.getvalue()
+
+
+def lines(statements) -> list:
+    return [(stmt.line, getattr(stmt, "name", None) and stmt.name.line) for stmt in statements]
+
+
+class TestIncremental(unittest.TestCase):
+    def assert_same_as_full(self, document: Document, errors: str):
+        tokens, statements, expected_errors = full_parse(document.source)
+        self.assertEqual(document.statements, statements)
+        self.assertEqual(errors, expected_errors)
+        if statements is not None:
+            for column in ("types", "starts", "ends", "lines"):
+                self.assertEqual(getattr(document.tokens, column), getattr(tokens, column), column)
+            self.assertEqual(lines(document.statements), lines(statements))
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        for seed in range(8):
+            with redirect_stdout(io.StringIO()):
+                document = Document(program(20, seed=seed))
+            for _ in range(40):
+                offset = rng.randrange(len(document.source) + 1)
+                deleted = min(rng.choice([0, 0, 1, 3]), len(document.source) - offset)
+                edit = Edit(offset, deleted, rng.choice(SNIPPETS) if rng.random() < 0.8 else "")
+
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    document.edit(edit)
+                # Some edits in a row, so that their shifts pile up
+                if rng.random() < 0.4:
+                    self.assert_same_as_full(document, out.getvalue())
+            self.assert_same_as_full(document, full_parse(document.source)[2])
+
+    def test_reuse(self):
+        source = "var a = 1;\nprint a + 2;\nvar b = a;\nprint b;\n"
+        document = Document(source)
+        before = list(document.statements)
+
+        offset = source.index("2")
+        self.assertTrue(document.edit(Edit(offset, 1, "20 * 3")))
+        statements = document.statements
+        self.assertIs(statements[0], before[0])
+        self.assertIsNot(statements[1], before[1])
+        self.assertIs(statements[2], before[2])
+        self.assertIs(statements[3], before[3])
+        self.assertEqual((document.relexed, document.reparsed), (4, 1))
+
+        # Reused statements after an inserted line move down
+        document.edit(Edit(0, 0, "var c;\n"))
+        statements = document.statements
+        self.assertEqual(document.reparsed, 1)
+        self.assertIs(statements[4], before[3])
+        self.assertEqual([stmt.line for stmt in statements], [1, 2, 3, 4, 5])
+        self.assertEqual(statements[3].name.line, 4)
+        self.assert_same_as_full(document, "")
+
+    def test_work_per_edit(self):
+        # Typing lines in near the top of a long source leaves the rest be
+        source = "var a = 1;\nprint a + 2;\n" * 5000
+        document = Document(source)
+        offset = source.index("print", 100)
+        for i in range(50):
+            text = "var b{} = a;\n".format(i) if i % 2 else "// {}\n".format(i)
+            self.assertTrue(document.edit(Edit(offset, 0, text)))
+            offset += len(text) if i % 3 else 0
+            self.assertLessEqual(document.relexed + document.reparsed + document.shifted, 30)
+
+        # Going back and forth costs what lies between the edits
+        for i in range(10):
+            self.assertTrue(document.edit(Edit(len(document.source) // (2 + i % 2), 0, "\n")))
+        self.assertGreater(document.shifted, 1000)
+        self.assert_same_as_full(document, "")
+
+    def test_errors(self):
+        document = Document("var a = 1;\nprint a;\n")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertFalse(document.edit(Edit(10, 0, "(")))
+        self.assertTrue(document.had_error)
+        self.assertIsNone(document.statements)
+        self.assertEqual(out.getvalue(), "[Line 2] Error  at 'print': Expected expression\n")
+
+        self.assertTrue(document.edit(Edit(10, 1, "")))
+        self.assertFalse(document.had_error)
+        self.assert_same_as_full(document, "")
+
+        with self.assertRaises(ValueError):
+            document.edit(Edit(len(document.source), 1, ""))
@@ -0,0 +1,165 @@
+import io
+import os
+import pkgutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+import pylox
+from pylox.__main__ import ENGINE_NAMES, main
+
+# Cumulative time `python -X importtime` measures for `import pylox.__main__`,
+# which is all `--version` and the dumps import up front. About 27ms when
+# set, against some 150ms for the intepreter, with room for slower machines.
+IMPORT_BUDGET_MS = 75
+
+# Modules the paths that only lex or parse must not load
+EVALUATOR_MODULES = ("pylox.intepreter", "pylox.vm", "pylox.closure", "pylox.quickening")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run(
+        [sys.executable, *args], input="", capture_output=True, text=True, env=env, check=False
+    )
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def script(self, source: str) -> str:
+        path = os.path.join(self.directory.name, "script.lox")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        return path
+
+    def main(self, *argv: str, stdin: str = ""):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            with mock.patch("sys.stdin", io.StringIO(stdin)):
+                status = main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_run_file(self):
+        path = self.script('var a = 1;\nprint a + 2;\nprint a + "b";')
+        for engine in ("tree", "vm", "quick"):
+            status, out, _ = self.main(path, "--engine", engine)
+            self.assertEqual(status, 70)
+            self.assertEqual(
+                out,
+                "3\n[Line 3] Error  at '+': "
+                "Runtime error: Operands should be two numbers or two strings\n",
+            )
+
+        self.assertEqual(self.main(self.script("print (1;"))[0], 65)
+        self.assertEqual(self.main(self.script("print b;"))[0], 65)
+        self.assertEqual(self.main("-", stdin="print 1;")[:2], (0, "1\n"))
+        self.assertEqual(self.main(os.path.join(self.directory.name, "missing.lox"))[0], 66)
+        with self.assertRaises(SystemExit) as e, redirect_stderr(io.StringIO()):
+            main([path, "--engine", "nope"])
+        self.assertEqual(e.exception.code, 2)
+        self.assertEqual(self.main(path, "--scanner", "nope")[0], 64)
+
+    def test_engine_names(self):
+        from pylox.intepreter.engine import ENGINES  # pylint: disable=C0415
+
+        self.assertEqual(ENGINE_NAMES, tuple(sorted(ENGINES)))
+
+    def test_program_cache(self):
+        path = self.script("var a = 1;\nprint a + 2;")
+        cache = os.path.join(self.directory.name, "cache")
+        self.assertEqual(self.main(path, "--cache", cache)[:2], (0, "3\n"))
+        self.assertTrue(os.listdir(cache))
+        # Loaded from the cache, so neither lexed nor parsed
+        status, out, err = self.main(path, "--cache", cache, "--time")
+        self.assertEqual((status, out), (0, "3\n"))
+        phases = [line.split()[0] for line in err.splitlines()]
+        self.assertEqual(phases, ["import", "resolve", "compile", "run", "total"])
+
+    def test_compile_missing(self):
+        missing = os.path.join(self.directory.name, "missing.lox")
+        status, _, err = self.main("compile", missing)
+        self.assertEqual(status, 66)
+        self.assertEqual(err.count("\n"), 1)
+        self.assertTrue(err.startswith("pylox: cannot read "))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "missing.py")))
+
+    def test_time(self):
+        status, out, err = self.main(self.script("print 1;"), "--time", "--optimize")
+        self.assertEqual((status, out), (0, "1\n"))
+        phases = [line.split()[0] for line in err.splitlines()]
+        self.assertEqual(
+            phases, ["import", "lex", "parse", "optimize", "resolve", "compile", "run", "total"]
+        )
+
+    def test_dumps(self):
+        path = self.script("var a = 1;\nprint -a;")
+        status, out, _ = self.main(path, "--tokens", "--scanner", "buffer")
+        self.assertEqual(status, 0)
+        self.assertEqual(out.splitlines()[:2], ["   1 VAR        var", "   1 IDENT      a"])
+        self.assertEqual(out.splitlines()[-1], "   2 EOF")
+
+        self.assertEqual(
+            self.main(path, "--ast"), (0, "(var a 1.0)\n(print (- (var_ref a)))\n", "")
+        )
+        self.assertEqual(self.main("--ast", stdin="print (1;")[0], 65)
+
+    def test_repl(self):
+        lines = "var a = 1;\n\nprint a + 1;\nprint b;\na = a + 1;\nprint a;\n"
+        status, out, _ = self.main(stdin=lines)
+        self.assertEqual(status, 0)
+        self.assertEqual(out, "2\n[Line 1] Error  at 'b': Variable undefined: b\n2\n")
+
+    def test_version(self):
+        with self.assertRaises(SystemExit) as e, redirect_stdout(io.StringIO()) as out:
+            main(["--version"])
+        self.assertEqual(e.exception.code, 0)
+        self.assertEqual(out.getvalue(), "pylox {}\n".format(pylox.__version__))
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_imports(self):
+        for argv in (["--version"], ["--tokens", "-"], ["--ast", "-"]):
+            with self.subTest(argv=argv):
+                code = (
+                    "import sys\n"
+                    "from pylox.__main__ import main\n"
+                    "try:\n"
+                    "    main({!r})\n"
+                    "except SystemExit:\n"
+                    "    pass\n"
+                    "print(*sys.modules, file=sys.stderr)\n"
+                ).format(argv)
+                loaded = python("-c", code).stderr.split()
+                self.assertIn("pylox.__main__", loaded)
+                self.assertEqual("pylox.lexer" in loaded, argv != ["--version"])
+                for module in EVALUATOR_MODULES:
+                    self.assertNotIn(module, loaded)
+
+    def test_import_budget(self):
+        # The best of a few runs, to leave out a busy machine
+        best = None
+        for _ in range(3):
+            result = python("-X", "importtime", "-c", "import pylox.__main__")
+            for line in result.stderr.splitlines():
+                fields = [field.strip() for field in line.split("|")]
+                if len(fields) == 3 and fields[2] == "pylox.__main__":
+                    cumulative = int(fields[1]) / 1000
+                    best = cumulative if best is None else min(best, cumulative)
+        self.assertIsNotNone(best)
+        self.assertLess(best, IMPORT_BUDGET_MS)
+
+    def test_import_order(self):
+        # Each module first in a fresh process, so no import order hides a cycle
+        for module in pkgutil.walk_packages(pylox.__path__, "pylox."):
+            with self.subTest(module=module.name):
+                result = python("-c", "import {}".format(module.name))
+                self.assertEqual(result.returncode, 0, result.stderr)
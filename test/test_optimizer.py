@@ -0,0 +1,62 @@
+import unittest
+from pylox.ast.ast_printer import AstPrinter
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter import Intepreter
+from pylox.lexer.scanner import Scanner
+from pylox.optimizer import Optimizer, OptimizerOptions
+from pylox.parser.parser import Parser
+from test import test_intepreter
+
+
+def optimize(s: str, options: OptimizerOptions = None) -> str:
+    tokens = Scanner(s, ErrorReporter()).scan_tokens()
+    # pylint: disable=W0212
+    ast = Parser(tokens, ErrorReporter())._parse_expr()
+    return AstPrinter().print(Optimizer(options).optimize_expr(ast))
+
+
+class TestOptimizerExpr(test_intepreter.TestIntepreterExpr):
+    def setUp(self) -> None:
+        self.intepreter = Intepreter(optimizer=OptimizerOptions())
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_fold(self):
+        self.assertEqual(optimize("(1 + 2) * 3 - -1"), "10.0")
+        self.assertEqual(optimize('"a" + "b" == "ab"'), "True")
+        self.assertEqual(optimize("!nil"), "True")
+
+    def test_keep_errors(self):
+        self.assertEqual(optimize('1 + "a"'), "(+ 1.0 a)")
+        self.assertEqual(optimize("(2 - 1) / (1 - 1)"), "(/ 1.0 0.0)")
+        self.assertEqual(optimize('-"a"'), "(- a)")
+
+    def test_unary(self):
+        self.assertEqual(optimize("!!(a < b)"), "(< (var_ref a) (var_ref b))")
+        self.assertEqual(optimize("--(a * b)"), "(* (var_ref a) (var_ref b))")
+        # Not a no-op for values of unknown type
+        self.assertEqual(optimize("!!a"), "(! (! (var_ref a)))")
+        self.assertEqual(optimize("--a"), "(- (- (var_ref a)))")
+
+    def test_identities(self):
+        self.assertEqual(optimize("(a - b) * 1"), "(- (var_ref a) (var_ref b))")
+        self.assertEqual(optimize("1 * -a / 1 - 0"), "(- (var_ref a))")
+        self.assertEqual(optimize("a * 1"), "(* (var_ref a) 1.0)")
+        self.assertEqual(optimize("-a + 0"), "(+ (- (var_ref a)) 0.0)")
+
+    def test_switches(self):
+        off = OptimizerOptions(
+            fold_constants=False,
+            strip_groupings=False,
+            simplify_unary=False,
+            simplify_identities=False,
+        )
+        self.assertEqual(optimize("(1 + 2)", off), "(group (+ 1.0 2.0))")
+        self.assertEqual(
+            optimize("(1 + 2)", OptimizerOptions(strip_groupings=False)),
+            "(group 3.0)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter, BufferedSink, FileSink, MemorySink, NullSink
+from pylox.intepreter.engine import ENGINES
+from test.test_vm import PROGRAMS, run_program
+
+
+class TestSinks(unittest.TestCase):
+    def test_engines(self):
+        for engine in ENGINES:
+            for source in PROGRAMS:
+                sink = MemorySink()
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    Intepreter(engine, output=sink).intepret(source)
+                # Errors are still reported on stdout
+                self.assertEqual(sink.getvalue() + out.getvalue(), run_program(engine, source))
+
+    def test_buffered(self):
+        stream = io.StringIO()
+        sink = BufferedSink(stream, buffer_size=8)
+        sink.write("abc")
+        self.assertEqual(stream.getvalue(), "")
+        sink.write("defg")
+        self.assertEqual(stream.getvalue(), "abc\ndefg\n")
+        sink.write("h")
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "abc\ndefg\nh\n")
+
+        unbuffered = BufferedSink(stream, buffer_size=0)
+        unbuffered.write("i")
+        self.assertEqual(stream.getvalue(), "abc\ndefg\nh\ni\n")
+        with self.assertRaises(ValueError):
+            BufferedSink(stream, buffer_size=-1)
+
+    def test_flushed_before_errors(self):
+        stream = io.StringIO()
+        intepreter = Intepreter(output=BufferedSink(stream))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            intepreter.intepret('print 1; print "a" - 1;')
+        self.assertEqual(stream.getvalue(), "1\n")
+        self.assertIn("Runtime error", out.getvalue())
+
+    def test_default_stdout(self):
+        # Redirecting stdout after the intepreter is made still captures it
+        intepreter = Intepreter()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            intepreter.intepret("print 1; print 2;")
+        self.assertEqual(out.getvalue(), "1\n2\n")
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.txt")
+            for append in (False, True):
+                sink = FileSink(path, append=append)
+                Intepreter("vm", output=sink).intepret('print "a" + "b";')
+                sink.close()
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "ab\nab\n")
+
+    def test_discard(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            Intepreter("closure", output=NullSink()).intepret("print 1;")
+        self.assertEqual(out.getvalue(), "")
+
+    def test_memory(self):
+        sink = MemorySink()
+        intepreter = Intepreter("python", output=sink)
+        intepreter.intepret("var a = 1; print a; print a + 1;")
+        self.assertEqual(sink.lines, ["1", "2"])
+        sink.clear()
+        self.assertEqual(sink.getvalue(), "")
@@ -0,0 +1,66 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.ast import expr
+
+SOURCES = [
+    "1 + 2 * 3 - 4 / 5;",
+    '!5>= (1 !=5 * 4+- 2);',
+    "1 == 2 >= 5 != 6 < 7 <= 8 > 9;",
+    "- - !-a * (b);",
+    "print a = b + 1;",
+    "print (a = (b = 1)) == 2;",
+    "var x = !(a = 1) + (b);",
+    "a = b = c;",
+    "1 = 2;",
+    "(a) = 2 + 3;",
+    "a + b = 3;",
+    "(1 + ;",
+    "(1 + 2;",
+    "1 +;",
+    "print;",
+    ")",
+    "",
+]
+
+
+def parse(source: str, expression_parser: str):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        tokens = Scanner(source, ErrorReporter()).scan_tokens()
+        statements = Parser(tokens, ErrorReporter(), expression_parser).parse()
+    return statements, out.getvalue()
+
+
+class TestPrattParser(unittest.TestCase):
+    def test_same_as_recursive(self):
+        for source in SOURCES:
+            with self.subTest(source=source):
+                self.assertEqual(parse(source, "pratt"), parse(source, "recursive"))
+
+    def test_invalid_target(self):
+        for parser in ("pratt", "recursive"):
+            statements, out = parse("1 = 2; print 3;", parser)
+            self.assertEqual(out, "[Line 1] Error  at '=': Not an assignment target\n")
+            self.assertEqual(statements[0].expr, expr.LiteralExpr(1.0))
+            self.assertEqual(len(statements), 2)
+
+    def test_deep_nesting(self):
+        depth = 100000
+        statements, out = parse("(" * depth + "-1" + ")" * depth + ";", "pratt")
+        self.assertEqual(out, "")
+
+        node = statements[0].expr
+        for _ in range(depth):
+            node = node.expr
+        self.assertIsInstance(node, expr.UnaryExpr)
+
+        statements, out = parse("!" * depth + "a = 1" + " + 1" * depth + ";", "pratt")
+        self.assertEqual(out, "[Line 1] Error  at '=': Not an assignment target\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import io
+import itertools
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter, Profiler, Budget
+from test.test_vm import PROGRAMS
+
+SOURCE = """var a = 1;
+print a + 2;
+
+print (a = 3) * a;
+"""
+
+
+def intepret(intepreter: Intepreter, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        intepreter.intepret(source)
+    return out.getvalue()
+
+
+def ticking_profiler() -> Profiler:
+    # Every reading of the clock is one second later
+    return Profiler(clock=itertools.count().__next__)
+
+
+class TestProfiler(unittest.TestCase):
+    def test_same_output(self):
+        for source in PROGRAMS:
+            profiled = Intepreter(profiler=Profiler())
+            self.assertEqual(intepret(profiled, source), intepret(Intepreter(), source))
+
+    def test_stats(self):
+        profiler = ticking_profiler()
+        intepret(Intepreter(profiler=profiler), SOURCE)
+
+        stats = {(s.line, s.label): s for s in profiler.nodes.values()}
+        self.assertEqual(
+            sorted(stats),
+            [
+                (1, "LiteralExpr:1"),
+                (1, "VarStmt a:1"),
+                (2, "BinaryExpr +:2"),
+                (2, "LiteralExpr:2"),
+                (2, "PrintStmt:2"),
+                (2, "VariableExpr a:2"),
+                (4, "AssignmentExpr a:4"),
+                (4, "BinaryExpr *:4"),
+                (4, "GroupingExpr:4"),
+                (4, "LiteralExpr:4"),
+                (4, "PrintStmt:4"),
+                (4, "VariableExpr a:4"),
+            ],
+        )
+
+        # A leaf spans one tick, from its enter to its exit; a parent also
+        # spans the readings of its children and the ticks between them
+        self.assertEqual((stats[1, "LiteralExpr:1"].total, stats[1, "LiteralExpr:1"].self_time), (1, 1))
+        addition = stats[2, "BinaryExpr +:2"]
+        self.assertEqual((addition.calls, addition.total, addition.self_time), (1, 5, 3))
+        self.assertEqual(stats[4, "PrintStmt:4"].total, 11)
+
+    def test_report(self):
+        profiler = ticking_profiler()
+        intepret(Intepreter(profiler=profiler), SOURCE)
+        report = profiler.report(limit=2)
+        self.assertTrue(report.startswith("12 node evaluations in"))
+        # Header, 2 lines, blank, header, 2 nodes
+        self.assertEqual(len(report.splitlines()), 2 + 3 + 1 + 3)
+
+    def test_collapsed(self):
+        profiler = ticking_profiler()
+        intepret(Intepreter(profiler=profiler), SOURCE)
+        collapsed = dict(line.rsplit(" ", 1) for line in profiler.collapsed().splitlines())
+        self.assertEqual(collapsed["PrintStmt:2;BinaryExpr +:2;VariableExpr a:2"], "1000000")
+        self.assertEqual(
+            sum(map(int, collapsed.values())),
+            1000000 * sum(stats.self_time for stats in profiler.nodes.values()),
+        )
+
+    def test_accumulates(self):
+        profiler = ticking_profiler()
+        intepreter = Intepreter(profiler=profiler)
+        program = intepreter.compile("print 1;")
+        with redirect_stdout(io.StringIO()):
+            intepreter.run(program)
+            intepreter.run(program)
+        self.assertEqual([stats.calls for stats in profiler.nodes.values()], [2, 2])
+
+        profiler.reset()
+        self.assertEqual(profiler.nodes, {})
+
+    def test_runtime_error(self):
+        profiler = ticking_profiler()
+        out = intepret(Intepreter(profiler=profiler), 'print -1 + "a";\nprint 2;')
+        self.assertIn("Runtime error", out)
+        # Every node that was entered was also left
+        self.assertEqual([stats.calls for stats in profiler.nodes.values()], [1, 1, 1, 1, 1])
+        self.assertEqual(len(profiler._frames), 1)  # pylint: disable=W0212
+
+    def test_needs_tree_engine(self):
+        with self.assertRaises(ValueError):
+            Intepreter("vm", profiler=Profiler())
+        with self.assertRaises(ValueError):
+            Intepreter(profiler=Profiler(), budget=Budget(fuel=10))
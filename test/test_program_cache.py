@@ -0,0 +1,155 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from pylox.cache import ProgramCache, serializer
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter import Intepreter
+from pylox.lexer.scanner import Scanner
+from pylox.optimizer import OptimizerOptions
+from pylox.parser.parser import Parser
+from test.test_vm import PROGRAMS, run_program
+
+
+def parse(source: str):
+    tokens = Scanner(source, ErrorReporter()).scan_tokens()
+    return Parser(tokens, ErrorReporter()).parse()
+
+
+class CountingIntepreter(Intepreter):
+    lexed = 0
+
+    def lex(self, source: str, scanner: str = None):
+        CountingIntepreter.lexed += 1
+        return super().lex(source, scanner)
+
+
+def run_cached(cache: ProgramCache, source: str, **kwargs) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        CountingIntepreter(cache=cache, **kwargs).intepret(source)
+    return out.getvalue()
+
+
+class TestSerializer(unittest.TestCase):
+    def test_round_trip(self):
+        for source in PROGRAMS + ["var a; var b = (a = -!nil) == 2;"]:
+            statements = parse(source)
+            self.assertEqual(serializer.loads(serializer.dumps(statements)), statements)
+
+    def test_tokens(self):
+        (statement,) = serializer.loads(serializer.dumps(parse('\nprint "a" + b;')))
+        self.assertEqual(statement.expr.operator.line, 2)
+        self.assertEqual(statement.expr.right.name.lexeme, "b")
+
+    def test_lines(self):
+        statements = serializer.loads(serializer.dumps(parse("var a;\n\nprint a;\na = 1;")))
+        self.assertEqual([statement.line for statement in statements], [1, 3, 4])
+
+    def test_deep(self):
+        depth = 50000
+        statements = parse("print " + "(-" * depth + "1" + ")" * depth + ";")
+        node = serializer.loads(serializer.dumps(statements))[0].expr
+        for _ in range(depth):
+            node = node.expr.right
+        self.assertEqual(node.value, 1.0)
+
+
+class TestProgramCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ProgramCache(self.directory.name)
+        CountingIntepreter.lexed = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def entries(self):
+        return sorted(Path(self.directory.name).iterdir())
+
+    def test_same_output(self):
+        for source in PROGRAMS:
+            for _ in range(2):
+                self.assertEqual(run_cached(self.cache, source), run_program("tree", source))
+
+        self.assertEqual(CountingIntepreter.lexed, len(PROGRAMS))
+        self.assertEqual(len(self.entries()), len(PROGRAMS))
+
+    def test_parse_error(self):
+        for _ in range(2):
+            self.assertEqual(run_cached(self.cache, "print (1;"), run_program("tree", "print (1;"))
+        self.assertEqual(CountingIntepreter.lexed, 2)
+        self.assertEqual(self.entries(), [])
+
+    def test_key(self):
+        run_cached(self.cache, "print 1 + 2;")
+        run_cached(self.cache, "print 1 + 2;", optimizer=OptimizerOptions())
+        run_cached(self.cache, "print 1 + 2 ;")
+        self.assertEqual(CountingIntepreter.lexed, 3)
+        self.assertEqual(len(self.entries()), 3)
+
+        run_cached(self.cache, "print 1 + 2;", optimizer=OptimizerOptions())
+        self.assertEqual(CountingIntepreter.lexed, 3)
+
+    def test_corrupt_entry(self):
+        run_cached(self.cache, "print 1;")
+        (path,) = self.entries()
+
+        for data in (b"", path.read_bytes()[:-1] + b"\0", b"LOXC" + bytes(40)):
+            path.write_bytes(data)
+            self.assertIsNone(self.cache.load("print 1;"))
+            self.assertFalse(path.exists())
+            self.assertEqual(run_cached(self.cache, "print 1;"), "1\n")
+
+    def test_eviction(self):
+        sources = [f"print {i};" for i in range(4)]
+        run_cached(self.cache, sources[0])
+        size = self.entries()[0].stat().st_size
+
+        # Entry sizes vary by a few bytes
+        small = ProgramCache(self.directory.name, max_bytes=int(3.5 * size))
+        for source in sources[1:3]:
+            run_cached(small, source)
+        for age, path in enumerate(self.entries()):
+            os.utime(path, (age, age))
+        # A hit makes an entry the most recently used
+        self.assertIsNotNone(small.load(sources[0]))
+
+        run_cached(small, sources[3])
+        self.assertEqual(len(self.entries()), 3)
+        self.assertIsNotNone(small.load(sources[0]))
+        self.assertIsNotNone(small.load(sources[3]))
+        self.assertFalse(all(small.load(source) for source in sources[1:3]))
+
+    def test_store_counts_incrementally(self):
+        scans = []
+
+        class CountingCache(ProgramCache):
+            def _scan(self):
+                scans.append(self.total_bytes)
+                return super()._scan()
+
+        sources = [f"print {i};" for i in range(200)]
+        run_cached(self.cache, sources[0])
+        size = self.entries()[0].stat().st_size
+
+        cache = CountingCache(self.directory.name, max_bytes=50 * size)
+        for source in sources:
+            run_cached(cache, source)
+        # Replacing an entry counts it once
+        self.assertTrue(cache.store(sources[-1], parse(sources[-1])))
+        # Once when opened, then only to evict, every few stores
+        self.assertLess(len(scans), 30)
+        self.assertEqual(cache.entry_count, len(self.entries()))
+        self.assertEqual(cache.total_bytes, sum(path.stat().st_size for path in self.entries()))
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+
+    def test_no_temporary_files(self):
+        run_cached(self.cache, "var a = 1;")
+        self.assertEqual([path.suffix for path in self.entries()], [".loxc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
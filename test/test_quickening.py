@@ -0,0 +1,70 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter, MemorySink
+from pylox.quickening import nodes
+from test import test_intepreter
+from test.test_vm import PROGRAMS, run_program
+
+
+class TestQuickeningExpr(test_intepreter.TestIntepreterExpr):
+    def setUp(self) -> None:
+        self.intepreter = Intepreter("quick")
+
+
+class TestQuickeningProgram(unittest.TestCase):
+    def test_same_output(self):
+        for source in PROGRAMS:
+            self.assertEqual(run_program("quick", source), run_program("tree", source))
+
+    def test_specializes(self):
+        sink = MemorySink()
+        intepreter = Intepreter("quick", output=sink)
+        intepreter.intepret('var a = 1; var s = "x";')
+        program = intepreter.compile("print -a * 2 + 1 < 3; print s + s; print !(a == 1);")
+        compare, concat, negation = (stmt.expr for stmt in program.statements)
+        self.assertIs(type(compare), nodes.BinaryNode)
+
+        intepreter.run(program)
+        self.assertEqual(sink.lines, ["True", "xx", "False"])
+        self.assertEqual(type(compare).__name__, "FloatLessNode")
+        self.assertIs(type(compare.left), nodes.FloatAddNode)
+        self.assertIs(type(compare.left.left), nodes.FloatMultiplyNode)
+        self.assertIs(type(compare.left.left.left), nodes.FloatNegateNode)
+        self.assertIs(type(concat), nodes.StringConcatNode)
+        self.assertIs(type(negation), nodes.BoolNotNode)
+
+    def test_deoptimizes(self):
+        sink = MemorySink()
+        intepreter = Intepreter("quick", output=sink)
+        intepreter.intepret("var a = 1; var b = 2;")
+        program = intepreter.compile("print a + b;")
+        node = program.statements[0].expr
+
+        intepreter.run(program)
+        self.assertIs(type(node), nodes.FloatAddNode)
+
+        intepreter.intepret('a = "x"; b = "y";')
+        intepreter.run(program)
+        self.assertIs(type(node), nodes.BinaryNode)
+        intepreter.run(program)
+        self.assertIs(type(node), nodes.StringConcatNode)
+        self.assertEqual(sink.lines, ["3", "xy", "xy"])
+
+        # A guard failing on operands the operator rejects is still an error
+        intepreter.intepret("b = 1;")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            intepreter.run(program)
+        self.assertIn("Operands should be two numbers or two strings", out.getvalue())
+
+        for value in ("2", '"z"') * nodes.MAX_DEOPTIMIZATIONS:
+            intepreter.intepret("a = {0}; b = {0};".format(value))
+            intepreter.run(program)
+            intepreter.run(program)
+        self.assertIs(type(node), nodes.GenericBinaryNode)
+        self.assertEqual(sink.lines[-2:], ["zz", "zz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter
+from pylox.intepreter.budget import statement_cost
+from pylox.intepreter.engine import ENGINES
+from test.test_ast import load_tool
+
+generator = load_tool("generate_random_cfg")
+
+
+def program(count: int = 200, **options) -> str:
+    lines = generator.ProgramGenerator(generator.GeneratorOptions(**options)).program(
+        max_statements=count
+    )
+    return "\n".join(lines)
+
+
+class TestRandomPrograms(unittest.TestCase):
+    def test_deterministic(self):
+        self.assertEqual(program(seed=3), program(seed=3))
+        self.assertNotEqual(program(seed=3), program(seed=4))
+
+    def test_node_counts(self):
+        for seed in range(10):
+            for well_typed in (True, False):
+                pairs = generator.ProgramGenerator(
+                    generator.GeneratorOptions(seed=seed, well_typed=well_typed)
+                ).statements()
+                lines, nodes = zip(*(next(pairs) for _ in range(50)))
+
+                intepreter = Intepreter()
+                statements, error_reporter = intepreter.parse(intepreter.lex("\n".join(lines))[0])
+                self.assertFalse(error_reporter.had_error)
+                self.assertEqual([statement_cost(stmt) for stmt in statements], list(nodes))
+
+    def test_well_typed(self):
+        for seed in range(5):
+            source = program(seed=seed, max_depth=4 + seed)
+            self.assertNotIn("_", source)
+            for engine in ENGINES:
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    Intepreter(engine).intepret(source)
+                self.assertNotIn("Error", out.getvalue(), (seed, engine))
+
+    def test_sizes(self):
+        def generate(**limits):
+            return list(generator.ProgramGenerator().program(**limits))
+
+        lines = generate(max_bytes=10000)
+        size = sum(len(line) + 1 for line in lines)
+        self.assertGreaterEqual(size, 10000)
+        self.assertLess(size - len(lines[-1]) - 1, 10000)
+
+        pairs = generator.ProgramGenerator().statements()
+        nodes = sum(next(pairs)[1] for _ in range(len(generate(max_nodes=500))))
+        self.assertGreaterEqual(nodes, 500)
+
+        self.assertEqual(len(generate(max_statements=7)), 7)
+        with self.assertRaises(ValueError):
+            generate()
+
+    def test_options(self):
+        source = program(leaves={"number": 1}, statements={"print": 1}, well_typed=False)
+        self.assertTrue(all(line.startswith(("print", "var")) for line in source.splitlines()))
+        self.assertNotIn('"', source)
+
+        # Without reuse, every declaration is of a new name
+        declarations = [line.split()[1] for line in program(reuse=0.0).splitlines() if line.startswith("var")]
+        self.assertEqual(len(declarations), len(set(declarations)))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "corpus.lox")
+            self.assertEqual(generator.main(["--bytes", "5000", "--seed", "2", "-o", output]), 0)
+            with open(output, encoding="utf-8") as f:
+                source = f.read()
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            generator.main(["--bytes", "5000", "--seed", "2"])
+        self.assertEqual(out.getvalue(), source)
+        self.assertGreaterEqual(len(source), 5000)
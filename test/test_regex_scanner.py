@@ -0,0 +1,48 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.error_reporter import ErrorReporter
+from pylox.intepreter import Intepreter
+from pylox.lexer.scanner import Scanner
+from pylox.lexer.regex_scanner import RegexScanner
+
+SOURCES = [
+    'var a = 1.5;\nprint a >= 2 != !true; // done',
+    '"multi\nline" + "unterminated\n\n',
+    "1.a 1. .5 12.25.3 a1_b _",
+    "#\n@ a",
+    "café 1² µs 2.é",
+    "   \n\t ",
+    "",
+    "!*-+/=<> <= == != >= (( )){},.;",
+    'if (a <= 6) {\n    var b = "x";\n}',
+]
+
+
+def scan(cls, source: str):
+    out = io.StringIO()
+    reporter = ErrorReporter()
+    with redirect_stdout(out):
+        tokens = cls(source, reporter).scan_tokens()
+    tokens = [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens]
+    return tokens, out.getvalue(), reporter.had_error
+
+
+class TestRegexScanner(unittest.TestCase):
+    def test_same_as_scanner(self):
+        for source in SOURCES:
+            if "²" in source:
+                # `Scanner` itself crashes on this one, as float("1²") does
+                self.assertRaises(ValueError, scan, RegexScanner, source)
+                continue
+            self.assertEqual(scan(RegexScanner, source), scan(Scanner, source))
+
+    def test_lex_switch(self):
+        intepreter = Intepreter()
+        tokens, _ = intepreter.lex("var a;", scanner="regex")
+        self.assertEqual([t.lexeme for t in tokens], ["var", "a", ";", ""])
+        self.assertRaises(ValueError, Intepreter, scanner="nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter
+from pylox.intepreter.environment import Environment
+from pylox.intepreter.exc import IntepreterRuntimeError
+from pylox.token import Token, TokenType
+
+
+def run(intepreter: Intepreter, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        intepreter.intepret(source)
+    return out.getvalue()
+
+
+class TestResolver(unittest.TestCase):
+    def test_slots(self):
+        intepreter = Intepreter()
+        tokens, _ = intepreter.lex("var a = 1; var b = a; a = b;")
+        statements, _ = intepreter.parse(tokens)
+        self.assertFalse(intepreter.resolve(statements).had_error)
+
+        self.assertEqual([stmt.slot for stmt in statements[:2]], [0, 1])
+        self.assertEqual(statements[1].initializer.slot, 0)
+        self.assertEqual(statements[2].expr.slot, 0)
+        self.assertEqual(statements[2].expr.value.slot, 1)
+
+    def test_undefined_is_static(self):
+        out = run(Intepreter(), "print 1;\nprint b;")
+        self.assertEqual(out, "[Line 2] Error  at 'b': Variable undefined: b\n")
+
+    def test_assign_before_declaration_is_static(self):
+        out = run(Intepreter(), "print 1;\na = 2;\nvar a;")
+        self.assertEqual(
+            out, "[Line 2] Error  at 'a': Variable a is assigned before declaration\n"
+        )
+
+    def test_declarations_persist(self):
+        for engine in ["tree", "vm", "closure", "python"]:
+            intepreter = Intepreter(engine)
+            run(intepreter, "var a = 1;")
+            self.assertEqual(run(intepreter, "var b = a + 1; print b;"), "2\n")
+
+    def test_runtime_fallback(self):
+        # The declaration of `a` never runs, so only the runtime check can tell
+        intepreter = Intepreter()
+        out = run(intepreter, 'print 1 + "x"; var a = 1;')
+        out += run(intepreter, "print a;")
+        self.assertTrue(out.endswith("Runtime error: Variable undefined: a\n"))
+
+    def test_deep_expressions(self):
+        depth = 5000
+        intepreter = Intepreter()
+        source = "var a = 1;\na = " + "-(" * depth + "b = a" + ")" * depth + ";"
+        tokens, _ = intepreter.lex(source)
+        statements, _ = intepreter.parse(tokens)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertTrue(intepreter.resolve(statements).had_error)
+        # Operands first, left to right, as when the resolver recursed
+        self.assertEqual(
+            out.getvalue(),
+            "[Line 2] Error  at 'b': Variable b is assigned before declaration\n",
+        )
+        self.assertEqual(statements[1].expr.slot, 0)
+
+    def test_nested_too_deeply(self):
+        # Deeper than the engines can compile or the tree-walker can run
+        source = "print 1;\nprint " + "(" * 5000 + "1" + ")" * 5000 + ";"
+        for engine in ["tree", "vm", "closure", "quick", "python"]:
+            with self.subTest(engine=engine):
+                out = run(Intepreter(engine), source)
+                self.assertRegex(out, r"\[Line 2\] Error : (Runtime error: )?Expression nested too")
+
+
+class TestEnvironment(unittest.TestCase):
+    def test_by_name(self):
+        env = Environment()
+        name = Token(TokenType.IDENT, "x", None, 1)
+
+        self.assertRaises(IntepreterRuntimeError, env.get, name)
+        self.assertRaises(IntepreterRuntimeError, env.assign, name, 1.0)
+        env.define(name, None)
+        self.assertIsNone(env.get(name))
+        env.assign(name, 2.0)
+        self.assertEqual(env.get_at(env.slot("x"), name), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import pickle
+import unittest
+from pylox.intepreter import Intepreter, MemorySink
+from pylox.intepreter.engine import ENGINES
+from pylox.intepreter.rope import MIN_ROPE_LENGTH, Rope, concat
+from pylox.quickening import nodes
+
+LONG = "x" * MIN_ROPE_LENGTH
+
+PROGRAM = """
+var s = "";
+var t = "";
+var i = 0;
+var piece = "piece of text ";
+s = s + piece; s = s + piece; s = s + piece; s = s + piece; s = s + piece;
+s = s + piece; s = s + piece; s = s + piece; s = s + piece; s = s + piece;
+s = s + piece; s = s + piece; s = s + piece; s = s + piece; s = s + piece;
+s = s + piece; s = s + piece; s = s + piece; s = s + piece; s = s + piece;
+t = piece + piece + piece + piece + piece + piece + piece + piece + piece + piece;
+t = t + piece + piece + piece + piece + piece + piece + piece + piece + piece + piece;
+print s;
+print s == t;
+print t == s;
+print s != t + "!";
+print s == 1;
+print s + "end" == t + "end";
+"""
+
+
+class TestRope(unittest.TestCase):
+    def test_concat_threshold(self):
+        self.assertIs(type(concat("a", "b")), str)
+        self.assertIs(type(concat(LONG[1:], "")), str)
+        self.assertIs(type(concat(LONG[1:], "y")), Rope)
+        self.assertEqual(len(concat(LONG, "y")), MIN_ROPE_LENGTH + 1)
+
+    def test_equality(self):
+        rope = concat(LONG, "y")
+        self.assertEqual(rope, LONG + "y")
+        self.assertEqual(LONG + "y", rope)
+        self.assertEqual(rope, concat(LONG[:10], LONG[10:] + "y"))
+        self.assertNotEqual(rope, LONG)
+        self.assertNotEqual(rope, 1.0)
+        self.assertNotEqual(rope, None)
+        self.assertEqual(hash(rope), hash(LONG + "y"))
+        self.assertEqual({rope: 1}[LONG + "y"], 1)
+
+    def test_flatten(self):
+        rope = LONG
+        for _ in range(100_000):
+            rope = concat(rope, "y")
+        self.assertEqual(str(rope), LONG + "y" * 100_000)
+        self.assertIsNone(rope.left)
+        self.assertIs(rope.flatten(), rope.flatten())
+
+    def test_pickles_as_str(self):
+        copy = pickle.loads(pickle.dumps(concat(LONG, "y")))
+        self.assertIs(type(copy), str)
+        self.assertEqual(copy, LONG + "y")
+
+
+class TestRopePrograms(unittest.TestCase):
+    def test_same_output(self):
+        expected = ["piece of text " * 20, "True", "True", "True", "False", "True"]
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                sink = MemorySink()
+                Intepreter(engine, output=sink).intepret(PROGRAM)
+                self.assertEqual(sink.lines, expected)
+
+    def test_expression_result_is_str(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                intepreter = Intepreter(engine)
+                intepreter.intepret('var s = "{}";'.format(LONG))
+                result = intepreter._intepret_expr('s + "y"')
+                self.assertIs(type(result), str)
+                self.assertEqual(result, LONG + "y")
+
+    def test_quick_keeps_specialization(self):
+        intepreter = Intepreter("quick", output=MemorySink())
+        intepreter.intepret('var s = "";')
+        program = intepreter.compile('s = s + "{}"; s = s + "y";'.format(LONG[:-1]))
+        grow, rope = (stmt.value for stmt in program.statements)
+        intepreter.run(program)
+        self.assertIs(type(grow), nodes.StringConcatNode)
+        self.assertIs(type(rope), nodes.StringConcatNode)
+        self.assertEqual(rope.deoptimizations, 0)
@@ -0,0 +1,87 @@
+import io
+import json
+import unittest
+from pylox.runner import BatchRunner, BatchReport, Job, JobResult, WorkerOptions, run_job
+from pylox.runner.jobs import OK, COMPILE_ERROR, RUNTIME_ERROR, CRASHED, INVALID
+
+
+class TestRunJob(unittest.TestCase):
+    def test_output(self):
+        result = run_job(Job('print x * 2; print s + "!";', {"x": 21, "s": "a"}, id=7))
+        self.assertEqual((result.id, result.status, result.output), (7, OK, "42\na!\n"))
+
+    def test_statuses(self):
+        self.assertEqual(run_job(Job("print (1;")).status, COMPILE_ERROR)
+        self.assertEqual(run_job(Job('print 1 + "a";')).status, RUNTIME_ERROR)
+
+        result = run_job(Job('print -"a";'))
+        self.assertEqual(result.status, CRASHED)
+        self.assertTrue(result.error.startswith("ValueError"))
+
+    def test_fresh_environment(self):
+        run_job(Job("var a = 1;"))
+        self.assertEqual(run_job(Job("print a;")).status, COMPILE_ERROR)
+
+    def test_from_json(self):
+        job = Job.from_json('{"source": "print x;", "variables": {"x": 1}, "id": "a"}')
+        self.assertEqual(job, Job("print x;", {"x": 1}, "a"))
+        for line in ["[]", '{"source": 1}', '{"source": "", "variables": {"x": [1]}}', "{"]:
+            with self.assertRaises(ValueError):
+                Job.from_json(line)
+
+
+class TestBatchRunner(unittest.TestCase):
+    def test_in_order(self):
+        lines = [
+            json.dumps({"id": i, "source": "print x + 1;", "variables": {"x": i}})
+            for i in range(100)
+        ]
+        lines[10] = "not json"
+        lines[20] = ""
+
+        results = io.StringIO()
+        report = BatchRunner(2, chunk_size=3).run_file(io.StringIO("\n".join(lines)), results)
+        results = [json.loads(line) for line in results.getvalue().splitlines()]
+
+        self.assertEqual(len(results), 99)
+        self.assertEqual(results[10]["status"], INVALID)
+        self.assertIn("Line 11", results[10]["error"])
+        ok = [result for result in results if result["status"] == OK]
+        self.assertEqual([result["id"] for result in ok], [i for i in range(100) if i not in (10, 20)])
+        self.assertTrue(all(result["output"] == "{}\n".format(result["id"] + 1) for result in ok))
+
+        self.assertEqual(report.jobs, 99)
+        self.assertEqual(report.statuses, {OK: 98, INVALID: 1})
+
+    def test_options(self):
+        jobs = [Job("print 1 + 2 * x;", {"x": 3})]
+        runner = BatchRunner(1, WorkerOptions(engine="vm"))
+        self.assertEqual([result.output for result in runner.run(jobs)], ["7\n"])
+
+    def test_bounded_in_flight(self):
+        read = []
+
+        def jobs():
+            for i in range(40):
+                read.append(i)
+                yield Job("print {};".format(i), id=i)
+
+        runner = BatchRunner(2, chunk_size=2, max_in_flight=3)
+        for result in runner.run(jobs()):
+            # The chunk of this result and at most 3 more were read
+            self.assertLessEqual(len(read), result.id + 1 + 2 * 4)
+
+
+class TestBatchReport(unittest.TestCase):
+    def test_report(self):
+        report = BatchReport()
+        for i in range(1, 101):
+            report.add(JobResult(i, OK, "", seconds=i / 1000))
+        report.seconds = 2.0
+
+        self.assertEqual(report.jobs_per_second, 50.0)
+        self.assertEqual(report.percentile(50), 0.05)
+        self.assertEqual(report.percentile(99), 0.099)
+        self.assertEqual(report.percentile(100), 0.1)
+        self.assertIn("50.0 jobs/s", report.format())
+        self.assertEqual(BatchReport().percentile(50), 0.0)
@@ -0,0 +1,130 @@
+import io
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+from pylox.runner import WorkerOptions
+from pylox.server import run_remote, run_remote_file
+from pylox.server.protocol import EXIT, OUTPUT, RUN, STATUS, recv_frame, send_frame
+from pylox.server.server import LoxServer
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "lox.sock")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def serve(self, **kwargs) -> LoxServer:
+        server = LoxServer(self.path, **kwargs)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+        self.addCleanup(stop)
+        return server
+
+    def run_remote(self, source: str):
+        out, err = io.StringIO(), io.StringIO()
+        status = run_remote(source, self.path, out, err)
+        return status, out.getvalue(), err.getvalue()
+
+    def test_statuses(self):
+        self.serve()
+        self.assertEqual(self.run_remote("print 1 + 2;"), (0, "3\n", ""))
+        self.assertEqual(
+            self.run_remote("print (1;"),
+            (65, "[Line 1] Error  at ';': Missing closing parenthesis\n", ""),
+        )
+        status, out, _ = self.run_remote('print 1;\nprint 1 + "a";')
+        self.assertEqual(status, 70)
+        self.assertEqual(
+            out,
+            "1\n[Line 2] Error  at '+': "
+            "Runtime error: Operands should be two numbers or two strings\n",
+        )
+        status, _, err = self.run_remote('print -"a";')
+        self.assertEqual(status, 70)
+        self.assertTrue(err.startswith("pylox: internal error: ValueError"))
+
+    def test_fresh_environment(self):
+        self.serve(options=WorkerOptions(engine="vm"), prelude="var base = 40;")
+        self.assertEqual(
+            self.run_remote("var a = 1; base = base + a; print base;"), (0, "41\n", "")
+        )
+        self.assertEqual(self.run_remote("print base;")[1], "40\n")
+        self.assertEqual(self.run_remote("print a;")[0], 65)
+
+    def test_streams_large_output(self):
+        self.serve()
+        source = 'var s = "{}"; print s; print s; print s;'.format("x" * 5000)
+        self.assertEqual(self.run_remote(source), (0, ("x" * 5000 + "\n") * 3, ""))
+
+    def test_raw_frames(self):
+        self.serve()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            send_frame(sock, RUN, b"print 1; print 2;")
+            self.assertEqual(recv_frame(sock), (OUTPUT, b"1\n2\n"))
+            self.assertEqual(recv_frame(sock), (EXIT, STATUS.pack(0)))
+            self.assertIsNone(recv_frame(sock))
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            send_frame(sock, OUTPUT, b"")
+            self.assertEqual(recv_frame(sock)[0], 3)
+            self.assertEqual(recv_frame(sock), (EXIT, STATUS.pack(64)))
+
+    def test_idle_client(self):
+        self.serve(client_timeout=0.2)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(self.path)
+            # Served once the idle client is dropped, not after it leaves
+            started = time.monotonic()
+            self.assertEqual(self.run_remote("print 1;"), (0, "1\n", ""))
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertIsNone(recv_frame(idle))
+
+    def test_run_file(self):
+        self.serve()
+        path = os.path.join(self.directory.name, "script.lox")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("print 1;")
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            self.assertEqual(run_remote_file(path, self.path), 0)
+            with mock.patch("sys.stdin", io.StringIO("print 2;")):
+                self.assertEqual(run_remote_file("-", self.path), 0)
+            self.assertEqual(run_remote_file(path + ".missing", self.path), 66)
+        self.assertEqual(out.getvalue(), "1\n2\n")
+        self.assertEqual(len(err.getvalue().splitlines()), 1)
+        self.assertTrue(err.getvalue().startswith("pylox: cannot read "))
+
+    def test_no_server(self):
+        status, out, err = self.run_remote("print 1;")
+        self.assertEqual((status, out), (69, ""))
+        self.assertIn("cannot reach the server", err)
+
+    def test_socket_file(self):
+        # Left behind by a server that is gone
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.path)
+        self.serve()
+        with self.assertRaises(OSError):
+            LoxServer(self.path)
+        self.assertEqual(self.run_remote("print 1;")[0], 0)
+
+    def test_bad_prelude(self):
+        with self.assertRaises(ValueError):
+            LoxServer(self.path, prelude="var a = 1 - nil;")
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,123 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter, MemorySink, Snapshot
+from pylox.intepreter.engine import ENGINES
+from pylox.intepreter.environment import UNDEFINED
+
+PRELUDE = 'var a = 1; var b = "text"; var c = nil; var d = true;'
+
+
+def run(intepreter: Intepreter, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        intepreter.intepret(source)
+    return out.getvalue()
+
+
+class TestFork(unittest.TestCase):
+    def test_isolated(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                parent = Intepreter(engine, output=MemorySink())
+                parent.intepret(PRELUDE)
+                sink = MemorySink()
+                child = parent.fork(sink)
+
+                child.intepret("a = a + 1; var e = 5; print a; print b; print e;")
+                parent.intepret("var f = 6; b = 2;")
+                child.intepret("print b; var f = 7; print f;")
+                parent.intepret("print a; print f;")
+
+                self.assertEqual(sink.lines, ["2", "text", "5", "text", "7"])
+                self.assertEqual(parent.output.lines, ["1", "6"])
+                self.assertNotIn("e", parent.env.slots)
+                self.assertEqual(parent.env.slots["f"], child.env.slots["e"])
+
+    def test_undeclared_in_parent(self):
+        parent = Intepreter()
+        parent.intepret(PRELUDE)
+        child = parent.fork()
+        child.intepret("var e = 1;")
+        self.assertEqual(
+            run(parent, "print e;"), "[Line 1] Error  at 'e': Variable undefined: e\n"
+        )
+
+    def test_slots_layered(self):
+        parent = Intepreter()
+        parent.intepret(PRELUDE)
+        slots = parent.env.slots
+        child = parent.fork()
+        child.intepret("var e = 1;")
+        self.assertEqual(child.env.slots.maps, [{"e": 4}, slots])
+        self.assertIs(parent.env.slots, slots)
+
+        parent.intepret("var f = 2;")
+        self.assertIsNot(parent.env.slots, slots)
+        self.assertNotIn("f", slots)
+        grandchild = child.fork()
+        grandchild.intepret("var g = 3; print a + e + g;")
+        self.assertEqual(list(grandchild.env.slots), ["a", "b", "c", "d", "e", "g"])
+        self.assertNotIn("g", child.env.slots)
+
+    def test_output_defaults_to_parent(self):
+        parent = Intepreter(output=MemorySink())
+        parent.fork().intepret("print 1;")
+        self.assertEqual(parent.output.lines, ["1"])
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restore(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                sink = MemorySink()
+                intepreter = Intepreter(engine, output=sink)
+                intepreter.intepret(PRELUDE)
+                snapshot = intepreter.snapshot()
+                program = intepreter.compile("print a; a = a + 1;")
+                intepreter.run(program)
+                intepreter.intepret("var e = 1;")
+
+                intepreter.restore(snapshot)
+                intepreter.run(program)
+                intepreter.run(program)
+                self.assertEqual(sink.lines, ["1", "1", "2"])
+                self.assertEqual(
+                    run(intepreter, "print e;"),
+                    "[Line 1] Error  at 'e': Runtime error: Variable undefined: e\n",
+                )
+
+    def test_serialized(self):
+        intepreter = Intepreter()
+        intepreter.intepret(PRELUDE + 'var s = ""; var i = 0;')
+        intepreter.intepret("s = s + \"{}\"; s = s + s;".format("x" * 300))
+        # Declared, but failed before it was defined
+        intepreter.intepret("var u = 1 - nil;")
+        snapshot = Snapshot.loads(intepreter.snapshot().dumps())
+        self.assertEqual(snapshot, intepreter.snapshot())
+        self.assertIs(snapshot.values[-1], UNDEFINED)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prelude.snap")
+            snapshot.save(path)
+            snapshot = Snapshot.load(path)
+
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                worker = Intepreter(engine)
+                worker.intepret("var z = 0; var a = 5;")
+                worker.restore(snapshot)
+                self.assertEqual(
+                    run(worker, "print a; print b; print c; print d; print s == \"{}\";".format("x" * 600)),
+                    "1\ntext\nNone\nTrue\nTrue\n",
+                )
+                self.assertIn("Variable undefined: z", run(worker, "print z;"))
+                self.assertIn("Variable undefined: u", run(worker, "print u;"))
+
+    def test_bad_data(self):
+        data = Intepreter().snapshot().dumps()
+        for bad in (b"", b"LOXC" + data[4:], data[:-1], data[:-2] + b"\xff\xff"):
+            with self.assertRaises(ValueError):
+                Snapshot.loads(bad)
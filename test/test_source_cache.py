@@ -0,0 +1,114 @@
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from pylox.cache import SourceCache, ParsedSource
+from pylox.cache.source_cache import ESTIMATED_BYTES_PER_CHAR
+from pylox.intepreter import Intepreter
+from pylox.optimizer import OptimizerOptions
+from test.test_vm import PROGRAMS
+
+
+def intepret(intepreter: Intepreter, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        intepreter.intepret(source)
+    return out.getvalue()
+
+
+class TestSourceCache(unittest.TestCase):
+    def test_same_output(self):
+        cache = SourceCache()
+        for engine in ("tree", "vm"):
+            for source in PROGRAMS:
+                cached = Intepreter(engine, optimizer=OptimizerOptions(), source_cache=cache)
+                uncached = Intepreter(engine)
+                for _ in range(2):
+                    self.assertEqual(intepret(cached, source), intepret(uncached, source))
+
+        stats = cache.stats()
+        self.assertEqual((stats.misses, stats.hits), (2 * len(PROGRAMS), 2 * len(PROGRAMS)))
+
+    def test_per_intepreter(self):
+        cache = SourceCache()
+        first, second = Intepreter(source_cache=cache), Intepreter(source_cache=cache)
+        intepret(first, "var a = 1;")
+        program = first.compile("print a;")
+        # `a` gets another slot in the second interpreter
+        intepret(second, "var b = 2; var a = 3;")
+        second.compile("print a;")
+        self.assertEqual(cache.stats().hits, 0)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            first.run(program)
+        self.assertEqual(out.getvalue(), "1\n")
+
+    def test_errors_reported_again(self):
+        cache = SourceCache()
+        intepreter = Intepreter(source_cache=cache)
+        for source in ["print (1;", 'print "a;', "a = 1;"]:
+            first = intepret(intepreter, source)
+            self.assertNotEqual(first, "")
+            self.assertEqual(intepret(intepreter, source), first)
+
+    def test_expressions(self):
+        cache = SourceCache()
+        intepreter = Intepreter(source_cache=cache)
+        # pylint: disable=W0212
+        self.assertEqual(intepreter._intepret_expr("1 + 2"), 3.0)
+        self.assertEqual(intepreter._intepret_expr("1 + 2"), 3.0)
+        self.assertIsNone(intepreter._intepret_expr("1 +"))
+        self.assertIsNone(intepreter._intepret_expr("1 +"))
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 3, 1))
+        # Programs and expressions with the same text are separate entries
+        self.assertEqual(intepret(intepreter, "1 + 2"), "[Line 1] Error  at end: Expected ; after value\n")
+
+    def test_entry_limit(self):
+        cache = SourceCache(max_entries=2)
+        for source in ("a", "b", "a", "c"):
+            if cache.get(source) is None:
+                cache.put(source, ParsedSource([], source))
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_byte_limit(self):
+        cache = SourceCache(max_bytes=ESTIMATED_BYTES_PER_CHAR * 150)
+        cache.put("x" * 100, ParsedSource([], None))
+        cache.put("y" * 100, ParsedSource([], None))
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.stats().bytes, cache.max_bytes)
+
+        cache.put("z" * 1000, ParsedSource([], None))
+        self.assertIsNone(cache.get("z" * 1000))
+        self.assertIsNotNone(cache.get("y" * 100))
+
+    def test_threads(self):
+        cache = SourceCache(max_entries=8)
+        sources = [f"print {i};" for i in range(16)]
+
+        def work():
+            intepreter = Intepreter(source_cache=cache)
+            for _ in range(20):
+                for source in sources:
+                    intepreter.compile(source)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 4 * 20 * 16)
+        self.assertEqual(stats.misses - stats.evictions, stats.entries)
+        self.assertEqual(stats.entries, 8)
+        self.assertEqual(len(cache.entries), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
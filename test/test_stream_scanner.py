@@ -0,0 +1,50 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.scanner import Scanner
+from pylox.lexer.stream_scanner import StreamScanner
+from test.test_regex_scanner import SOURCES, scan
+
+
+def scan_stream(source: str, chunk_size: int):
+    out = io.StringIO()
+    reporter = ErrorReporter()
+    stream = io.BytesIO(source.encode("utf-8"))
+    with redirect_stdout(out):
+        tokens = list(StreamScanner(stream, reporter, chunk_size).iter_tokens())
+    tokens = [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens]
+    return tokens, out.getvalue(), reporter.had_error
+
+
+class TestStreamScanner(unittest.TestCase):
+    def test_same_as_scanner(self):
+        sources = [s for s in SOURCES if "²" not in s]
+        sources.append('var s = "spanning\nchunks"; // and a long comment\n1.25')
+        for source in sources:
+            expected = scan(Scanner, source)
+            for chunk_size in (1, 2, 3, 7, 64):
+                self.assertEqual(scan_stream(source, chunk_size), expected)
+
+    def test_is_lazy(self):
+        stream = io.BytesIO(b"print 1;" * 1000)
+        tokens = StreamScanner(stream, ErrorReporter(), chunk_size=16).iter_tokens()
+        self.assertEqual(next(tokens).lexeme, "print")
+        self.assertLess(stream.tell(), 100)
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "script.lox")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("var a = 1;\nprint a;")
+
+            tokens = list(StreamScanner(path, ErrorReporter()).iter_tokens())
+
+        self.assertEqual(len(tokens), 9)
+        self.assertEqual(tokens[-1].line, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.ast.ast_printer import AstPrinter
+from pylox.error_reporter import ErrorReporter
+from pylox.lexer.buffer_scanner import BufferScanner
+from pylox.lexer.scanner import Scanner
+from pylox.lexer.token_buffer import TokenBuffer
+from pylox.parser.parser import Parser
+from pylox.token import Token, TokenType
+from test.test_regex_scanner import SOURCES, scan
+
+
+class ListScanner(BufferScanner):
+    def scan_tokens(self):
+        return super().scan_tokens().to_tokens()
+
+
+def parse(tokens):
+    out = io.StringIO()
+    reporter = ErrorReporter()
+    with redirect_stdout(out):
+        # pylint: disable=W0212
+        ast = Parser(tokens, reporter)._parse_expr()
+    return (AstPrinter().print(ast) if ast else None), out.getvalue()
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_same_as_scanner(self):
+        for source in SOURCES:
+            if "²" in source:
+                continue
+            self.assertEqual(scan(ListScanner, source), scan(Scanner, source))
+
+    def test_columns(self):
+        buffer = BufferScanner('print "ab" + 1.5;', ErrorReporter()).scan_tokens()
+
+        self.assertIsInstance(buffer, TokenBuffer)
+        self.assertEqual(len(buffer), 6)
+        self.assertEqual(buffer.types.typecode, "i")
+        self.assertEqual(buffer.token_type(1), TokenType.STRING)
+        self.assertEqual(buffer.literal(1), "ab")
+        self.assertEqual(buffer.literal(3), 1.5)
+        self.assertEqual(buffer[-1].token_type, TokenType.EOF)
+
+    def test_view(self):
+        buffer = BufferScanner("a\n+", ErrorReporter()).scan_tokens()
+        view = buffer[1]
+        self.assertEqual(view, Token(TokenType.PLUS, "+", None, 2))
+        self.assertEqual(view.line, 2)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            ErrorReporter().error_token(view, "oops")
+        self.assertEqual(out.getvalue(), "[Line 2] Error  at '+': oops\n")
+
+    def test_parse(self):
+        for source in ['!5>= (1 !=5 * 4+- 2)', "a = (b)", '"x" +', "(1", ""]:
+            buffer = BufferScanner(source, ErrorReporter()).scan_tokens()
+            tokens = Scanner(source, ErrorReporter()).scan_tokens()
+            self.assertEqual(parse(buffer), parse(tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
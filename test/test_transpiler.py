@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from pylox.__main__ import main
+from pylox.intepreter import Intepreter
+from pylox.transpiler import Transpiler
+from test import test_intepreter
+from test.test_vm import PROGRAMS, run_program
+
+
+def transpile(source: str) -> str:
+    intepreter = Intepreter()
+    tokens, _ = intepreter.lex(source)
+    statements, _ = intepreter.parse(tokens)
+    return Transpiler().transpile(statements)
+
+
+class TestTranspilerExpr(test_intepreter.TestIntepreterExpr):
+    def setUp(self) -> None:
+        self.intepreter = Intepreter("python")
+
+
+class TestTranspilerProgram(unittest.TestCase):
+    def test_same_output(self):
+        for source in PROGRAMS:
+            self.assertEqual(run_program("python", source), run_program("tree", source))
+
+    def test_variables_persist(self):
+        intepreter = Intepreter("python")
+        intepreter.intepret('var a = "x"; var b = a + "y"; a = 1;')
+        # pylint: disable=W0212
+        self.assertEqual(intepreter._intepret_expr('b + "z"'), "xyz")
+        self.assertEqual(intepreter._intepret_expr("a * 2"), 2)
+
+    def test_static_types_skip_checks(self):
+        self.assertNotIn("_error(", transpile("var a = 1; print a * 2 - a;"))
+        self.assertIn("_error(", transpile("print a * 2;"))
+
+
+class TestCompileCommand(unittest.TestCase):
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp, "script.lox")
+            script.write_text('var a = 2;\nprint a * 21;\nprint a + "b";\n')
+
+            self.assertEqual(main(["compile", str(script)]), 0)
+            env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[1]))
+            result = subprocess.run(
+                [sys.executable, str(script.with_suffix(".py"))],
+                capture_output=True,
+                text=True,
+                env=env,
+                check=False,
+            )
+
+        self.assertEqual(result.returncode, 70)
+        self.assertEqual(
+            result.stdout,
+            "42\n[Line 3] Error  at '+': Runtime error: "
+            "Operands should be two numbers or two strings\n",
+        )
+
+    def test_compile_static_error(self):
+        for source in ["print (1;\n", "print b;\n"]:
+            with tempfile.TemporaryDirectory() as tmp:
+                script = Path(tmp, "script.lox")
+                script.write_text(source)
+                self.assertEqual(main(["compile", str(script)]), 65)
+                self.assertFalse(script.with_suffix(".py").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from pylox.intepreter import Intepreter
+from pylox.lexer.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.error_reporter import ErrorReporter
+from pylox.vm import BytecodeCompiler, disassemble
+from test import test_intepreter
+
+PROGRAMS = [
+    """
+    var a = 1;
+    var b = 9.15;
+    a = 5*b/(1/8.23+2-(8/7*(2/3)));
+    print a;
+    print a > 2;
+    """,
+    """
+    var s = "foo";
+    var n;
+    print n;
+    print s + "bar";
+    print (s = "baz") + "!";
+    print !nil;
+    print -3 <= -3;
+    """,
+    'print 1; print "a" - 1; print 2;',
+    "print 1;\nprint b;",
+    "a = 1;",
+    'print 1 + "b";',
+]
+
+
+def run_program(engine: str, source: str) -> str:
+    out = io.StringIO()
+    with redirect_stdout(out):
+        Intepreter(engine).intepret(source)
+    return out.getvalue()
+
+
+class TestVMExpr(test_intepreter.TestIntepreterExpr):
+    def setUp(self) -> None:
+        self.intepreter = Intepreter("vm")
+
+
+class TestVMProgram(unittest.TestCase):
+    def test_same_output(self):
+        for source in PROGRAMS:
+            self.assertEqual(run_program("vm", source), run_program("tree", source))
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, Intepreter, "nope")
+
+    def test_constant_dedup(self):
+        tokens = Scanner("print 1 + 1 + 1;", ErrorReporter()).scan_tokens()
+        statements = Parser(tokens, ErrorReporter()).parse()
+        chunk = BytecodeCompiler().compile(statements)
+
+        self.assertEqual(chunk.constants, [1.0])
+        self.assertIn("ADD", disassemble(chunk))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,28 +1,45 @@
+# Resolved variable slot, filled in by the resolver
+SLOT = "slot: int = field(default=-1, compare=False)"
+# Source line the statement starts on, for errors raised while running it
+LINE = "line: int = field(default=0, compare=False)"
+
+# Slotted nodes have no per-instance __dict__. Pass --no-slots to emit
+# plain dataclasses, e.g. to attach ad-hoc attributes while debugging
+SLOTS = True
+
 stmt = {
-    "Print": ("expr: Expr",),
-    "Expression": ("expr: Expr",),
-    "Var": ("name: Token", "initializer: Expr")
+    "Print": ("expr: Expr", LINE),
+    "Expression": ("expr: Expr", LINE),
+    "Var": ("name: Token", "initializer: Expr", LINE, SLOT)
 }
 
 
-def generate_ast():
+def generate_ast(slots: bool = SLOTS):
     out_content = "\n".join((
         "from __future__ import annotations",
         "from abc import ABC, abstractmethod",
-        "from dataclasses import dataclass",
+        "from dataclasses import dataclass, field",
+        "from typing import ClassVar",
         "from pylox.token import Token",
         "from pylox.ast.expr import Expr",
         "",
         "",
         "class Stmt(ABC):",
+        "    __slots__ = ()",
+        "",
+        "    # Index of the node class in `KINDS`, for table dispatch",
+        "    kind: ClassVar[int]",
+        "",
         "    @abstractmethod",
         "    def accept(self, visitor: Visitor):",
         "        pass"
     ))
 
-    for class_name, fields in stmt.items():
-        class_def = ("\n\n@dataclass\n"
-                    f"class {class_name}Stmt(Stmt):")
+    decorator = "@dataclass(slots=True)" if slots else "@dataclass"
+    for kind, (class_name, fields) in enumerate(stmt.items()):
+        class_def = (f"\n\n{decorator}\n"
+                    f"class {class_name}Stmt(Stmt):"
+                    f"\n    kind: ClassVar[int] = {kind}\n")
         for field in fields:
             class_def += "\n    " + field
 
@@ -52,11 +69,25 @@ def generate_visitors():
         ))
 
         out_content += visitor_method
-    
+
+    # Bound visit methods in `kind` order; overrides in subclasses are picked up
+    out_content += "\n".join((
+        "    def dispatch_table(self) -> list:",
+        "        return [",
+        *(f"            self.visit_{class_name.lower()}_stmt," for class_name in stmt),
+        "        ]",
+        "",
+        "",
+        "KINDS = (",
+        *(f"    {class_name}Stmt," for class_name in stmt),
+        ")",
+    ))
+
     return out_content
 
 if __name__ == "__main__":
-    print(generate_ast())
+    import sys
+    print(generate_ast(slots="--no-slots" not in sys.argv[1:]))
     print()
     print(generate_visitors())
     
\ No newline at end of file
@@ -1,42 +1,303 @@
+"""Seeded random Lox programs, for benchmarks and soak tests
+
+    python tools/generate_random_cfg.py --bytes 4000000 --seed 7 -o corpus.lox
+
+Programs are sequences of declarations, assignments and prints, generated
+until a target size in bytes, AST nodes or statements is reached. The same
+options and seed always give the same program. By default programs are well
+typed: every operator gets operands it accepts and no division is by zero,
+so a program runs to its end instead of stopping at its first runtime error.
+"""
+import argparse
 import random
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+NUMBER = "number"
+STRING = "string"
+BOOL = "bool"
+NIL = "nil"
+VARIABLE = "variable"
+
+TYPES = (NUMBER, STRING, BOOL, NIL)
+
+WORDS = ["foo", "bar", "baz", "qux", "lorem", "ipsum", "dolor", "amet"]
+
+# Strings longer than this are not concatenated any further, or repeated
+# `s = s + s` would grow them exponentially
+MAX_STRING_LENGTH = 256
+
+ARITHMETIC = ["+", "-", "*"]
+COMPARISON = ["<", "<=", ">", ">="]
+EQUALITY = ["==", "!="]
+OPERATORS = ARITHMETIC + ["/"] + COMPARISON + EQUALITY
+
+
+@dataclass
+class GeneratorOptions:
+    seed: int = 0
+    # Expressions nest at most this deep
+    max_depth: int = 7
+    # Chance that a declaration reuses a declared name instead of a new one
+    reuse: float = 0.8
+    # Relative weights of the leaves of expressions; in well typed programs
+    # the type a leaf needs comes first, and only the weight of variables counts
+    leaves: Dict[str, float] = field(
+        default_factory=lambda: {NUMBER: 4, STRING: 2, BOOL: 1, NIL: 0.5, VARIABLE: 4}
+    )
+    # Relative weights of the statements
+    statements: Dict[str, float] = field(
+        default_factory=lambda: {"var": 3, "assign": 4, "print": 3}
+    )
+    # Chance of an assignment nested inside an expression
+    nested_assignment: float = 0.05
+    # Operands of any type for any operator, as in hand-written error cases
+    well_typed: bool = True
+
+
+class ProgramGenerator:
+    """Generates statements one at a time, each with its count of AST nodes"""
+
+    def __init__(self, options: GeneratorOptions = None):
+        self.options = options or GeneratorOptions()
+        self.random = random.Random(self.options.seed)
+        # Declared variables with the type of their value, and for strings
+        # an upper bound of its length
+        self.variables: Dict[str, Tuple[str, int]] = {}
+        self.names: List[str] = []
+        self.nodes = 0
+
+        leaves = self.options.leaves
+        self.leaf_kinds = list(leaves)
+        self.leaf_weights = [leaves[kind] for kind in self.leaf_kinds]
+        statements = self.options.statements
+        self.statement_kinds = list(statements)
+        self.statement_weights = [statements[kind] for kind in self.statement_kinds]
+
+    def statements(self) -> Iterator[Tuple[str, int]]:
+        """Endless (source line, AST nodes) pairs"""
+        while True:
+            self.nodes = 1
+            source = self.statement()
+            yield source, self.nodes
+
+    def program(
+        self,
+        max_bytes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        max_statements: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Lines of a program ending at the first limit reached
+
+        A limit on bytes or nodes is reached by the statement crossing it,
+        so the program may exceed it by one statement.
+        """
+        if max_bytes is None and max_nodes is None and max_statements is None:
+            raise ValueError("A program needs a size in bytes, nodes or statements")
+
+        size = nodes = count = 0
+        for line, line_nodes in self.statements():
+            yield line
+            size += len(line) + 1
+            nodes += line_nodes
+            count += 1
+            if (
+                (max_bytes is not None and size >= max_bytes)
+                or (max_nodes is not None and nodes >= max_nodes)
+                or (max_statements is not None and count >= max_statements)
+            ):
+                return
+
+    # Statements
+
+    def statement(self) -> str:
+        kind = self.random.choices(self.statement_kinds, self.statement_weights)[0]
+        if kind == "var" or not self.names:
+            return self.declaration()
+        if kind == "assign":
+            # An expression statement around the assignment expression
+            self.nodes += 1
+            name = self.random.choice(self.names)
+            value, value_type, length = self.expression(self.any_type(), 0)
+            self.variables[name] = (value_type, length)
+            return "{} = {};".format(name, value)
+        value, _, _ = self.expression(self.any_type(), 0)
+        return "print {};".format(value)
+
+    def declaration(self) -> str:
+        if self.names and self.random.random() < self.options.reuse:
+            name = self.random.choice(self.names)
+        else:
+            name = "v{}".format(len(self.names))
+
+        if self.random.random() < 0.1:
+            value, value_type, length = None, NIL, 0
+        else:
+            value, value_type, length = self.expression(self.any_type(), 0)
+        # Declared only now, as a new name is not yet usable in its initializer
+        if name not in self.variables:
+            self.names.append(name)
+        self.variables[name] = (value_type, length)
+        if value is None:
+            return "var {};".format(name)
+        return "var {} = {};".format(name, value)
+
+    # Expressions; each returns its source, type and longest string length
+
+    def expression(self, wanted: str, depth: int) -> Tuple[str, str, int]:
+        self.nodes += 1
+        # Leaves get likelier with depth, and certain at `max_depth`
+        if depth >= self.options.max_depth or self.random.random() < depth / self.options.max_depth:
+            return self.leaf(wanted)
+
+        if self.random.random() < self.options.nested_assignment and self.names:
+            name = self.random.choice(self.names)
+            value, value_type, length = self.expression(wanted, depth + 1)
+            self.variables[name] = (value_type, length)
+            # Parenthesized, or it would take in the rest of the expression
+            self.nodes += 1
+            return "({} = {})".format(name, value), value_type, length
+
+        choice = self.random.random()
+        if choice < 0.15:
+            inner, inner_type, length = self.expression(wanted, depth + 1)
+            return "({})".format(inner), inner_type, length
+        if choice < 0.3 and (wanted in (NUMBER, BOOL) or not self.options.well_typed):
+            return self.unary(wanted, depth)
+        return self.binary(wanted, depth)
+
+    def unary(self, wanted: str, depth: int) -> Tuple[str, str, int]:
+        if wanted == NUMBER or (not self.options.well_typed and self.random.random() < 0.5):
+            operand, _, _ = self.expression(NUMBER, depth + 1)
+            return "-" + self._operand(operand), NUMBER, 0
+        operand, _, _ = self.expression(self.any_type(), depth + 1)
+        return "!" + self._operand(operand), BOOL, 0
+
+    def binary(self, wanted: str, depth: int) -> Tuple[str, str, int]:
+        if not self.options.well_typed:
+            left, _, _ = self.expression(self.any_type(), depth + 1)
+            right, _, _ = self.expression(self.any_type(), depth + 1)
+            return "{} {} {}".format(left, self.random.choice(OPERATORS), right), NUMBER, 0
+
+        if wanted == STRING:
+            left, _, left_length = self.expression(STRING, depth + 1)
+            right, _, right_length = self.expression(STRING, depth + 1)
+            return "{} + {}".format(left, right), STRING, left_length + right_length
+        if wanted == NUMBER:
+            left, _, _ = self.expression(NUMBER, depth + 1)
+            if self.random.random() < 0.15:
+                # Only by literals, which are never zero
+                self.nodes += 1
+                return "{} / {}".format(left, self.number()), NUMBER, 0
+            right, _, _ = self.expression(NUMBER, depth + 1)
+            return "{} {} {}".format(left, self.random.choice(ARITHMETIC), right), NUMBER, 0
+        if wanted == BOOL:
+            if self.random.random() < 0.6:
+                left, _, _ = self.expression(NUMBER, depth + 1)
+                right, _, _ = self.expression(NUMBER, depth + 1)
+                return "{} {} {}".format(left, self.random.choice(COMPARISON), right), BOOL, 0
+            left, _, _ = self.expression(self.any_type(), depth + 1)
+            right, _, _ = self.expression(self.any_type(), depth + 1)
+            return "{} {} {}".format(left, self.random.choice(EQUALITY), right), BOOL, 0
+        return self.leaf(wanted)
+
+    def leaf(self, wanted: str) -> Tuple[str, str, int]:
+        kind = self.random.choices(self.leaf_kinds, self.leaf_weights)[0]
+        if kind == VARIABLE:
+            variable = self.variable(wanted)
+            if variable is not None:
+                return variable
+            kind = wanted
+        elif self.options.well_typed:
+            kind = wanted
+
+        if kind == NUMBER:
+            return self.number(), NUMBER, 0
+        if kind == STRING:
+            word = self.random.choice(WORDS)
+            return '"{}"'.format(word), STRING, len(word)
+        if kind == BOOL:
+            return self.random.choice(["true", "false"]), BOOL, 0
+        return "nil", NIL, 0
+
+    def variable(self, wanted: str) -> Optional[Tuple[str, str, int]]:
+        if not self.options.well_typed:
+            if not self.names:
+                return None
+            name = self.random.choice(self.names)
+            return (name,) + self.variables[name]
+
+        # Only names whose value has the wanted type (and is short enough)
+        for _ in range(4):
+            if not self.names:
+                return None
+            name = self.random.choice(self.names)
+            value_type, length = self.variables[name]
+            if value_type == wanted and length <= MAX_STRING_LENGTH:
+                return name, value_type, length
+        return None
+
+    def number(self) -> str:
+        if self.random.random() < 0.7:
+            return str(self.random.randint(1, 100))
+        return "{}.{}".format(self.random.randint(0, 999), self.random.randint(1, 99))
+
+    def any_type(self) -> str:
+        return self.random.choices(TYPES, (4, 2, 2, 0.2))[0]
+
+    def _operand(self, source: str) -> str:
+        # Operands of unary operators bind tighter than any binary operator,
+        # so those get parentheses, which parse to one more node
+        if " " in source:
+            self.nodes += 1
+            return "({})".format(source)
+        return source
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument("--bytes", type=int, help="stop once the program is this long")
+    size.add_argument("--nodes", type=int, help="stop once the program has this many AST nodes")
+    size.add_argument("--statements", type=int, help="number of statements")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-depth", type=int, default=GeneratorOptions.max_depth)
+    parser.add_argument(
+        "--reuse",
+        type=float,
+        default=GeneratorOptions.reuse,
+        help="chance that a declaration reuses an existing name",
+    )
+    parser.add_argument(
+        "--leaves",
+        help="weights of expression leaves, e.g. number=4,string=2,bool=1,nil=0.5,variable=4",
+    )
+    parser.add_argument(
+        "--ill-typed", action="store_true", help="allow operands of any type, causing runtime errors"
+    )
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    options = GeneratorOptions(
+        seed=args.seed, max_depth=args.max_depth, reuse=args.reuse, well_typed=not args.ill_typed
+    )
+    if args.leaves:
+        options.leaves = {
+            kind: float(weight) for kind, weight in (item.split("=") for item in args.leaves.split(","))
+        }
+
+    lines = ProgramGenerator(options).program(args.bytes, args.nodes, args.statements)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for line in lines:
+            out.write(line)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
 
-MAX_DEPTH = 7
-depth = 0
-
-def expression():
-    global depth
-    depth += 1
-    if depth >= MAX_DEPTH:
-        return literal()
-    
-    if depth <= 2:
-         nt = random.choice([unary, binary, grouping])
-    else:
-        nt = random.choice([literal, unary, binary, grouping])
-    return nt()
-
-def literal():
-    return random.choice([
-        str(random.randint(0, 100)),
-        random.choice(['"foo"', '"bar"', '"boofar"', '"farboo"']),
-        "true", "false", "nil"
-    ])
-
-def grouping():
-    return "(" + expression() + ")"
-
-def unary():
-    return random.choice(["_", "!"]) + expression()
-
-def binary():
-    return expression() + operator() + expression()
-
-def operator():
-    return random.choice([
-        "==", "!=", "<=", "<=", ">=", ">", "+", "-", "*", "/"
-    ])
-
-for i in range(10):
-    print(expression())
-    depth = 0
 
+if __name__ == "__main__":
+    sys.exit(main())